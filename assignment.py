@@ -0,0 +1,43 @@
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+
+def solve_assignment(role_ids: np.ndarray, candidate_ids: np.ndarray, scores: np.ndarray,
+                     role_capacity: np.ndarray, candidate_capacity: np.ndarray,
+                     scale: int = 100) -> np.ndarray:
+    """Choose pairs maximizing the total score under per-role and per-candidate capacities
+
+    Each (role_ids[i], candidate_ids[i]) pair is an eligible edge worth scores[i];
+    role_capacity and candidate_capacity are indexed by role and candidate ID.
+    Returns a boolean mask of the selected edges.
+    """
+    role_ids = np.asarray(role_ids, dtype=np.int64)
+    candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+    edge_count = len(role_ids)
+    if edge_count == 0:
+        return np.zeros(0, dtype=bool)
+
+    # Integer weights (two decimals by default) keep the optimum exact
+    weights = np.rint(np.asarray(scores, dtype=float) * scale)
+
+    # One capacity row per role and per candidate that has an edge
+    roles, role_row = np.unique(role_ids, return_inverse=True)
+    candidates, candidate_row = np.unique(candidate_ids, return_inverse=True)
+    edge_columns = np.arange(edge_count)
+    constraints = sparse.vstack([
+        sparse.csr_matrix((np.ones(edge_count), (role_row, edge_columns)), shape=(len(roles), edge_count)),
+        sparse.csr_matrix((np.ones(edge_count), (candidate_row, edge_columns)), shape=(len(candidates), edge_count))
+    ]).tocsr()
+    limits = np.concatenate([
+        np.maximum(np.asarray(role_capacity, dtype=float)[roles], 0),
+        np.maximum(np.asarray(candidate_capacity, dtype=float)[candidates], 0)
+    ])
+
+    # This is a bipartite b-matching, whose constraint matrix is totally
+    # unimodular: the simplex method's vertex solution is already integral,
+    # so the LP solves the min-cost flow problem exactly.
+    result = linprog(-weights, A_ub=constraints, b_ub=np.floor(limits), bounds=(0, 1), method='highs-ds')
+    if result.status != 0:
+        raise RuntimeError(f"Assignment solver failed: {result.message}")
+    return result.x > 0.5
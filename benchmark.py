@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from matching_engine import (
+    CANDIDATE_COLUMNS, CANDIDATE_DTYPES, COMPANY_COLUMNS, COMPANY_DTYPES, JobMatchingSystem
+)
+from profiling import PipelineProfile
+from resume_cache import ResumeCache
+from resume_fetcher import LocalDirectoryBackend, ResumeFetcher
+from results_export import write_frames
+from sample_data import create_sample_candidates_data, create_sample_companies_data, write_sample_resumes
+
+# Engine mode is "<engine>/<selection>"
+MODES = ("vectorized/greedy", "vectorized/assignment", "legacy/greedy")
+
+STAGES = ("load", "parse", "match", "rematch", "export")
+
+# Modes that scale quadratically are skipped above this many candidates unless raised
+DEFAULT_SLOW_MODE_LIMIT = 20_000
+SLOW_MODES = ("vectorized/assignment", "legacy/greedy")
+
+RESULTS_DIR = "benchmark_results"
+
+
+def git_revision() -> Dict[str, Optional[str]]:
+    """Return the checked-out commit and whether the tree has local changes (None outside a git checkout)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=here, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": bool(status.strip())}
+
+
+def prepare_dataset(directory: str, n_candidates: int, n_roles: int, seed: int,
+                    resumes: bool) -> Dict[str, object]:
+    """Write generated workbooks (and resumes) for one size into directory"""
+    timer = PipelineProfile()
+    with timer.stage("generate"):
+        companies = create_sample_companies_data(n_roles, seed)
+        candidates = create_sample_candidates_data(n_candidates, seed)
+    paths = {"companies": os.path.join(directory, "companies.xlsx"),
+             "candidates": os.path.join(directory, "candidates.xlsx"),
+             "resumes": os.path.join(directory, "resumes") if resumes else None}
+    with timer.stage("write"):
+        write_frames([companies], paths["companies"], "xlsx")
+        write_frames([candidates], paths["candidates"], "xlsx")
+        if resumes:
+            write_sample_resumes(candidates, paths["resumes"], seed)
+    return {"paths": paths, "setup": timer.to_dict()["stages"]}
+
+
+def run_mode(mode: str, paths: Dict[str, str], n_candidates: int, output_dir: str) -> Dict[str, object]:
+    """Time load, parse, match (cold and unchanged re-match) and export for one engine mode"""
+    engine_name, selection = mode.split("/")
+    resume_fetcher = ResumeFetcher(LocalDirectoryBackend(paths["resumes"])) if paths["resumes"] else None
+    # The benchmark's own stages are top-level, so the engine's nest inside them
+    timer = PipelineProfile()
+    engine = JobMatchingSystem(engine=engine_name, selection=selection, resume_fetcher=resume_fetcher,
+                               resume_cache=ResumeCache(max_entries=max(n_candidates, 1)), profile=timer)
+
+    with timer.stage("load"):
+        with open(paths["companies"], 'rb') as f:
+            companies_bytes = f.read()
+        with open(paths["candidates"], 'rb') as f:
+            candidates_bytes = f.read()
+    with timer.stage("parse"):
+        engine.companies_data = engine.read_workbook("companies.xlsx", companies_bytes,
+                                                     COMPANY_COLUMNS, COMPANY_DTYPES)
+        engine.candidates_data = engine.read_workbook("candidates.xlsx", candidates_bytes,
+                                                      CANDIDATE_COLUMNS, CANDIDATE_DTYPES)
+    with timer.stage("match"):
+        results = engine.match_candidates_to_jobs()
+    with timer.stage("rematch"):
+        engine.match_candidates_to_jobs()
+    with timer.stage("export"):
+        write_frames([results], os.path.join(output_dir, "results.xlsx"), "xlsx")
+        pairs = write_frames(engine.iter_pair_scores(), os.path.join(output_dir, "pairs.parquet"), "parquet")
+
+    profile = timer.to_dict()
+    return {"stages": {stage: profile["stages"][stage] for stage in STAGES}, "result_rows": len(results),
+            "pairs": pairs, "resume_errors": len(engine.resume_errors), "profile": profile}
+
+
+def run_benchmark(sizes: List[int], modes: List[str], roles_per_candidate: float = 0.02, seed: int = 0,
+                  resumes: bool = True, slow_mode_limit: int = DEFAULT_SLOW_MODE_LIMIT) -> Dict[str, object]:
+    """Benchmark every mode at every candidate count and return a JSON-ready report"""
+    report = {
+        **git_revision(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "roles_per_candidate": roles_per_candidate,
+        "resumes": resumes,
+        "runs": []
+    }
+    for n_candidates in sizes:
+        n_roles = max(1, round(n_candidates * roles_per_candidate))
+        with tempfile.TemporaryDirectory(prefix="match_benchmark_") as directory:
+            dataset = prepare_dataset(directory, n_candidates, n_roles, seed, resumes)
+            for mode in modes:
+                run = {"candidates": n_candidates, "roles": n_roles, "mode": mode, "setup": dataset["setup"]}
+                if mode in SLOW_MODES and n_candidates > slow_mode_limit:
+                    run["skipped"] = f"over {slow_mode_limit} candidates"
+                else:
+                    run.update(run_mode(mode, dataset["paths"], n_candidates, directory))
+                report["runs"].append(run)
+                print(format_run(run), flush=True)
+    return report
+
+
+def format_run(run: Dict[str, object], baseline: Dict[str, object] = None) -> str:
+    """One table row: size, mode and wall seconds per stage (with the ratio to a baseline run if given)"""
+    cells = [f"{run['candidates']:>9}", f"{run['roles']:>7}", f"{run['mode']:<22}"]
+    if "skipped" in run:
+        return " ".join(cells + [f"skipped ({run['skipped']})"])
+    for stage in STAGES:
+        seconds = run["stages"][stage]["wall"]
+        cell = f"{seconds:.3f}"
+        if baseline and "stages" in baseline and baseline["stages"][stage]["wall"] > 0:
+            cell += f" ({seconds / baseline['stages'][stage]['wall']:.2f}x)"
+        cells.append(f"{cell:>17}" if baseline is not None else f"{cell:>9}")
+    return " ".join(cells)
+
+
+def print_header(compare: bool = False):
+    width = 17 if compare else 9
+    print(" ".join([f"{'cands':>9}", f"{'roles':>7}", f"{'mode':<22}"] + [f"{stage:>{width}}" for stage in STAGES]))
+
+
+def compare_reports(report: Dict[str, object], baseline: Dict[str, object]):
+    """Print this report's stage times next to their ratio to a baseline report's matching runs"""
+    previous = {(run["candidates"], run["roles"], run["mode"]): run for run in baseline["runs"]}
+    print(f"Compared with {baseline.get('commit') or 'unknown commit'} ({baseline.get('created')}); "
+          f"ratios below 1 are faster")
+    print_header(compare=True)
+    for run in report["runs"]:
+        print(format_run(run, previous.get((run["candidates"], run["roles"], run["mode"]), {})))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time load, parse, match and export on generated data of several sizes, per engine mode"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Candidate counts")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--roles-per-candidate", type=float, default=0.02,
+                        help="Roles generated per candidate (default: 0.02, i.e. 200 roles for 10,000 candidates)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-resumes", action="store_true",
+                        help="Skip generated resumes (placeholder resume text, no fetching or extraction)")
+    parser.add_argument("--slow-mode-limit", type=int, default=DEFAULT_SLOW_MODE_LIMIT,
+                        help=f"Largest candidate count run with {' and '.join(SLOW_MODES)}")
+    parser.add_argument("-o", "--output", help=f"Report file (default: {RESULTS_DIR}/<time>_<commit>.json)")
+    parser.add_argument("--compare", help="An earlier report to compare stage times against")
+    args = parser.parse_args()
+
+    print_header()
+    report = run_benchmark(args.sizes, args.modes, args.roles_per_candidate, args.seed,
+                           not args.no_resumes, args.slow_mode_limit)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{(report['commit'] or 'nogit')[:10]}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare_reports(report, json.load(f))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
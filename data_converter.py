@@ -1,139 +1,358 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-def convert_company_requirements(input_file, output_file):
+from excel_ingest import iter_excel_chunks, read_excel_columns
+from results_export import write_frames
+
+# Form columns the converters use; everything else in the responses sheet is skipped while reading
+COMPANY_SOURCE_COLUMNS = [
+    'Name of the Company',
+    'Job Roles (Junior Analyst, Software Engineering Trainee, Graduate Engineering Trainee etc.). Incase of multiple roles, please add it in the single line separated with comma.  ',
+    'Please mention if you are looking for any specific skill sets, please add it in the single line separated with comma.  ',
+    'Could you please mention the education qualification of candidates you are looking for',
+    'Company/Organization country',
+    'No of Total Openings'
+]
+
+STUDENT_SOURCE_COLUMNS = [
+    'Full Name',
+    ' Country',
+    'Country',
+    'Field of Study (Specialization /Department)\nPlease mention your UG and PG study details',
+    'Highest academic qualification',
+    'Please mention your technical skills',
+    'Please upload your recent resume'
+]
+
+# Rows per chunk in the chunked converters
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Columns of the converted sheets
+COMPANY_OUTPUT_COLUMNS = ['Company Name', 'Role', 'Required Skills', 'Eligible Degrees', 'Country', 'Requirement Count']
+STUDENT_OUTPUT_COLUMNS = ['Name', 'Country', 'Degree', 'Skills', 'Resume Link']
+
+def _column(df, column, default):
+    """Return a column as object values, or a column of defaults if it is missing"""
+    if column in df.columns:
+        return df[column].astype(object)
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+def _is_blank(values):
+    """Mask of missing or empty-string cells"""
+    return values.isna() | values.eq('')
+
+def _fill_blank(values, default):
+    """Replace missing or empty-string cells with a default (a value or a Series)"""
+    return values.mask(_is_blank(values), default)
+
+def _requirement_counts(df, errors):
+    """Convert the openings column to integers, recording rows that cannot be converted"""
+    openings = df['No of Total Openings'] if 'No of Total Openings' in df.columns else \
+        pd.Series(1, index=df.index)
+    blank = _is_blank(openings.astype(object))
+    
+    # Numbers are truncated to int, anything else (text, dates) counts as one opening
+    if pd.api.types.is_numeric_dtype(openings.dtype):
+        is_number = pd.Series(True, index=df.index)
+    else:
+        is_number = openings.map(lambda value: isinstance(value, (int, float)))
+    numbers = pd.to_numeric(openings.where(is_number & ~blank), errors='coerce').astype(float)
+    
+    invalid = is_number & ~blank & ~np.isfinite(numbers)
+    for index in df.index[invalid]:
+        errors.append({
+            'Row': index,
+            'Column': 'No of Total Openings',
+            'Value': openings[index],
+            'Error': 'cannot convert float infinity to integer'
+        })
+    
+    counts = pd.Series(1, index=df.index, dtype=np.int64)
+    convert = is_number & ~blank & ~invalid
+    counts[convert] = np.trunc(numbers[convert]).astype(np.int64)
+    return counts, invalid
+
+def convert_company_frame(df, errors=None):
+    """Convert a frame of company form responses (indexed by sheet row position) to our format"""
+    errors = [] if errors is None else errors
+    
+    company_name = _column(df, 'Name of the Company', 'Unknown')
+    company_name = _fill_blank(company_name, 'Company_' + (df.index + 1).astype(str).to_series(index=df.index))
+    requirement_count, invalid = _requirement_counts(df, errors)
+    
+    converted_df = pd.DataFrame({
+        'Company Name': company_name,
+        'Role': _fill_blank(_column(df, 'Job Roles (Junior Analyst, Software Engineering Trainee, Graduate Engineering Trainee etc.). Incase of multiple roles, please add it in the single line separated with comma.  ', ''), 'General Role'),
+        'Required Skills': _fill_blank(_column(df, 'Please mention if you are looking for any specific skill sets, please add it in the single line separated with comma.  ', ''), 'General Skills'),
+        'Eligible Degrees': _fill_blank(_column(df, 'Could you please mention the education qualification of candidates you are looking for', ''), 'Any Degree'),
+        'Country': _fill_blank(_column(df, 'Company/Organization country', ''), 'India'),
+        'Requirement Count': requirement_count
+    }, columns=COMPANY_OUTPUT_COLUMNS)
+    
+    # Rows with errors are left out, as the row-by-row converter did
+    return converted_df[~invalid].reset_index(drop=True).infer_objects()
+
+def convert_student_frame(df, errors=None):
+    """Convert a frame of student form responses (indexed by sheet row position) to our format"""
+    # Every student row converts (errors is accepted for symmetry with convert_company_frame)
+    full_name = _column(df, 'Full Name', 'Unknown')
+    full_name = _fill_blank(full_name, 'Student_' + (df.index + 1).astype(str).to_series(index=df.index))
+    
+    # Some exports have " Country" (leading space), others only "Country"
+    country = _fill_blank(_column(df, ' Country', ''), _column(df, 'Country', ''))
+    country = _fill_blank(country, 'India')
+    
+    field_of_study = _fill_blank(_column(df, 'Field of Study (Specialization /Department)\nPlease mention your UG and PG study details', ''), 'General Studies')
+    highest_qualification = _fill_blank(_column(df, 'Highest academic qualification', ''), 'Bachelor Degree')
+    
+    converted_df = pd.DataFrame({
+        'Name': full_name,
+        'Country': country,
+        'Degree': highest_qualification.astype(str) + ' in ' + field_of_study.astype(str),
+        'Skills': _fill_blank(_column(df, 'Please mention your technical skills', ''), 'General Skills'),
+        'Resume Link': _fill_blank(_column(df, 'Please upload your recent resume', ''), 'https://drive.google.com/sample_resume')
+    }, columns=STUDENT_OUTPUT_COLUMNS)
+    return converted_df.reset_index(drop=True).infer_objects()
+
+def write_error_report(errors, output_file):
+    """Write per-row conversion errors next to the output file and return the report path"""
+    if not errors:
+        return None
+    report_file = f"{output_file.rsplit('.', 1)[0]}_errors.csv"
+    pd.DataFrame(errors, columns=['Row', 'Column', 'Value', 'Error']).to_csv(report_file, index=False)
+    print(f"⚠️ {len(errors)} rows could not be converted, see {report_file}")
+    return report_file
+
+def _write_chunks(frames, output_file, columns):
+    """Stream converted frames into a single-sheet workbook and return the number of rows written"""
+    # Like to_excel of an empty list of records, no rows means no header either
+    return write_frames((frame[columns] for frame in frames if len(frame)), output_file, 'xlsx')
+
+def convert_company_requirements(input_file, output_file, errors=None):
     """Convert company requirements Excel to our expected format"""
     print(f"Converting company requirements from {input_file}...")
+    errors = [] if errors is None else errors
     
-    # Read the original file
-    df = pd.read_excel(input_file)
+    # Read the original file (only the columns used below)
+    df = read_excel_columns(input_file, COMPANY_SOURCE_COLUMNS, {'Company/Organization country': 'category'})
     
     # Map the columns to our expected format
-    converted_data = []
-    
-    for index, row in df.iterrows():
-        try:
-            # Extract relevant information
-            company_name = row.get('Name of the Company', 'Unknown')
-            job_roles = row.get('Job Roles (Junior Analyst, Software Engineering Trainee, Graduate Engineering Trainee etc.). Incase of multiple roles, please add it in the single line separated with comma.  ', '')
-            required_skills = row.get('Please mention if you are looking for any specific skill sets, please add it in the single line separated with comma.  ', '')
-            education_qualification = row.get('Could you please mention the education qualification of candidates you are looking for', '')
-            country = row.get('Company/Organization country', '')
-            openings = row.get('No of Total Openings', 1)
-            
-            # Clean and process the data
-            if pd.isna(company_name) or company_name == '':
-                company_name = f"Company_{index + 1}"
-            
-            if pd.isna(job_roles) or job_roles == '':
-                job_roles = 'General Role'
-            
-            if pd.isna(required_skills) or required_skills == '':
-                required_skills = 'General Skills'
-            
-            if pd.isna(education_qualification) or education_qualification == '':
-                education_qualification = 'Any Degree'
-            
-            if pd.isna(country) or country == '':
-                country = 'India'
-            
-            if pd.isna(openings) or openings == '':
-                openings = 1
-            
-            # Create the converted row
-            converted_row = {
-                'Company Name': company_name,
-                'Role': job_roles,
-                'Required Skills': required_skills,
-                'Eligible Degrees': education_qualification,
-                'Country': country,
-                'Requirement Count': int(openings) if isinstance(openings, (int, float)) else 1
-            }
-            
-            converted_data.append(converted_row)
-            
-        except Exception as e:
-            print(f"Error processing row {index}: {e}")
-            continue
-    
-    # Create the converted DataFrame
-    converted_df = pd.DataFrame(converted_data)
+    converted_df = convert_company_frame(df, errors)
+    if converted_df.empty:
+        converted_df = pd.DataFrame()
     
-    # Save to new file
-    converted_df.to_excel(output_file, index=False)
-    print(f"Converted {len(converted_data)} company records to {output_file}")
+    # Save to new file (streamed, the workbook is never held in memory)
+    write_frames([converted_df], output_file, 'xlsx')
+    write_error_report(errors, output_file)
+    print(f"Converted {len(converted_df)} company records to {output_file}")
     
     return converted_df
 
-def convert_student_registrations(input_file, output_file):
+def convert_student_registrations(input_file, output_file, errors=None):
     """Convert student registrations Excel to our expected format"""
     print(f"Converting student registrations from {input_file}...")
+    errors = [] if errors is None else errors
     
-    # Read the original file
-    df = pd.read_excel(input_file)
+    # Read the original file (only the columns used below)
+    df = read_excel_columns(input_file, STUDENT_SOURCE_COLUMNS, {
+        ' Country': 'category',
+        'Country': 'category',
+        'Highest academic qualification': 'category'
+    })
     
     # Map the columns to our expected format
-    converted_data = []
-    
-    for index, row in df.iterrows():
-        try:
-            # Extract relevant information
-            full_name = row.get('Full Name', 'Unknown')
-            country = row.get(' Country', '')  # Note the space before 'Country'
-            if pd.isna(country) or country == '':
-                country = row.get('Country', '')  # Try without space
-            
-            field_of_study = row.get('Field of Study (Specialization /Department)\nPlease mention your UG and PG study details', '')
-            highest_qualification = row.get('Highest academic qualification', '')
-            technical_skills = row.get('Please mention your technical skills', '')
-            resume_link = row.get('Please upload your recent resume', '')
-            
-            # Clean and process the data
-            if pd.isna(full_name) or full_name == '':
-                full_name = f"Student_{index + 1}"
-            
-            if pd.isna(country) or country == '':
-                country = 'India'
-            
-            if pd.isna(field_of_study) or field_of_study == '':
-                field_of_study = 'General Studies'
-            
-            if pd.isna(highest_qualification) or highest_qualification == '':
-                highest_qualification = 'Bachelor Degree'
-            
-            if pd.isna(technical_skills) or technical_skills == '':
-                technical_skills = 'General Skills'
-            
-            if pd.isna(resume_link) or resume_link == '':
-                resume_link = 'https://drive.google.com/sample_resume'
-            
-            # Create the converted row
-            converted_row = {
-                'Name': full_name,
-                'Country': country,
-                'Degree': f"{highest_qualification} in {field_of_study}",
-                'Skills': technical_skills,
-                'Resume Link': resume_link
-            }
-            
-            converted_data.append(converted_row)
-            
-        except Exception as e:
-            print(f"Error processing row {index}: {e}")
-            continue
+    converted_df = convert_student_frame(df, errors)
+    if converted_df.empty:
+        converted_df = pd.DataFrame()
     
-    # Create the converted DataFrame
-    converted_df = pd.DataFrame(converted_data)
-    
-    # Save to new file
-    converted_df.to_excel(output_file, index=False)
-    print(f"Converted {len(converted_data)} student records to {output_file}")
+    # Save to new file (streamed, the workbook is never held in memory)
+    write_frames([converted_df], output_file, 'xlsx')
+    write_error_report(errors, output_file)
+    print(f"Converted {len(converted_df)} student records to {output_file}")
     
     return converted_df
 
+def convert_company_requirements_chunked(input_file, output_file, chunksize=DEFAULT_CHUNK_SIZE, errors=None):
+    """Convert company requirements chunk by chunk in bounded memory, returning the record count"""
+    print(f"Converting company requirements from {input_file} in chunks of {chunksize}...")
+    errors = [] if errors is None else errors
+    chunks = iter_excel_chunks(input_file, COMPANY_SOURCE_COLUMNS, chunksize=chunksize)
+    written = _write_chunks((convert_company_frame(chunk, errors) for chunk in chunks),
+                            output_file, COMPANY_OUTPUT_COLUMNS)
+    write_error_report(errors, output_file)
+    print(f"Converted {written} company records to {output_file}")
+    return written
+
+def convert_student_registrations_chunked(input_file, output_file, chunksize=DEFAULT_CHUNK_SIZE, errors=None):
+    """Convert student registrations chunk by chunk in bounded memory, returning the record count"""
+    print(f"Converting student registrations from {input_file} in chunks of {chunksize}...")
+    errors = [] if errors is None else errors
+    chunks = iter_excel_chunks(input_file, STUDENT_SOURCE_COLUMNS, chunksize=chunksize)
+    written = _write_chunks((convert_student_frame(chunk, errors) for chunk in chunks),
+                            output_file, STUDENT_OUTPUT_COLUMNS)
+    write_error_report(errors, output_file)
+    print(f"Converted {written} student records to {output_file}")
+    return written
+
+# Converters per input kind, and the per-fair output file names
+CONVERTERS = {
+    'companies': (convert_company_requirements, convert_company_requirements_chunked, 'converted_companies.xlsx'),
+    'students': (convert_student_registrations, convert_student_registrations_chunked, 'converted_candidates.xlsx'),
+}
+
+# Remembers the input hash behind every output, so unchanged inputs are skipped
+STATE_FILE = '.convert_state.json'
+
+def file_sha256(path):
+    """Return the SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def fair_name(path):
+    """Name a fair after the folder holding its export, or the file name for files in the current folder"""
+    folder = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    if os.path.dirname(path) in ('', '.') or not folder:
+        return os.path.splitext(os.path.basename(path))[0]
+    return folder
+
+def load_manifest(manifest_file):
+    """Read a JSON manifest: [{"fair": ..., "companies": path, "students": path}, ...]"""
+    with open(manifest_file, encoding='utf-8') as f:
+        entries = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    jobs = []
+    for entry in entries:
+        for kind in CONVERTERS:
+            if entry.get(kind):
+                path = os.path.join(base_dir, entry[kind])
+                jobs.append((entry.get('fair') or fair_name(path), kind, path))
+    return jobs
+
+def _convert_job(kind, input_file, output_file, chunksize):
+    """Worker entry point: convert one file quietly and return (rows, errors, seconds)"""
+    start = time.perf_counter()
+    convert, convert_chunked, _ = CONVERTERS[kind]
+    errors = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        if chunksize:
+            rows = convert_chunked(input_file, output_file, chunksize, errors)
+        else:
+            rows = len(convert(input_file, output_file, errors))
+    return rows, len(errors), time.perf_counter() - start
+
+def convert_batch(jobs, output_dir, workers=None, chunksize=None, force=False, combine=False):
+    """Convert (fair, kind, input file) jobs in a process pool, skipping unchanged inputs
+
+    Every fair gets its own folder under output_dir; with combine, all fairs are
+    also merged into output_dir/converted_*.xlsx with an extra Fair column.
+    Returns one summary dict per job.
+    """
+    # Checked before anything is converted, so a bad batch leaves no half-recorded outputs behind
+    jobs = list(jobs)
+    seen = set()
+    for fair, kind, _ in jobs:
+        if (fair, kind) in seen:
+            raise ValueError(f"Two {kind} inputs for fair '{fair}', name them in a manifest")
+        seen.add((fair, kind))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    state_file = os.path.join(output_dir, STATE_FILE)
+    try:
+        with open(state_file, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    
+    summary = []
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for fair, kind, input_file in jobs:
+            output_file = os.path.join(output_dir, fair, CONVERTERS[kind][2])
+            job = {'fair': fair, 'kind': kind, 'input': input_file, 'output': output_file}
+            summary.append(job)
+            
+            job['sha256'] = file_sha256(input_file)
+            previous = state.get(output_file)
+            if not force and previous and previous['sha256'] == job['sha256'] and os.path.exists(output_file):
+                job.update(status='skipped', rows=previous['rows'], errors=previous['errors'], seconds=0.0)
+                continue
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            pending[executor.submit(_convert_job, kind, input_file, output_file, chunksize)] = job
+        
+        for future in as_completed(pending):
+            job = pending[future]
+            try:
+                job['rows'], job['errors'], job['seconds'] = future.result()
+                job['status'] = 'converted'
+                state[job['output']] = {'sha256': job['sha256'], 'rows': job['rows'], 'errors': job['errors']}
+            except Exception as e:
+                job.update(status=f"failed: {e}", rows=0, errors=0, seconds=0.0)
+    
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    
+    if combine:
+        for kind, (_, _, output_name) in CONVERTERS.items():
+            frames = []
+            for job in summary:
+                if job['kind'] == kind and not job['status'].startswith('failed') and job['rows']:
+                    frame = read_excel_columns(job['output'])
+                    frame['Fair'] = job['fair']
+                    frames.append(frame)
+            if frames:
+                write_frames(frames, os.path.join(output_dir, output_name), 'xlsx')
+    return summary
+
+def print_summary(summary):
+    """Print per-file status, row counts and timings"""
+    print(f"{'Fair':<30}{'Kind':<11}{'Rows':>8}{'Errors':>8}{'Seconds':>9}  Status")
+    for job in summary:
+        print(f"{job['fair'][:29]:<30}{job['kind']:<11}{job['rows']:>8}{job['errors']:>8}"
+              f"{job['seconds']:>9.2f}  {job['status']}")
+
 def main():
-    """Main function to convert both files"""
+    """Convert the two default exports, or a batch of exports given on the command line"""
+    parser = argparse.ArgumentParser(description="Convert IEEE Career Fair Forms exports")
+    parser.add_argument("--companies", nargs="+", default=[], help="Company requirement exports (globs allowed)")
+    parser.add_argument("--students", nargs="+", default=[], help="Student registration exports (globs allowed)")
+    parser.add_argument("--manifest", help='JSON list of {"fair": ..., "companies": path, "students": path}')
+    parser.add_argument("--output-dir", default="converted", help="Folder for per-fair outputs")
+    parser.add_argument("--workers", type=int, default=None, help="Conversion processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Convert in chunks of this many rows")
+    parser.add_argument("--combine", action="store_true", help="Also write all fairs into one file per kind")
+    parser.add_argument("--force", action="store_true", help="Convert inputs even if they did not change")
+    args = parser.parse_args()
+    
+    if args.companies or args.students or args.manifest:
+        jobs = load_manifest(args.manifest) if args.manifest else []
+        for kind, patterns in (('companies', args.companies), ('students', args.students)):
+            for pattern in patterns:
+                paths = sorted(glob.glob(pattern))
+                if not paths:
+                    print(f"❌ No files match {pattern}")
+                jobs.extend((fair_name(path), kind, path) for path in paths)
+        
+        start = time.perf_counter()
+        summary = convert_batch(jobs, args.output_dir, args.workers, args.chunksize, args.force, args.combine)
+        print_summary(summary)
+        print(f"🎯 {len(summary)} files in {time.perf_counter() - start:.2f}s")
+        return
+    
+    # Without arguments, convert the two exports in the current folder
     print("IEEE Career Fair Data Converter")
     print("=" * 40)
     
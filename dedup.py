@@ -0,0 +1,325 @@
+import argparse
+import os
+import re
+import sys
+import time
+import zlib
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from matching_engine import DRIVE_FILE_ID_PATTERN, JobMatchingSystem, engine_options_from_env
+from vocabulary import DEFAULT_DEGREE_ALIASES, DEFAULT_SKILL_ALIASES, Vocabulary, normalize_term
+
+# Candidates whose feature sets have at least this Jaccard similarity are the same registration
+DEFAULT_THRESHOLD = 0.7
+
+# MinHash permutations, and the LSH bands they are cut into (4 rows per band finds pairs
+# down to a similarity of about 0.4, which the exact check then narrows to the threshold)
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32
+
+# Feature hashes permuted per MinHash block (bounds the block to about 50 MB)
+MINHASH_CHUNK = 50_000
+
+# Members of an LSH bucket are paired with at most this many neighbours (all of them in smaller
+# buckets), and the signature values neighbours are sorted by
+BUCKET_WINDOW = 20
+SORT_VALUES = 4
+
+# Candidate pairs whose exact similarity is computed per block
+SIMILARITY_CHUNK = 100_000
+
+# Words of resume text per shingle
+RESUME_SHINGLE_WORDS = 3
+
+EMPTY_HASH = np.uint64((1 << 64) - 1)
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Canonical skill and degree spellings, so "JS" and "JavaScript" are the same feature
+SKILLS = Vocabulary(DEFAULT_SKILL_ALIASES)
+DEGREES = Vocabulary(DEFAULT_DEGREE_ALIASES)
+
+
+def _text(value) -> str:
+    return "" if pd.isna(value) else str(value)
+
+
+def name_words(name) -> FrozenSet[str]:
+    """Case-folded words of a candidate name"""
+    return frozenset(WORD_PATTERN.findall(normalize_term(_text(name))))
+
+
+def drive_file_id(resume_link) -> Optional[str]:
+    """File ID of a Drive resume link, None for a missing or non-Drive link"""
+    link_match = DRIVE_FILE_ID_PATTERN.search(_text(resume_link))
+    return link_match.group(1) if link_match else None
+
+
+def same_registrant(first_name: FrozenSet[str], second_name: FrozenSet[str],
+                    first_file: Optional[str] = None, second_file: Optional[str] = None) -> bool:
+    """Whether two registrations can belong to one person: their names agree or they link the same resume
+
+    Names agree when one's words are all among the other's ("Deekshita Reddy" and "Deekshita Reddy P"),
+    a missing name agreeing with any.
+    """
+    if first_file is not None and first_file == second_file:
+        return True
+    return first_name <= second_name or second_name <= first_name
+
+
+def candidate_features(name, skills, degree=None, country=None, resume_link=None,
+                       resume_text: str = None) -> np.ndarray:
+    """Hash a registration into the sorted set of features its similarity is measured on
+
+    Name words, skills, degree and country are case- and spacing-insensitive, the resume
+    contributes its word shingles and a Drive link its file ID.
+    """
+    features = {f"n:{word}" for word in name_words(name)}
+    features |= {f"s:{SKILLS.normalize(skill)}" for skill in SKILLS.split(skills)}
+    if _text(degree):
+        features.add(f"d:{DEGREES.normalize(degree)}")
+    if _text(country):
+        features.add(f"c:{normalize_term(country)}")
+    file_id = drive_file_id(resume_link)
+    if file_id:
+        features.add(f"l:{file_id}")
+    if resume_text:
+        words = WORD_PATTERN.findall(resume_text.casefold())
+        starts = range(max(len(words) - RESUME_SHINGLE_WORDS, 0) + 1) if words else ()
+        features |= {"r:" + " ".join(words[start:start + RESUME_SHINGLE_WORDS]) for start in starts}
+    return np.unique(np.array([zlib.crc32(feature.encode()) for feature in features], dtype=np.uint64))
+
+
+def minhash_signatures(feature_sets: Sequence[np.ndarray], num_perm: int = DEFAULT_NUM_PERM,
+                       seed: int = 0) -> np.ndarray:
+    """Return a (row x num_perm) MinHash signature matrix; rows without features are all EMPTY_HASH"""
+    rng = np.random.default_rng(seed)
+    # Multiply-shift hashing of the 32-bit feature hashes: the high half of (a * x + b) mod 2**64
+    a = rng.integers(0, 1 << 64, num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+    b = rng.integers(0, 1 << 64, num_perm, dtype=np.uint64, endpoint=False)
+
+    signatures = np.full((len(feature_sets), num_perm), EMPTY_HASH, dtype=np.uint64)
+    rows = [row for row, features in enumerate(feature_sets) if len(features)]
+    start = 0
+    while start < len(rows):
+        # Whole rows per block, at least one even if it alone exceeds MINHASH_CHUNK
+        stop, size = start, 0
+        while stop < len(rows) and (stop == start or size + len(feature_sets[rows[stop]]) <= MINHASH_CHUNK):
+            size += len(feature_sets[rows[stop]])
+            stop += 1
+        block = rows[start:stop]
+        values = np.concatenate([feature_sets[row] for row in block])
+        hashed = (values[:, None] * a + b) >> np.uint64(32)
+        offsets = np.cumsum([0] + [len(feature_sets[row]) for row in block[:-1]])
+        signatures[block] = np.minimum.reduceat(hashed, offsets, axis=0)
+        start = stop
+    return signatures
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int = DEFAULT_BANDS) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield, band by band, the (first, second) row arrays of the pairs that agree on all of the band's values
+
+    Pairs are unique within a band (each pairs two positions of the bucket order) and first < second;
+    pairs agreeing on several bands repeat.
+    """
+    rows_per_band = signatures.shape[1] // bands
+    if rows_per_band < 1:
+        raise ValueError(f"{bands} bands need at least as many permutations")
+    rows = np.flatnonzero(signatures[:, 0] != EMPTY_HASH)
+    # Bands are bucketed by a 64-bit hash of their values; the rare collision only adds a pair to verify
+    weights = np.random.default_rng(bands).integers(1, 1 << 63, rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+    for band in range(bands):
+        values = signatures[rows, band * rows_per_band:(band + 1) * rows_per_band]
+        _, bucket = np.unique((values * weights).sum(axis=1), return_inverse=True)
+        bucket = bucket.ravel()
+        # Within a bucket, members are ordered by the following signature values, so members of
+        # large buckets sit next to the ones they share the most of those values with
+        following = signatures[rows[:, None], (np.arange(SORT_VALUES) + (band + 1) * rows_per_band) % signatures.shape[1]]
+        order = np.lexsort((*following.T[::-1], bucket))
+        members, bucket = rows[order], bucket[order]
+        # Pairing each member with the one `offset` places later pairs every two members of buckets
+        # up to BUCKET_WINDOW members and each member with its BUCKET_WINDOW - 1 followers in larger ones
+        firsts, seconds = [], []
+        for offset in range(1, min(BUCKET_WINDOW, len(members))):
+            same = bucket[:-offset] == bucket[offset:]
+            if not same.any():
+                break
+            firsts.append(np.minimum(members[:-offset][same], members[offset:][same]))
+            seconds.append(np.maximum(members[:-offset][same], members[offset:][same]))
+        if firsts:
+            yield np.concatenate(firsts), np.concatenate(seconds)
+
+
+def feature_matrix(feature_sets: Sequence[np.ndarray]) -> sparse.csr_matrix:
+    """Binary (row x feature) matrix of the feature sets"""
+    sizes = [len(features) for features in feature_sets]
+    values = np.concatenate(feature_sets) if len(feature_sets) else np.empty(0, dtype=np.uint64)
+    columns, features = np.unique(values, return_inverse=True)
+    return sparse.csr_matrix((np.ones(len(values), dtype=np.int32), features.ravel(), np.r_[0, np.cumsum(sizes)]),
+                             shape=(len(feature_sets), len(columns)))
+
+
+def pair_similarity(matrix: sparse.csr_matrix, firsts: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    """Exact Jaccard similarity of each (first, second) pair of rows of a feature_matrix"""
+    sizes = np.diff(matrix.indptr)
+    similarity = np.empty(len(firsts))
+    for start in range(0, len(firsts), SIMILARITY_CHUNK):
+        block = slice(start, start + SIMILARITY_CHUNK)
+        shared = np.asarray(matrix[firsts[block]].multiply(matrix[seconds[block]]).sum(axis=1)).ravel()
+        similarity[block] = shared / np.maximum(sizes[firsts[block]] + sizes[seconds[block]] - shared, 1)
+    return similarity
+
+
+def jaccard(first: np.ndarray, second: np.ndarray) -> float:
+    """Exact Jaccard similarity of two sorted feature sets"""
+    if not len(first) and not len(second):
+        return 0.0
+    shared = len(np.intersect1d(first, second, assume_unique=True))
+    return shared / (len(first) + len(second) - shared)
+
+
+def find_duplicate_clusters(feature_sets: Sequence[np.ndarray], threshold: float = DEFAULT_THRESHOLD,
+                            num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS,
+                            seed: int = 0, names: Optional[Sequence[FrozenSet[str]]] = None,
+                            file_ids: Optional[Sequence[Optional[str]]] = None) -> List[List[int]]:
+    """Group rows into clusters of near-duplicates (sorted rows, clusters of two or more only)
+
+    LSH proposes pairs in about linear time and each proposed pair is kept only if its exact
+    Jaccard similarity reaches threshold; clusters are the connected groups of kept pairs.
+    Given per-row names (name_words) and resume file IDs, a pair is also kept only if
+    same_registrant agrees, so two people sharing a pasted skills block stay apart.
+    """
+    matrix = feature_matrix(feature_sets)
+    duplicates = [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))]
+    for firsts, seconds in lsh_candidate_pairs(minhash_signatures(feature_sets, num_perm, seed), bands):
+        # Verified band by band, so only the duplicates are kept across bands
+        duplicate = pair_similarity(matrix, firsts, seconds) >= threshold
+        firsts, seconds = firsts[duplicate], seconds[duplicate]
+        if names is not None:
+            files = file_ids if file_ids is not None else [None] * len(names)
+            agree = np.fromiter((same_registrant(names[first], names[second], files[first], files[second])
+                                 for first, second in zip(firsts.tolist(), seconds.tolist())),
+                                dtype=bool, count=len(firsts))
+            firsts, seconds = firsts[agree], seconds[agree]
+        duplicates.append((firsts, seconds))
+    firsts, seconds = (np.concatenate(rows) for rows in zip(*duplicates))
+    graph = sparse.coo_matrix((np.ones(len(firsts)), (firsts, seconds)), shape=(len(feature_sets), len(feature_sets)))
+    _, labels = connected_components(graph, directed=False)
+
+    clusters: Dict[int, List[int]] = {}
+    for row, label in enumerate(labels.tolist()):
+        clusters.setdefault(label, []).append(row)
+    return sorted((rows for rows in clusters.values() if len(rows) > 1), key=lambda rows: rows[0])
+
+
+def deduplicate_candidates(candidates: pd.DataFrame, resume_texts: Optional[Sequence[str]] = None,
+                           threshold: float = DEFAULT_THRESHOLD, keep: str = "last",
+                           num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS,
+                           seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Collapse near-duplicate registrations, returning (collapsed candidates, cluster report)
+
+    Registrations are duplicates when similar enough and either their names agree or they
+    link the same resume file (see same_registrant). Each cluster keeps its first or last
+    registration (keep="first"/"last"; later form submissions usually correct earlier ones).
+    The collapsed table keeps sheet order and every column; the report lists every member
+    of every cluster.
+    """
+    if keep not in ("first", "last"):
+        raise ValueError(f"keep must be \"first\" or \"last\", not {keep!r}")
+
+    columns = {
+        name: candidates[name].tolist() if name in candidates.columns else [None] * len(candidates)
+        for name in ('Name', 'Skills', 'Degree', 'Country', 'Resume Link')
+    }
+    texts = resume_texts if resume_texts is not None else [None] * len(candidates)
+    feature_sets = [candidate_features(*values) for values in zip(*columns.values(), texts)]
+    names = [name_words(name) for name in columns['Name']]
+    file_ids = [drive_file_id(link) for link in columns['Resume Link']]
+    clusters = find_duplicate_clusters(feature_sets, threshold, num_perm, bands, seed, names, file_ids)
+
+    report, dropped = [], []
+    for cluster_id, rows in enumerate(clusters, start=1):
+        kept = rows[-1] if keep == "last" else rows[0]
+        for row in rows:
+            report.append({
+                "Cluster": cluster_id,
+                "Row": row,
+                "Name": columns['Name'][row],
+                "Resume Link": columns['Resume Link'][row],
+                "Similarity": round(jaccard(feature_sets[row], feature_sets[kept]), 4),
+                "Kept": row == kept
+            })
+            if row != kept:
+                dropped.append(row)
+
+    collapsed = candidates.drop(index=candidates.index[dropped]).reset_index(drop=True)
+    report = pd.DataFrame(report, columns=["Cluster", "Row", "Name", "Resume Link", "Similarity", "Kept"])
+    return collapsed, report
+
+
+def _resume_texts(candidates: pd.DataFrame) -> Optional[List[str]]:
+    """Resume text per row through the engine's resume pipeline (None unless a fetcher is configured)"""
+    engine = JobMatchingSystem(**engine_options_from_env())
+    if engine.resume_fetcher is None or 'Resume Link' not in candidates.columns:
+        return None
+    links = candidates['Resume Link'].tolist()
+    engine.prefetch_resumes(links)
+    texts = []
+    for link in links:
+        text = engine.get_resume(link).text if isinstance(link, str) and link else ""
+        texts.append("" if text == "Invalid Drive link format" else text)
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate candidate registrations (MinHash/LSH) and write a collapsed table"
+    )
+    parser.add_argument("candidates", help="Candidates workbook (e.g. converted_candidates.xlsx)")
+    parser.add_argument("-o", "--output", default="deduplicated_candidates.xlsx",
+                        help="Collapsed candidates (csv, parquet, arrow or xlsx, from the extension)")
+    parser.add_argument("--report", default="duplicate_clusters.csv", help="Cluster report, same formats")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum Jaccard similarity of duplicates (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--keep", choices=("first", "last"), default="last",
+                        help="Registration kept per cluster (default: the last submission)")
+    parser.add_argument("--no-resumes", action="store_true",
+                        help="Compare names, skills, degrees and links only, even if RESUME_DIR or "
+                             "RESUME_BACKEND is set")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM)
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from excel_ingest import read_excel_columns
+    from results_export import EXPORT_FORMATS, write_frames
+
+    formats = {}
+    for path in (args.output, args.report):
+        formats[path] = os.path.splitext(path)[1].lstrip('.').lower()
+        if formats[path] not in EXPORT_FORMATS:
+            parser.error(f"Unknown export format for {path} ({', '.join(EXPORT_FORMATS)})")
+
+    start = time.perf_counter()
+    candidates = read_excel_columns(args.candidates)
+    resume_texts = None if args.no_resumes else _resume_texts(candidates)
+    collapsed, report = deduplicate_candidates(candidates, resume_texts, args.threshold, args.keep,
+                                               args.num_perm, args.bands, args.seed)
+    write_frames([collapsed], args.output, formats[args.output])
+    write_frames([report], args.report, formats[args.report], sheet_name="Duplicates")
+
+    clusters = report["Cluster"].nunique()
+    print(f"{len(candidates)} registrations, {clusters} duplicate clusters, "
+          f"{len(candidates) - len(collapsed)} rows collapsed in {time.perf_counter() - start:.2f}s")
+    print(f"Collapsed candidates -> {args.output}")
+    print(f"Cluster report -> {args.report}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+from vocabulary import Vocabulary
+
+
+def spelling_contains(spelling: str, text: str, whole_word: bool = False) -> bool:
+    """Whether spelling contains text, as whole words only if whole_word ("b.e" is not in "b.ed")"""
+    if not whole_word:
+        return text in spelling
+    return re.search(r'(?<!\w)' + re.escape(text) + r'(?!\w)', spelling) is not None
+
+
+class DegreeIndex:
+    """Inverted index from the whitespace-separated tokens of degree spellings to degree IDs
+
+    Answers "which degrees have a spelling containing this text", the substring test behind the
+    degree check, without testing every spelling: a degree such as "Bachelor of Technology in
+    Computer Science" is filed under its level and field words, a query's words narrow the
+    degrees down to the intersection of a few posting lists, and only those are tested.
+    Spellings are added as the vocabulary grows, and answers already given are kept up to date.
+    Alias spellings never seen in the sheets only contain, or are contained in, whole words.
+    """
+
+    def __init__(self, vocabulary: Vocabulary):
+        self.vocabulary = vocabulary
+        # Per degree, spelling -> whether it only matches whole words (alias spellings)
+        self._spellings: List[Dict[str, bool]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._containing: Dict[Tuple[str, bool], Set[int]] = {}
+
+    def update(self):
+        """Index degrees and spellings added to the vocabulary since the last update"""
+        vocabulary = self.vocabulary
+        for degree_id in range(len(vocabulary)):
+            if degree_id == len(self._spellings):
+                self._spellings.append({})
+            known = self._spellings[degree_id]
+            # A spelling first known as an alias may turn up in the sheets later
+            for spelling in vocabulary.surface_forms(degree_id):
+                if known.get(spelling, True):
+                    self._add(degree_id, spelling, False)
+            for spelling in vocabulary.alias_forms(degree_id):
+                if spelling not in known:
+                    self._add(degree_id, spelling, True)
+
+    def _add(self, degree_id: int, spelling: str, whole_word: bool):
+        self._spellings[degree_id][spelling] = whole_word
+        for token in spelling.split():
+            self._postings.setdefault(token, set()).add(degree_id)
+        for (text, text_whole_word), degree_ids in self._containing.items():
+            if spelling_contains(spelling, text, whole_word or text_whole_word):
+                degree_ids.add(degree_id)
+
+    def containing(self, text: str, whole_word: bool = False) -> Set[int]:
+        """Return the IDs of the degrees with a spelling that contains text (as whole words if whole_word)"""
+        key = (text, whole_word)
+        if key not in self._containing:
+            self._containing[key] = {
+                degree_id for degree_id in self._candidates(text)
+                if any(spelling_contains(spelling, text, whole_word or spelling_whole_word)
+                       for spelling, spelling_whole_word in self._spellings[degree_id].items())
+            }
+        return self._containing[key]
+
+    def _candidates(self, text: str) -> Iterable[int]:
+        """Degrees whose tokens can hold text's tokens: a superset of the degrees containing text
+
+        A whitespace-free piece of a substring lies within one token of the spelling; inner pieces
+        are whole tokens, the first piece ends a token and the last one starts a token.
+        """
+        pieces = text.split()
+        if not pieces:
+            return range(len(self._spellings))
+
+        degree_ids = None
+        for position, piece in enumerate(pieces):
+            if len(pieces) == 1:
+                tokens = [token for token in self._postings if piece in token]
+            elif position == 0:
+                tokens = [token for token in self._postings if token.endswith(piece)]
+            elif position == len(pieces) - 1:
+                tokens = [token for token in self._postings if token.startswith(piece)]
+            else:
+                tokens = [piece] if piece in self._postings else []
+            matches = set().union(*(self._postings[token] for token in tokens))
+            degree_ids = matches if degree_ids is None else degree_ids & matches
+            if not degree_ids:
+                break
+        return degree_ids
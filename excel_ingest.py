@@ -0,0 +1,203 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+try:
+    import python_calamine
+except ImportError:  # openpyxl streaming is used without python-calamine
+    python_calamine = None
+
+ENGINES = ("auto", "openpyxl", "calamine")
+
+
+def convert_cell(value):
+    """Convert a raw cell value the same way pandas.read_excel does"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        # Whole numbers come back as int, like pandas' openpyxl reader
+        as_int = int(value)
+        return as_int if as_int == value else float(value)
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return pd.Timestamp(value)
+    return value
+
+
+def iter_sheet_rows(source, engine: str = "auto") -> Iterator[Sequence]:
+    """Yield the raw cell values of the first worksheet, row by row"""
+    if engine == "auto":
+        engine = "calamine" if python_calamine is not None else "openpyxl"
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown Excel engine: {engine}")
+
+    if engine == "calamine":
+        if python_calamine is None:
+            raise ValueError("python-calamine is not installed")
+        workbook = python_calamine.CalamineWorkbook.from_filelike(source) if hasattr(source, 'read') \
+            else python_calamine.CalamineWorkbook.from_path(source)
+        yield from workbook.get_sheet_by_index(0).to_python(skip_empty_area=False)
+        return
+
+    # Read-only mode streams rows from the XML instead of building the whole sheet in memory
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _projected_rows(source, columns: Optional[Sequence[str]], engine: str) -> Tuple[List, Iterator[List]]:
+    """Return the projected column names and an iterator over their converted cells, row by row"""
+    rows = iter_sheet_rows(source, engine)
+    header = next(rows, None)
+    if header is None:
+        return list(columns or []), iter(())
+
+    # Let pandas name the header (blank cells become "Unnamed: i", duplicates get ".1")
+    names = TextParser([[convert_cell(value) for value in header]], header=0).read().columns.tolist()
+    wanted = set(names) if columns is None else set(columns)
+    positions = [i for i, name in enumerate(names) if name in wanted]
+
+    def data_rows():
+        # Empty rows are held back until a later row has data, so trailing
+        # empty rows are dropped like read_excel does
+        pending = []
+        for row in rows:
+            projected = [convert_cell(row[i]) if i < len(row) else "" for i in positions]
+            if any(value is not None and value != "" for value in row):
+                yield from pending
+                pending = []
+                yield projected
+            else:
+                pending.append(projected)
+
+    return [names[i] for i in positions], data_rows()
+
+
+def _to_frame(data: List[List], names: List, dtypes: Optional[Dict[str, str]], start: int = 0) -> pd.DataFrame:
+    """Let pandas infer column types for projected rows, then pin `dtypes`"""
+    df = TextParser(data, header=None, names=names, skip_blank_lines=False).read()
+    df.index = pd.RangeIndex(start, start + len(df))
+    for column, dtype in (dtypes or {}).items():
+        if column in df.columns:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def read_excel_columns(source, columns: Optional[Sequence[str]] = None,
+                       dtypes: Optional[Dict[str, str]] = None, engine: str = "auto") -> pd.DataFrame:
+    """Read the first sheet of an .xlsx file, keeping only `columns` (all if None)
+
+    Values, column names and inferred dtypes match pd.read_excel(source)[columns];
+    `dtypes` then pins compact types, e.g. {"Country": "category"}.
+    """
+    names, rows = _projected_rows(source, columns, engine)
+    return _to_frame(list(rows), names, dtypes)
+
+
+def iter_excel_chunks(source, columns: Optional[Sequence[str]] = None, dtypes: Optional[Dict[str, str]] = None,
+                      chunksize: int = 10000, engine: str = "auto") -> Iterator[pd.DataFrame]:
+    """Yield the first sheet in frames of at most `chunksize` rows, indexed by sheet row position
+
+    Types are inferred per chunk, so a column only matches read_excel_columns
+    if its cells are typed consistently (e.g. not numbers in one chunk and text in another).
+    """
+    names, rows = _projected_rows(source, columns, engine)
+    start = 0
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if not chunk:
+            return
+        yield _to_frame(chunk, names, dtypes, start)
+        start += len(chunk)
+
+
+def _measure(load) -> Dict[str, float]:
+    """Return the wall time and peak traced memory of a load (timed separately, tracing slows it down)"""
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    df = load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": elapsed,
+        "peak_mb": peak / 1024 / 1024,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1024 / 1024
+    }
+
+
+def _repeat_workbook(path: str, repeat: int) -> str:
+    """Write a copy of the first sheet with its data rows repeated, for benchmarking larger sheets"""
+    rows = list(iter_sheet_rows(path, "openpyxl"))
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(rows[0])
+    for _ in range(repeat):
+        for row in rows[1:]:
+            sheet.append(row)
+    handle, out_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(handle)
+    workbook.save(out_path)
+    return out_path
+
+
+def main():
+    """Benchmark full pd.read_excel against streaming projected ingestion"""
+    parser = argparse.ArgumentParser(description="Benchmark Excel ingestion")
+    parser.add_argument("file", nargs="?", default="IEEE R10 Career Fair - Student Registration (Responses).xlsx",
+                        help="Workbook to read")
+    parser.add_argument("--columns", nargs="+", default=[
+        "Full Name", " Country", "Country",
+        "Field of Study (Specialization /Department)\nPlease mention your UG and PG study details",
+        "Highest academic qualification", "Please mention your technical skills",
+        "Please upload your recent resume"
+    ], help="Columns to keep")
+    parser.add_argument("--category", nargs="*", default=[" Country", "Country"],
+                        help="Columns stored as categoricals")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat the data rows to simulate a larger sheet")
+    parser.add_argument("--engine", choices=ENGINES, default="auto", help="Streaming engine")
+    args = parser.parse_args()
+
+    path = _repeat_workbook(args.file, args.repeat) if args.repeat > 1 else args.file
+    try:
+        dtypes = {column: "category" for column in args.category}
+        full = _measure(lambda: pd.read_excel(path, engine="openpyxl"))
+        streamed = _measure(lambda: read_excel_columns(path, args.columns, dtypes, args.engine))
+
+        expected = pd.read_excel(path, engine="openpyxl")
+        expected = expected[[c for c in expected.columns if c in set(args.columns)]]
+        actual = read_excel_columns(path, args.columns, engine=args.engine)
+        identical = expected.equals(actual)
+    finally:
+        if path != args.file:
+            os.remove(path)
+
+    print(f"{'':<22}{'seconds':>10}{'peak MB':>10}{'frame MB':>10}")
+    print(f"{'pd.read_excel (all)':<22}{full['seconds']:>10.3f}{full['peak_mb']:>10.1f}{full['frame_mb']:>10.2f}")
+    print(f"{'streamed + projected':<22}{streamed['seconds']:>10.3f}{streamed['peak_mb']:>10.1f}"
+          f"{streamed['frame_mb']:>10.2f}")
+    print(f"Projected columns identical to pd.read_excel: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,180 +1,246 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from io import BytesIO
-import requests
-import re
-from typing import List, Dict, Tuple
 import plotly.express as px
-import plotly.graph_objects as go
+import pandas as pd
 from datetime import datetime
+import math
 import os
+import re
+import time
+from typing import Dict, List
 
-class JobMatchingSystem:
-    def __init__(self):
-        self.companies_data = None
-        self.candidates_data = None
-        self.resume_data = {}
-        
-    def load_excel_file(self, uploaded_file) -> pd.DataFrame:
-        """Load Excel file and return DataFrame"""
-        try:
-            if uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_file, engine='openpyxl')
-            elif uploaded_file.name.endswith('.xls'):
-                df = pd.read_excel(uploaded_file, engine='xlrd')
-            else:
-                st.error("Please upload an Excel file (.xlsx or .xls)")
-                return None
-            return df
-        except Exception as e:
-            st.error(f"Error loading file: {str(e)}")
-            return None
-    
-    def extract_resume_from_drive(self, drive_link: str) -> str:
-        """Extract resume content from Google Drive link"""
-        try:
-            # Extract file ID from Google Drive link
-            file_id_match = re.search(r'/d/([a-zA-Z0-9-_]+)', drive_link)
-            if file_id_match:
-                file_id = file_id_match.group(1)
-                # For now, return placeholder content
-                # In production, you'd use Google Drive API to extract actual content
-                return f"Resume content from Drive ID: {file_id}"
-            else:
-                return "Invalid Drive link format"
-        except Exception as e:
-            return f"Error extracting resume: {str(e)}"
-    
-    def analyze_resume_eligibility(self, resume_content: str, required_skills: List[str]) -> Dict:
-        """Analyze resume for skill matches and eligibility"""
-        if not resume_content or resume_content == "Invalid Drive link format":
-            return {"eligible": False, "skill_matches": [], "match_percentage": 0}
+import matching_engine
+from matching_engine import (
+    CANDIDATE_COLUMNS, CANDIDATE_DTYPES, COMPANY_COLUMNS, COMPANY_DTYPES, engine_options_from_env
+)
+from match_store import MatchStore
+from profiling import PipelineProfile
+from results_export import MIME_TYPES, available_formats, export_bytes
+from shared_index import SharedRegistry
+from vocabulary import DEFAULT_DEGREE_ALIASES, DEFAULT_SKILL_ALIASES
+from workbook_cache import workbook_key
+
+# Roles shown per page of the detailed analysis
+DETAIL_PAGE_SIZE = 20
+
+# Minimum seconds between redraws of the live results table while matching
+LIVE_REFRESH_SECONDS = 0.5
+
+class JobMatchingSystem(matching_engine.JobMatchingSystem):
+    """Matching engine that reports load errors in the Streamlit page"""
+    
+    def report_error(self, message: str):
+        st.error(message)
+
+def render_match_lookup(store: MatchStore):
+    """Sidebar lookups against the saved match store"""
+    st.sidebar.header("🔎 Saved Matches")
+    stats = store.stats()
+    if not stats["pair_scores"]:
+        st.sidebar.caption("No saved matches yet")
+        return
+    st.sidebar.caption(
+        f"{stats['pair_scores']} pairs for {stats['companies']} roles and {stats['candidates']} candidates"
+    )
+    
+    candidate_name = st.sidebar.text_input("Roles for candidate", help="Exact name, any case")
+    if candidate_name:
+        st.sidebar.dataframe(store.candidate_matches(candidate_name.strip()), use_container_width=True)
+    
+    company_name = st.sidebar.text_input("Candidates for company", help="Exact name, any case")
+    if company_name:
+        st.sidebar.dataframe(store.company_matches(company_name.strip()), use_container_width=True)
+
+def render_performance(profile: PipelineProfile, load_profiles: Dict[str, PipelineProfile]):
+    """Collapsible per-stage timings and counters of the last run, including the uploads it used"""
+    combined = PipelineProfile()
+    for load_profile in load_profiles.values():
+        combined.add(load_profile)
+    combined.add(profile)
+    
+    with st.expander("⏱️ Performance"):
+        st.caption("Wall and CPU seconds per stage; nested stages (\"match/score\") are part of their parent")
+        st.dataframe(combined.stage_rows(), use_container_width=True)
+        st.dataframe([{"counter": name, "value": value} for name, value in combined.counters().items()],
+                     use_container_width=True)
+        if combined.functions:
+            st.subheader("Slowest functions (cProfile)")
+            st.dataframe(combined.functions, use_container_width=True)
+        if combined.memory is not None:
+            st.metric("Peak traced memory", f"{combined.memory['peak_bytes'] / 1024 / 1024:.1f} MB")
+            st.dataframe(combined.memory["top_allocations"], use_container_width=True)
+        st.download_button(
+            label="📥 Download Performance Profile",
+            data=combined.to_json(),
+            file_name="job_matching_profile.json",
+            mime="application/json"
+        )
+
+def render_results(matching_system: JobMatchingSystem, last_run: Dict, export_format: str, export_pairs: bool):
+    """Results table, downloads, charts and per-role details of the last run"""
+    results_df = last_run["results"]
+    profile = last_run["profile"]
+    if results_df.empty:
+        st.warning("No matching results found. Please check your data format.")
+        render_performance(profile, st.session_state.load_profiles)
+        return
+    
+    st.header("📈 Matching Results")
+    
+    # Display results table
+    st.dataframe(results_df, use_container_width=True)
+    
+    # Download results (built once per format, not on every rerun)
+    exports = last_run["exports"]
+    timestamp = last_run["timestamp"]
+    if ("results", export_format) not in exports:
+        with profile.stage("export"):
+            exports["results", export_format] = export_bytes([results_df], export_format, sheet_name="Results")
+    st.download_button(
+        label=f"📥 Download Results as {export_format.upper()}",
+        data=exports["results", export_format],
+        file_name=f"job_matching_results_{timestamp}.{export_format}",
+        mime=MIME_TYPES[export_format]
+    )
+    if export_pairs:
+        if ("pairs", export_format) not in exports:
+            with profile.stage("export"):
+                exports["pairs", export_format] = export_bytes(matching_system.iter_pair_scores(), export_format,
+                                                               sheet_name="Pair Scores")
+        st.download_button(
+            label=f"📥 Download All Pair Scores as {export_format.upper()}",
+            data=exports["pairs", export_format],
+            file_name=f"job_matching_pair_scores_{timestamp}.{export_format}",
+            mime=MIME_TYPES[export_format]
+        )
+    
+    # Visualizations
+    with profile.stage("render"):
+        st.header("📊 Analytics Dashboard")
         
-        # Convert skills to lowercase for comparison
-        resume_lower = resume_content.lower()
-        required_skills_lower = [skill.lower().strip() for skill in required_skills]
+        col1, col2 = st.columns(2)
         
-        # Find matching skills
-        skill_matches = []
-        for skill in required_skills_lower:
-            if skill in resume_lower:
-                skill_matches.append(skill)
+        with col1:
+            # Candidates count by company
+            fig_candidates = px.bar(
+                results_df,
+                x="Company Name",
+                y="Candidates Count",
+                title="Eligible Candidates per Company",
+                color="Candidates Count",
+                color_continuous_scale="viridis"
+            )
+            fig_candidates.update_layout(xaxis_tickangle=-45)
+            st.plotly_chart(fig_candidates, use_container_width=True)
         
-        # Calculate match percentage
-        match_percentage = (len(skill_matches) / len(required_skills_lower)) * 100 if required_skills_lower else 0
+        with col2:
+            # Top candidate match percentage
+            fig_match = px.bar(
+                results_df,
+                x="Company Name",
+                y="Top Candidate Match %",
+                title="Top Candidate Skill Match %",
+                color="Top Candidate Match %",
+                color_continuous_scale="plasma"
+            )
+            fig_match.update_layout(xaxis_tickangle=-45)
+            st.plotly_chart(fig_match, use_container_width=True)
         
-        # Consider eligible if at least 60% skills match
-        eligible = match_percentage >= 60
+        # Summary statistics
+        st.subheader("📋 Summary Statistics")
+        col1, col2, col3, col4 = st.columns(4)
         
-        return {
-            "eligible": eligible,
-            "skill_matches": skill_matches,
-            "match_percentage": round(match_percentage, 2)
-        }
-    
-    def check_country_compatibility(self, company_country: str, candidate_country: str) -> bool:
-        """Check if company and candidate are from the same country"""
-        if pd.isna(company_country) or pd.isna(candidate_country):
-            return False
-        return company_country.strip().lower() == candidate_country.strip().lower()
-    
-    def process_skills(self, skills_str: str) -> List[str]:
-        """Process skills string into list of individual skills"""
-        if pd.isna(skills_str):
-            return []
+        with col1:
+            st.metric("Total Companies", len(results_df))
         
-        # Split by common delimiters
-        skills = re.split(r'[,;|]', str(skills_str))
-        # Clean up each skill
-        skills = [skill.strip() for skill in skills if skill.strip()]
-        return skills
-    
-    def process_degrees(self, degrees_str: str) -> List[str]:
-        """Process degrees string into list of individual degrees"""
-        if pd.isna(degrees_str):
-            return []
+        with col2:
+            st.metric("Total Candidates", results_df["Candidates Count"].sum())
         
-        # Split by common delimiters
-        degrees = re.split(r'[,;|]', str(degrees_str))
-        # Clean up each degree
-        degrees = [degree.strip() for degree in degrees if degree.strip()]
-        return degrees
-    
-    def match_candidates_to_jobs(self) -> pd.DataFrame:
-        """Match candidates to job requirements and return results"""
-        if self.companies_data is None or self.candidates_data is None:
-            return pd.DataFrame()
+        with col3:
+            avg_candidates = results_df["Candidates Count"].mean()
+            st.metric("Avg Candidates/Company", f"{avg_candidates:.1f}")
         
-        results = []
+        with col4:
+            avg_match = results_df["Top Candidate Match %"].mean()
+            st.metric("Avg Top Match %", f"{avg_match:.1f}%")
         
-        for _, company_row in self.companies_data.iterrows():
-            company_name = company_row.get('Company Name', 'Unknown')
-            role = company_row.get('Role', 'Unknown')
-            required_skills = self.process_skills(company_row.get('Required Skills', ''))
-            eligible_degrees = self.process_degrees(company_row.get('Eligible Degrees', ''))
-            company_country = company_row.get('Country', '')
-            requirement_count = company_row.get('Requirement Count', 1)
-            
-            eligible_candidates = []
-            
-            for _, candidate_row in self.candidates_data.iterrows():
-                candidate_name = candidate_row.get('Name', 'Unknown')
-                candidate_country = candidate_row.get('Country', '')
-                candidate_degree = candidate_row.get('Degree', '')
-                candidate_skills = self.process_skills(candidate_row.get('Skills', ''))
-                resume_link = candidate_row.get('Resume Link', '')
-                
-                # Check country compatibility
-                country_match = self.check_country_compatibility(company_country, candidate_country)
-                
-                # Check degree eligibility
-                degree_eligible = False
-                if candidate_degree and eligible_degrees:
-                    candidate_degree_lower = candidate_degree.lower()
-                    degree_eligible = any(degree.lower() in candidate_degree_lower for degree in eligible_degrees)
-                
-                # Analyze resume if available
-                resume_analysis = {"eligible": False, "skill_matches": [], "match_percentage": 0}
-                if resume_link:
-                    resume_content = self.extract_resume_from_drive(resume_link)
-                    resume_analysis = self.analyze_resume_eligibility(resume_content, required_skills)
-                
-                # Determine overall eligibility
-                overall_eligible = (
-                    country_match and 
-                    degree_eligible and 
-                    resume_analysis["eligible"]
-                )
-                
-                if overall_eligible:
-                    eligible_candidates.append({
-                        "name": candidate_name,
-                        "country": candidate_country,
-                        "degree": candidate_degree,
-                        "skill_match_percentage": resume_analysis["match_percentage"],
-                        "matched_skills": resume_analysis["skill_matches"]
-                    })
-            
-            # Sort candidates by skill match percentage
-            eligible_candidates.sort(key=lambda x: x["skill_match_percentage"], reverse=True)
+        render_details(results_df)
+    
+    render_performance(profile, st.session_state.load_profiles)
+
+def render_details(results_df):
+    """Per-role details, searchable and paged so only DETAIL_PAGE_SIZE expanders are drawn per rerun"""
+    st.header("🔍 Detailed Analysis")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search = st.text_input("Search roles", key="detail_search",
+                               help="Matches company name, role, country or required skills, any case")
+    rows = results_df
+    if search.strip():
+        searchable = results_df[["Company Name", "Role", "Country", "Required Skills"]].astype(str) \
+            .agg(" ".join, axis=1).str.lower()
+        rows = results_df[searchable.str.contains(search.strip().lower(), regex=False)]
+    
+    pages = max(1, math.ceil(len(rows) / DETAIL_PAGE_SIZE))
+    # A narrower search can leave the remembered page past the end
+    if st.session_state.get("detail_page", 1) > pages:
+        st.session_state.detail_page = pages
+    with col2:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="detail_page")
+    
+    start = (page - 1) * DETAIL_PAGE_SIZE
+    page_rows = rows.iloc[start:start + DETAIL_PAGE_SIZE]
+    if rows.empty:
+        st.caption("No roles match the search")
+        return
+    st.caption(f"Showing {start + 1}-{start + len(page_rows)} of {len(rows)} roles")
+    
+    for _, row in page_rows.iterrows():
+        with st.expander(f"📋 {row['Company Name']} - {row['Role']}"):
+            col1, col2 = st.columns(2)
             
-            # Take top candidates based on requirement count
-            top_candidates = eligible_candidates[:requirement_count]
+            with col1:
+                st.write("**Company Details:**")
+                st.write(f"- Role: {row['Role']}")
+                st.write(f"- Country: {row['Country']}")
+                st.write(f"- Required Skills: {row['Required Skills']}")
+                st.write(f"- Eligible Degrees: {row['Eligible Degrees']}")
+                st.write(f"- Requirement Count: {row['Requirement Count']}")
             
-            results.append({
-                "Company Name": company_name,
-                "Role": role,
-                "Required Skills": ", ".join(required_skills),
-                "Eligible Degrees": ", ".join(eligible_degrees),
-                "Eligible Students (Partial List)": ", ".join([c["name"] for c in top_candidates]),
-                "Requirement Count": requirement_count,
-                "Candidates Count": len(eligible_candidates),
-                "Country": company_country,
-                "Top Candidate Match %": top_candidates[0]["skill_match_percentage"] if top_candidates else 0
-            })
-        
-        return pd.DataFrame(results)
+            with col2:
+                st.write("**Matching Results:**")
+                st.write(f"- Total Eligible Candidates: {row['Candidates Count']}")
+                st.write(f"- Top Candidate Match: {row['Top Candidate Match %']}%")
+                st.write(f"- Selected Candidates: {row['Eligible Students (Partial List)']}")
+
+@st.cache_resource
+def shared_resources() -> SharedRegistry:
+    """Parsed uploads and warm indexes, shared by every session of this process"""
+    return SharedRegistry()
+
+def upload_key(uploaded_file, columns: List[str], dtypes: Dict[str, str]) -> tuple:
+    """Shared resource key of an upload: its content hash and how it is parsed"""
+    return ("workbook", workbook_key(uploaded_file.getvalue(),
+                                     repr((os.path.splitext(uploaded_file.name)[1], columns, dtypes))))
+
+def match_store_path(base_path: str, companies_name: str, candidates_name: str) -> str:
+    """SQLite file of a fair: base_path with the two upload file names before the extension
+
+    Named after the files, not their contents, so an edited sheet updates its store in place
+    (only the roles its changes touch are re-matched).
+    """
+    root, extension = os.path.splitext(base_path)
+    stems = [re.sub(r'[^\w.-]+', '_', os.path.splitext(os.path.basename(name))[0]) for name in
+             (companies_name, candidates_name)]
+    return f"{root}-{stems[0]}-{stems[1]}{extension or '.db'}"
+
+# Stores kept open at once; an evicted store's connection closes once no session uses it
+MATCH_STORES_OPEN = 8
+
+@st.cache_resource(max_entries=MATCH_STORES_OPEN)
+def open_match_store(path: str) -> MatchStore:
+    """One store per file for the whole process, so sessions saving the same fair take turns"""
+    return MatchStore(path)
 
 def main():
     st.set_page_config(
@@ -186,12 +252,24 @@ def main():
     st.title("🎯 Job Matching System")
     st.markdown("Compare Excel sheets to match candidates with job requirements")
     
-    # Initialize system
+    # Initialize system (caches and resume downloads are configured from the environment,
+    # see engine_options_from_env)
     if 'matching_system' not in st.session_state:
-        st.session_state.matching_system = JobMatchingSystem()
+        st.session_state.matching_system = JobMatchingSystem(**engine_options_from_env())
     
     matching_system = st.session_state.matching_system
     
+    # Stage timings of the current uploads, shown with every run's Performance panel
+    if 'load_profiles' not in st.session_state:
+        st.session_state.load_profiles = {}
+    
+    # Sessions uploading the same sheets share one parsed copy and one warm index; this session only
+    # holds handles, released when it loads something else or ends (unreferenced copies are evicted)
+    registry = shared_resources()
+    if 'shared_handles' not in st.session_state:
+        st.session_state.shared_handles = {}
+    handles = st.session_state.shared_handles
+    
     # Sidebar for file uploads
     st.sidebar.header("📁 Upload Files")
     
@@ -209,17 +287,140 @@ def main():
         help="Excel file containing candidate information"
     )
     
-    # Load data
+    # Matching engine
+    matching_system.engine = st.sidebar.selectbox(
+        "Matching Engine",
+        JobMatchingSystem.ENGINES,
+        help="The vectorized engine returns the same results as the legacy pair-by-pair loop, much faster"
+    )
+    matching_system.selection = st.sidebar.selectbox(
+        "Candidate Selection",
+        JobMatchingSystem.SELECTIONS,
+        help="Greedy lets each company take its top candidates; assignment spreads candidates "
+             "across companies to maximize the total match"
+    )
+    if matching_system.selection == "assignment":
+        matching_system.engine = "vectorized"
+        matching_system.max_interviews_per_candidate = st.sidebar.number_input(
+            "Max interviews per candidate", min_value=1, value=3, step=1
+        )
+    
+    matching_system.skill_word_boundary = st.sidebar.checkbox(
+        "Match whole-word skills only",
+        value=False,
+        help="Stops short skills such as \"R\" or \"Go\" from matching inside unrelated words"
+    )
+    
+    matching_system.eligibility_threshold = st.sidebar.slider(
+        "Minimum skill match %",
+        min_value=0,
+        max_value=100,
+        value=int(matching_engine.ELIGIBILITY_THRESHOLD),
+        help="Share of a role's required skills a resume must mention for the candidate to be eligible"
+    )
+    matching_system.skill_pruning = st.sidebar.selectbox(
+        "Skill pruning",
+        JobMatchingSystem.SKILL_PRUNING,
+        help="\"declared\" skips the resume of any pair whose declared skills already miss the minimum; "
+             "faster, but drops candidates whose resume lists skills they did not declare"
+    )
+    
+    resolve_aliases = st.sidebar.checkbox(
+        "Resolve skill and degree aliases",
+        value=False,
+        help="Treats spellings such as \"ML\" / \"Machine Learning\" or \"B.Tech\" / "
+             "\"Bachelor of Technology\" as the same term (vectorized engine only)"
+    )
+    if resolve_aliases != bool(matching_system.skill_vocabulary.aliases):
+        if resolve_aliases:
+            matching_system.set_aliases(DEFAULT_SKILL_ALIASES, DEFAULT_DEGREE_ALIASES)
+        else:
+            matching_system.set_aliases()
+    if resolve_aliases:
+        matching_system.engine = "vectorized"
+    
+    export_format = st.sidebar.selectbox(
+        "Results Export Format",
+        available_formats(),
+        help="Parquet and Arrow keep column types and load much faster than CSV or Excel"
+    )
+    export_pairs = st.sidebar.checkbox(
+        "Export pair-level scores",
+        value=False,
+        help="Also offers every eligible company/candidate pair with its match % and rank, "
+             "not just the top candidates per role"
+    )
+    
+    with st.sidebar.expander("⏱️ Profiling"):
+        profile_functions = st.checkbox(
+            "Profile functions (cProfile)",
+            value=False,
+            help="Lists the functions that took longest in the Performance panel; makes the run slower"
+        )
+        trace_memory = st.checkbox(
+            "Trace memory (tracemalloc)",
+            value=False,
+            help="Reports peak memory and the largest allocations; makes the run much slower"
+        )
+    
+    # Load data (only when the uploaded file changed, so reruns keep the parsed tables and indexes)
     if companies_file:
-        matching_system.companies_data = matching_system.load_excel_file(companies_file)
+        key = upload_key(companies_file, COMPANY_COLUMNS, COMPANY_DTYPES)
+        if handles.get('companies') is None or handles['companies'].key != key:
+            matching_system.profile = st.session_state.load_profiles['companies'] = PipelineProfile()
+            handle = handles['companies'] = registry.replace(
+                handles.get('companies'), key,
+                lambda: matching_system.load_excel_file(companies_file, COMPANY_COLUMNS, COMPANY_DTYPES)
+            )
+            # A failed load is not shared, so every session (and rerun) that loads it shows its error
+            matching_system.companies_data = handle.value if handle is not None else None
+            st.session_state.last_run = None
         if matching_system.companies_data is not None:
             st.sidebar.success(f"✅ Companies data loaded: {len(matching_system.companies_data)} records")
     
     if candidates_file:
-        matching_system.candidates_data = matching_system.load_excel_file(candidates_file)
+        key = upload_key(candidates_file, CANDIDATE_COLUMNS, CANDIDATE_DTYPES)
+        if handles.get('candidates') is None or handles['candidates'].key != key:
+            matching_system.profile = st.session_state.load_profiles['candidates'] = PipelineProfile()
+            handle = handles['candidates'] = registry.replace(
+                handles.get('candidates'), key,
+                lambda: matching_system.load_excel_file(candidates_file, CANDIDATE_COLUMNS, CANDIDATE_DTYPES)
+            )
+            # A failed load is not shared, so every session (and rerun) that loads it shows its error
+            matching_system.candidates_data = handle.value if handle is not None else None
+            st.session_state.last_run = None
         if matching_system.candidates_data is not None:
             st.sidebar.success(f"✅ Candidates data loaded: {len(matching_system.candidates_data)} records")
     
+    # Vocabularies and indexes are built once per pair of uploads (and alias setting) in the process
+    if matching_system.companies_data is not None and matching_system.candidates_data is not None:
+        key = ("index", handles['companies'].key, handles['candidates'].key, resolve_aliases)
+        if handles.get('index') is None or handles['index'].key != key:
+            matching_system.profile = st.session_state.load_profiles['index'] = PipelineProfile()
+            aliases = (DEFAULT_SKILL_ALIASES, DEFAULT_DEGREE_ALIASES) if resolve_aliases else ()
+            handles['index'] = registry.replace(handles.get('index'), key,
+                                                lambda: matching_system.build_shared_index(*aliases))
+            matching_system.use_shared_index(handles['index'].value)
+        shared = registry.stats()
+        st.sidebar.caption(
+            f"Shared across sessions: {shared['resources']} tables and indexes, "
+            f"{shared['references']} session references"
+        )
+    elif handles.get('index') is not None:
+        # A failed upload replaced one of the tables, so the index of the old pair is not needed
+        handles.pop('index').release()
+    
+    # Set MATCH_DB_PATH to keep every run's scores in SQLite, queryable after a refresh: each pair of
+    # upload file names has its own file, so sessions working on other sheets never overwrite it
+    match_store = None
+    if os.environ.get("MATCH_DB_PATH") and companies_file and candidates_file and \
+            handles.get('index') is not None:
+        match_store = open_match_store(match_store_path(os.environ["MATCH_DB_PATH"], companies_file.name,
+                                                        candidates_file.name))
+    
+    if match_store is not None:
+        render_match_lookup(match_store)
+    
     # Main content area
     if matching_system.companies_data is not None and matching_system.candidates_data is not None:
         st.header("📊 Data Preview")
@@ -237,95 +438,71 @@ def main():
         # Run matching
         if st.button("🚀 Run Job Matching Analysis", type="primary"):
             with st.spinner("Analyzing job-candidate matches..."):
-                results_df = matching_system.match_candidates_to_jobs()
-                
-                if not results_df.empty:
-                    st.header("📈 Matching Results")
-                    
-                    # Display results table
-                    st.dataframe(results_df, use_container_width=True)
-                    
-                    # Download results
-                    csv = results_df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download Results as CSV",
-                        data=csv,
-                        file_name=f"job_matching_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
+                profile = PipelineProfile(cprofile=profile_functions, trace_memory=trace_memory)
+                matching_system.profile = profile
+                total_roles = len(matching_system.companies_data)
+                progress = st.progress(0.0, text=f"Matching {total_roles} roles...")
+                live_table = st.empty()
+                with profile.capture():
+                    # Show roles as they finish; the table is redrawn at most every LIVE_REFRESH_SECONDS
+                    pieces, matched, refreshed = [], 0, 0.0
+                    for piece in matching_system.iter_match_results():
+                        pieces.append(piece)
+                        matched += len(piece)
+                        if time.monotonic() - refreshed >= LIVE_REFRESH_SECONDS or matched == total_roles:
+                            progress.progress(matched / total_roles, text=f"Matched {matched} of {total_roles} roles")
+                            live_table.dataframe(pd.concat(pieces).sort_index(), use_container_width=True)
+                            refreshed = time.monotonic()
+                    results_df = matching_system.last_results
+                    if match_store is not None:
+                        saved_pairs = matching_system.save_matches(match_store, results_df)
+                progress.empty()
+                live_table.empty()
+                # Kept across reruns, so paging through the details does not match again
+                st.session_state.last_run = {
+                    "results": results_df,
+                    "profile": profile,
+                    "timestamp": datetime.now().strftime('%Y%m%d_%H%M%S'),
+                    "exports": {}
+                }
+                st.session_state.detail_page = 1
+                if matching_system.resume_errors:
+                    st.sidebar.warning(f"⚠️ {len(matching_system.resume_errors)} resumes could not be downloaded")
+                if matching_system.engine == "vectorized" and matching_system.selection == "greedy":
+                    st.sidebar.caption(
+                        f"Re-matched {matching_system.rematched_roles} of "
+                        f"{len(matching_system.companies_data)} roles"
                     )
-                    
-                    # Visualizations
-                    st.header("📊 Analytics Dashboard")
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # Candidates count by company
-                        fig_candidates = px.bar(
-                            results_df,
-                            x="Company Name",
-                            y="Candidates Count",
-                            title="Eligible Candidates per Company",
-                            color="Candidates Count",
-                            color_continuous_scale="viridis"
-                        )
-                        fig_candidates.update_layout(xaxis_tickangle=-45)
-                        st.plotly_chart(fig_candidates, use_container_width=True)
-                    
-                    with col2:
-                        # Top candidate match percentage
-                        fig_match = px.bar(
-                            results_df,
-                            x="Company Name",
-                            y="Top Candidate Match %",
-                            title="Top Candidate Skill Match %",
-                            color="Top Candidate Match %",
-                            color_continuous_scale="plasma"
-                        )
-                        fig_match.update_layout(xaxis_tickangle=-45)
-                        st.plotly_chart(fig_match, use_container_width=True)
-                    
-                    # Summary statistics
-                    st.subheader("📋 Summary Statistics")
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Total Companies", len(results_df))
-                    
-                    with col2:
-                        st.metric("Total Candidates", results_df["Candidates Count"].sum())
-                    
-                    with col3:
-                        avg_candidates = results_df["Candidates Count"].mean()
-                        st.metric("Avg Candidates/Company", f"{avg_candidates:.1f}")
-                    
-                    with col4:
-                        avg_match = results_df["Top Candidate Match %"].mean()
-                        st.metric("Avg Top Match %", f"{avg_match:.1f}%")
-                    
-                    # Detailed analysis
-                    st.header("🔍 Detailed Analysis")
-                    
-                    for _, row in results_df.iterrows():
-                        with st.expander(f"📋 {row['Company Name']} - {row['Role']}"):
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.write("**Company Details:**")
-                                st.write(f"- Role: {row['Role']}")
-                                st.write(f"- Country: {row['Country']}")
-                                st.write(f"- Required Skills: {row['Required Skills']}")
-                                st.write(f"- Eligible Degrees: {row['Eligible Degrees']}")
-                                st.write(f"- Requirement Count: {row['Requirement Count']}")
-                            
-                            with col2:
-                                st.write("**Matching Results:**")
-                                st.write(f"- Total Eligible Candidates: {row['Candidates Count']}")
-                                st.write(f"- Top Candidate Match: {row['Top Candidate Match %']}%")
-                                st.write(f"- Selected Candidates: {row['Eligible Students (Partial List)']}")
+                if match_store is not None:
+                    st.sidebar.caption(f"Saved {saved_pairs} pair scores to {match_store.path}")
+                cache_stats = matching_system.resume_cache.stats()
+                st.sidebar.caption(
+                    f"Resume cache: {cache_stats['hits'] + cache_stats['disk_hits']} hits, "
+                    f"{cache_stats['misses']} misses, {cache_stats['size']} cached"
+                )
                 
-                else:
-                    st.warning("No matching results found. Please check your data format.")
+                if len(matching_system.skill_vocabulary) or len(matching_system.degree_vocabulary):
+                    with st.expander("🔤 Skill and Degree Vocabulary"):
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.dataframe(matching_system.skill_vocabulary.export(), use_container_width=True)
+                            st.download_button(
+                                label="📥 Download Skill Vocabulary",
+                                data=matching_system.skill_vocabulary.to_json(),
+                                file_name="skill_vocabulary.json",
+                                mime="application/json"
+                            )
+                        with col2:
+                            st.dataframe(matching_system.degree_vocabulary.export(), use_container_width=True)
+                            st.download_button(
+                                label="📥 Download Degree Vocabulary",
+                                data=matching_system.degree_vocabulary.to_json(),
+                                file_name="degree_vocabulary.json",
+                                mime="application/json"
+                            )
+        
+        if st.session_state.get('last_run') is not None:
+            render_results(matching_system, st.session_state.last_run, export_format, export_pairs)
     
     else:
         st.info("👆 Please upload both companies and candidates Excel files to begin analysis.")
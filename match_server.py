@@ -0,0 +1,210 @@
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matching_engine import (
+    CANDIDATE_COLUMNS, CANDIDATE_DTYPES, COMPANY_COLUMNS, COMPANY_DTYPES, ELIGIBILITY_THRESHOLD, JobMatchingSystem,
+    UnsupportedWorkbookError
+)
+from resume_cache import ResumeCache
+from vocabulary import DEFAULT_DEGREE_ALIASES, DEFAULT_SKILL_ALIASES
+
+# Request bodies above this size are rejected
+MAX_REQUEST_BYTES = 256 * 1024 * 1024
+
+# Warm engines kept in memory, one per distinct candidates table
+MAX_WARM_ENGINES = 8
+
+
+class MatchRequestError(ValueError):
+    """Raised for match jobs that are malformed (reported to clients as HTTP 400)"""
+
+
+# Unsupported uploads are client errors too
+MATCH_REQUEST_ERRORS = (MatchRequestError, UnsupportedWorkbookError)
+
+
+class MatchingService:
+    """Runs match jobs against warm engines shared by all requests and threads
+
+    Jobs over the same candidates table share one engine, so its country index,
+    resume scans and last result are reused and an unchanged job is not scored again.
+    Jobs on one engine run one at a time; jobs on different candidate tables run in parallel.
+    Resume and workbook caches are shared by every engine.
+    """
+
+    def __init__(self, max_engines: int = MAX_WARM_ENGINES, **engine_options):
+        self.max_engines = max_engines
+        engine_options.setdefault("resume_cache", ResumeCache())
+        self.engine_options = engine_options
+        self._engines: "OrderedDict[str, Tuple[JobMatchingSystem, threading.Lock]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Uploads are parsed before the warm engine they belong to is known
+        self._reader = JobMatchingSystem(resume_cache=engine_options["resume_cache"],
+                                         workbook_cache=engine_options.get("workbook_cache"))
+
+    def _engine(self, key: str) -> Tuple[JobMatchingSystem, threading.Lock]:
+        """Return the warm engine for a candidates table, creating it (and evicting the oldest) if needed"""
+        with self._lock:
+            if key in self._engines:
+                self._engines.move_to_end(key)
+                return self._engines[key]
+            self._engines[key] = (JobMatchingSystem(**self.engine_options), threading.Lock())
+            while len(self._engines) > self.max_engines:
+                self._engines.popitem(last=False)
+            return self._engines[key]
+
+    def _read_table(self, table, columns: List[str],
+                    dtypes: Dict[str, str]) -> Tuple[pd.DataFrame, str]:
+        """Turn a job's table (a base64 workbook or a list of row objects) into a frame and its content digest"""
+        if isinstance(table, dict):
+            try:
+                data = base64.b64decode(table["data"], validate=True)
+            except (KeyError, TypeError, ValueError) as e:
+                raise MatchRequestError(f"Workbooks are sent as {{\"name\", \"data\": base64}}: {e}")
+            try:
+                df = self._reader.read_workbook(table.get("name", "upload.xlsx"), data, columns, dtypes)
+            except UnsupportedWorkbookError:
+                raise
+            except Exception as e:
+                raise MatchRequestError(f"Error loading file: {e}")
+            return df, hashlib.sha256(data).hexdigest()
+
+        if isinstance(table, list) and all(isinstance(row, dict) for row in table):
+            digest = hashlib.sha256(json.dumps(table, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+            # Blank cells arrive as "" from the web front-end, read_excel gives NaN
+            df = pd.DataFrame.from_records(table).replace('', np.nan)
+            df = df[[column for column in columns if column in df.columns]]
+            return df.astype({column: dtype for column, dtype in dtypes.items() if column in df.columns}), digest
+        raise MatchRequestError("Tables are sent as a base64 workbook or a list of row objects")
+
+    def run(self, job: Dict) -> Dict:
+        """Match one job and return a JSON-ready dict with the per-company results"""
+        if not isinstance(job, dict) or "companies" not in job or "candidates" not in job:
+            raise MatchRequestError("A job needs both \"companies\" and \"candidates\"")
+        start = time.perf_counter()
+
+        candidates, candidates_digest = self._read_table(job["candidates"], CANDIDATE_COLUMNS, CANDIDATE_DTYPES)
+        companies, _ = self._read_table(job["companies"], COMPANY_COLUMNS, COMPANY_DTYPES)
+
+        engine, lock = self._engine(candidates_digest)
+        with lock:
+            if engine.candidates_data is None or not engine.candidates_data.equals(candidates):
+                engine.candidates_data = candidates
+            engine.companies_data = companies
+            engine.selection = job.get("selection", "greedy")
+            engine.max_interviews_per_candidate = int(job.get("max_interviews_per_candidate", 3))
+            engine.skill_word_boundary = bool(job.get("skill_word_boundary", False))
+            engine.eligibility_threshold = float(job.get("eligibility_threshold", ELIGIBILITY_THRESHOLD))
+            engine.skill_pruning = job.get("skill_pruning", "none")
+            if bool(job.get("resolve_aliases", False)) != bool(engine.skill_vocabulary.aliases):
+                if job.get("resolve_aliases"):
+                    engine.set_aliases(DEFAULT_SKILL_ALIASES, DEFAULT_DEGREE_ALIASES)
+                else:
+                    engine.set_aliases()
+            engine.profile.reset()
+            try:
+                results = engine.match_candidates_to_jobs(engine="vectorized")
+            except ValueError as e:
+                raise MatchRequestError(str(e))
+            response = {
+                "results": json.loads(results.to_json(orient="records")),
+                "rematched_roles": engine.rematched_roles,
+                "resume_errors": len(engine.resume_errors)
+            }
+            if job.get("include_pairs"):
+                pairs = pd.concat(list(engine.iter_pair_scores()), ignore_index=True)
+                response["pairs"] = json.loads(pairs.to_json(orient="records"))
+            if job.get("profile"):
+                # Uploads are parsed before the engine is known, so only matching stages are included
+                response["profile"] = engine.profile.to_dict()
+        response["seconds"] = round(time.perf_counter() - start, 4)
+        return response
+
+    def run_batch(self, jobs: List[Dict], max_workers: int = 4) -> List[Dict]:
+        """Match several jobs concurrently; a failed job returns {"error": ...} instead of results"""
+        def run_one(job):
+            try:
+                return self.run(job)
+            except Exception as e:
+                return {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(run_one, jobs))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"warm_engines": len(self._engines)}
+
+
+class MatchRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints: GET /health, POST /match (one job) and POST /batch ({"jobs": [...]})"""
+
+    service: MatchingService = None
+    batch_workers = 4
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        # The static front-end is served from another origin
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.rstrip('/') == "/health":
+            self._send_json(200, {"status": "ok", **self.service.stats()})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_BYTES:
+            self._send_json(413, {"error": f"Request larger than {MAX_REQUEST_BYTES} bytes"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        path = self.path.rstrip('/')
+        try:
+            if path == "/match":
+                self._send_json(200, self.service.run(payload))
+            elif path == "/batch":
+                if not isinstance(payload, dict) or not isinstance(payload.get("jobs"), list):
+                    raise MatchRequestError("A batch is sent as {\"jobs\": [...]}")
+                self._send_json(200, {"results": self.service.run_batch(payload["jobs"], self.batch_workers)})
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+        except MATCH_REQUEST_ERRORS as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+
+def create_server(service: MatchingService, host: str = "127.0.0.1", port: int = 8765,
+                  batch_workers: int = 4) -> ThreadingHTTPServer:
+    """Build a threaded HTTP server (one thread per request) around a matching service"""
+    handler = type("BoundMatchRequestHandler", (MatchRequestHandler,),
+                   {"service": service, "batch_workers": batch_workers})
+    return ThreadingHTTPServer((host, port), handler)
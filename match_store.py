@@ -0,0 +1,255 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Bump when the schema changes; stores written with another version are rebuilt
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS companies (
+    role_id INTEGER PRIMARY KEY,
+    row_hash INTEGER NOT NULL,
+    company_name TEXT COLLATE NOCASE,
+    role TEXT COLLATE NOCASE,
+    required_skills TEXT,
+    eligible_degrees TEXT,
+    country TEXT,
+    country_key TEXT,
+    requirement_count
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    candidate_id INTEGER PRIMARY KEY,
+    row_hash INTEGER NOT NULL,
+    name TEXT COLLATE NOCASE,
+    country TEXT,
+    country_key TEXT,
+    degree TEXT,
+    skills TEXT,
+    resume_link TEXT
+);
+CREATE TABLE IF NOT EXISTS pair_scores (
+    role_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    match_pct REAL NOT NULL,
+    PRIMARY KEY (role_id, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS companies_name ON companies (company_name, role);
+CREATE INDEX IF NOT EXISTS companies_country ON companies (country_key);
+CREATE INDEX IF NOT EXISTS candidates_name ON candidates (name);
+CREATE INDEX IF NOT EXISTS candidates_country ON candidates (country_key);
+CREATE INDEX IF NOT EXISTS pair_scores_candidate ON pair_scores (candidate_id, match_pct);
+CREATE INDEX IF NOT EXISTS pair_scores_score ON pair_scores (match_pct);
+"""
+
+TABLES = ("meta", "companies", "candidates", "pair_scores", "results")
+
+# Columns of the pair lookups, matching JobMatchingSystem's pair-level score table
+PAIR_SELECT = """
+    SELECT co.company_name AS "Company Name", co.role AS "Role", co.country AS "Country",
+           ca.name AS "Candidate Name", p.match_pct AS "Match %", p.rank AS "Rank"
+    FROM pair_scores p
+    JOIN companies co ON co.role_id = p.role_id
+    JOIN candidates ca ON ca.candidate_id = p.candidate_id
+"""
+
+
+def _sql_value(value):
+    """Convert a frame value to a type sqlite3 can bind (missing values become NULL)"""
+    if value is None or (np.ndim(value) == 0 and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bytes)):
+        return value
+    return str(value)
+
+
+class MatchStore:
+    """Companies, candidates and per-pair scores persisted in SQLite, indexed for per-company and per-candidate lookups
+
+    Row ids are sheet row positions. Writes are meant to run inside transaction(),
+    which commits them in bulk (or not at all).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        # Streamlit reruns scripts on different threads, so the connection is shared under a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction():
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            if self._meta("schema_version") not in (None, str(SCHEMA_VERSION)):
+                for table in TABLES:
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self._conn.execute(statement)
+            self._set_meta("schema_version", str(SCHEMA_VERSION))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed writes as one transaction (nested calls join the outer one)"""
+        with self._lock:
+            if self._conn.in_transaction:
+                yield self._conn
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def load_state(self) -> Optional[Dict]:
+        """Return the match state of the last save (see JobMatchingSystem._snapshot), or None"""
+        with self._lock:
+            settings = self._meta("settings")
+            if settings is None:
+                return None
+            company_hashes = [h for h, in self._conn.execute("SELECT row_hash FROM companies ORDER BY role_id")]
+            candidates = self._conn.execute(
+                "SELECT row_hash, country_key FROM candidates ORDER BY candidate_id"
+            ).fetchall()
+            return {
+                "settings": settings,
+                # Hashes are unsigned 64-bit but stored as SQLite's signed integers
+                "company_hashes": np.array(company_hashes, dtype=np.int64).view(np.uint64),
+                "candidate_hashes": np.array([h for h, _ in candidates], dtype=np.int64).view(np.uint64),
+                "candidate_countries": [country for _, country in candidates],
+                "resume_errors": set(json.loads(self._meta("resume_errors") or "[]"))
+            }
+
+    def save_state(self, state: Dict):
+        """Record the settings and resume errors a save was made with (the hashes live in the tables)"""
+        with self.transaction():
+            self._set_meta("settings", state["settings"])
+            self._set_meta("resume_errors", json.dumps(sorted(state["resume_errors"])))
+            self._set_meta("generation", str(self.generation() + 1))
+
+    def generation(self) -> int:
+        """Number of saves so far; a save that read the state at another generation raced another writer"""
+        with self._lock:
+            return int(self._meta("generation") or 0)
+
+    def _write_rows(self, table: str, key: str, columns: Dict[str, Sequence], hashes: np.ndarray):
+        """Upsert the rows whose hash changed and drop rows past the end of the sheet"""
+        signed = hashes.astype(np.uint64).view(np.int64).tolist()
+        with self.transaction():
+            stored = dict(self._conn.execute(f"SELECT {key}, row_hash FROM {table}"))
+            changed = [row for row, h in enumerate(signed) if stored.get(row) != h]
+            names = list(columns)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({key}, row_hash, {', '.join(names)}) "
+                f"VALUES ({', '.join('?' * (len(names) + 2))})",
+                ([row, signed[row]] + [_sql_value(columns[name][row]) for name in names] for row in changed)
+            )
+            self._conn.execute(f"DELETE FROM {table} WHERE {key} >= ?", (len(signed),))
+
+    def write_companies(self, columns: Dict[str, Sequence], hashes: np.ndarray):
+        """Store the companies table (column name -> values by row position)"""
+        self._write_rows("companies", "role_id", columns, hashes)
+
+    def write_candidates(self, columns: Dict[str, Sequence], hashes: np.ndarray):
+        """Store the candidates table (column name -> values by row position)"""
+        self._write_rows("candidates", "candidate_id", columns, hashes)
+
+    def clear_pairs(self, roles: Optional[Sequence[int]], role_count: int):
+        """Delete the pairs of the given role rows (all if None) and of roles no longer in the sheet"""
+        with self.transaction():
+            if roles is None:
+                self._conn.execute("DELETE FROM pair_scores")
+                return
+            self._conn.executemany("DELETE FROM pair_scores WHERE role_id = ?", ((int(row),) for row in roles))
+            self._conn.execute("DELETE FROM pair_scores WHERE role_id >= ?", (role_count,))
+
+    def write_pairs(self, role_rows: np.ndarray, candidate_rows: np.ndarray, scores: np.ndarray,
+                    ranks: np.ndarray) -> int:
+        """Insert pair scores from parallel arrays, returning the number of pairs written"""
+        with self.transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pair_scores (role_id, rank, candidate_id, match_pct) VALUES (?, ?, ?, ?)",
+                zip(role_rows.tolist(), ranks.tolist(), candidate_rows.tolist(), scores.tolist())
+            )
+        return len(role_rows)
+
+    def write_results(self, results: pd.DataFrame):
+        """Replace the stored per-company results table"""
+        columns = ", ".join('"' + str(column).replace('"', '""') + '"' for column in results.columns)
+        with self.transaction():
+            self._conn.execute("DROP TABLE IF EXISTS results")
+            if results.columns.empty:
+                return
+            self._conn.execute(f"CREATE TABLE results ({columns})")
+            self._conn.executemany(
+                f"INSERT INTO results VALUES ({', '.join('?' * len(results.columns))})",
+                ([_sql_value(value) for value in row] for row in results.itertuples(index=False, name=None))
+            )
+
+    def _query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            return pd.DataFrame(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+
+    def load_results(self) -> pd.DataFrame:
+        """Return the stored per-company results table (empty if none was saved)"""
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'results'"
+            ).fetchone()
+        return self._query("SELECT * FROM results") if exists else pd.DataFrame()
+
+    def candidate_matches(self, name: str) -> pd.DataFrame:
+        """Roles a candidate (by name, case-insensitive) is eligible for, best match first"""
+        return self._query(
+            PAIR_SELECT + " WHERE ca.name = ? ORDER BY p.match_pct DESC, p.role_id", (name,)
+        )
+
+    def company_matches(self, company_name: str, role: str = None) -> pd.DataFrame:
+        """Eligible candidates of a company's roles (or one role), in rank order"""
+        if role is None:
+            return self._query(PAIR_SELECT + " WHERE co.company_name = ? ORDER BY p.role_id, p.rank",
+                               (company_name,))
+        return self._query(PAIR_SELECT + " WHERE co.company_name = ? AND co.role = ? ORDER BY p.role_id, p.rank",
+                           (company_name, role))
+
+    def top_pairs(self, country: str = None, min_score: float = 0, limit: int = 100) -> pd.DataFrame:
+        """Best scoring pairs overall or in one country (case-insensitive), at least min_score"""
+        if country is None:
+            return self._query(PAIR_SELECT + " WHERE p.match_pct >= ? ORDER BY p.match_pct DESC LIMIT ?",
+                               (min_score, limit))
+        return self._query(
+            PAIR_SELECT + " WHERE co.country_key = ? AND p.match_pct >= ? ORDER BY p.match_pct DESC LIMIT ?",
+            (country.strip().lower(), min_score, limit)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of stored companies, candidates and pairs"""
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("companies", "candidates", "pair_scores")
+            }
@@ -0,0 +1,1511 @@
+import argparse
+import hashlib
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import heapq
+from io import BytesIO
+from typing import TYPE_CHECKING, List, Dict, Iterator, Optional, Sequence, Tuple
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from resume_cache import ResumeCache, ResumeEntry, ResumeScans
+from resume_extractor import ResumeExtractionError, ResumeTextExtractor
+from resume_fetcher import GoogleDriveBackend, LocalDirectoryBackend, ResumeFetcher, ResumeFetchError
+from skill_scanner import SkillScanner
+from degree_index import DegreeIndex
+from shared_index import SharedIndex
+from excel_ingest import read_excel_columns
+from profiling import PipelineProfile
+from vocabulary import Vocabulary
+from workbook_cache import WorkbookCache
+
+if TYPE_CHECKING:
+    from match_store import MatchStore
+
+# The engine never imports streamlit or plotly; assignment (scipy.optimize), the results
+# writers (pyarrow) and the match store are imported when first used, to keep startup fast
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the number of company/candidate pairs scored in one block
+PAIR_BLOCK_SIZE = 2_000_000
+
+# Scoring is sharded across processes (when score_workers > 1) only above this many same-country pairs
+PARALLEL_MIN_PAIRS = 20_000_000
+
+# Approximate number of rows per frame when exporting the pair-level score table
+PAIR_EXPORT_BATCH_SIZE = 100_000
+
+# Columns of the pair-level score table: one row per eligible (role, candidate) pair
+PAIR_COLUMNS = ['Company Name', 'Role', 'Country', 'Candidate Name', 'Match %', 'Rank']
+
+# Marks the end of a generator stepped by JobMatchingSystem._in_stage
+_DONE = object()
+
+# Default minimum skill match percentage for a candidate to be eligible
+ELIGIBILITY_THRESHOLD = 60
+
+# Columns the matcher reads; uploads are projected to these and the
+# low-cardinality ones are stored as categoricals
+COMPANY_COLUMNS = ['Company Name', 'Role', 'Required Skills', 'Eligible Degrees', 'Country', 'Requirement Count']
+COMPANY_DTYPES = {'Country': 'category'}
+CANDIDATE_COLUMNS = ['Name', 'Country', 'Degree', 'Skills', 'Resume Link']
+CANDIDATE_DTYPES = {'Country': 'category', 'Degree': 'category'}
+
+# Drive file IDs appear as ".../file/d/<id>/view" or ".../open?id=<id>"
+DRIVE_FILE_ID_PATTERN = re.compile(r'(?:/d/|[?&]id=)([a-zA-Z0-9-_]+)')
+
+class UnsupportedWorkbookError(ValueError):
+    """Raised for uploads that are not .xlsx or .xls workbooks"""
+
+def selection_limit(requirement_count) -> int:
+    """Number of candidates a role keeps (never negative)"""
+    return max(int(requirement_count), 0)
+
+class TopKCandidates:
+    """Bounded buffer keeping the k best candidates of a role plus a running eligible count"""
+    
+    def __init__(self, k: int):
+        self.k = k
+        self.count = 0
+        # Min-heap of (percentage, -order, item): the root is the current worst candidate
+        self._heap = []
+    
+    def add(self, percentage: float, order: int, item):
+        """Offer a candidate; ties on percentage prefer the lower order (earlier sheet row)"""
+        self.count += 1
+        entry = (percentage, -order, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def best(self) -> List[Tuple[float, int, object]]:
+        """Return (percentage, order, item) tuples, best first"""
+        ranked = sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))
+        return [(percentage, -neg_order, item) for percentage, neg_order, item in ranked]
+
+class JobMatchingSystem:
+    ENGINES = ("vectorized", "legacy")
+    SELECTIONS = ("greedy", "assignment")
+    SKILL_PRUNING = ("none", "declared")
+
+    def __init__(self, engine: str = "vectorized", skill_word_boundary: bool = False,
+                 resume_cache: ResumeCache = None, resume_fetcher: ResumeFetcher = None,
+                 resume_extractor: ResumeTextExtractor = None, selection: str = "greedy",
+                 max_interviews_per_candidate: int = 3, skill_aliases: Dict[str, str] = None,
+                 degree_aliases: Dict[str, str] = None, workbook_cache: WorkbookCache = None,
+                 profile: PipelineProfile = None, score_workers: int = 1,
+                 eligibility_threshold: float = ELIGIBILITY_THRESHOLD, skill_pruning: str = "none"):
+        self.companies_data = None
+        self.candidates_data = None
+        self.resume_cache = resume_cache if resume_cache is not None else ResumeCache()
+        # Without a fetcher, resumes resolve to placeholder text
+        self.resume_fetcher = resume_fetcher
+        self.resume_extractor = resume_extractor if resume_extractor is not None else ResumeTextExtractor()
+        self.resume_errors = {}
+        # Without a workbook cache, every upload is parsed again
+        self.workbook_cache = workbook_cache
+        # Per-link skill scan results, reused across re-matches (at most as many as the resume cache holds)
+        self._resume_scans = ResumeScans(self.resume_cache.max_entries)
+        # Row hashes and results of the last greedy match, used to re-match only what changed
+        self._match_state = None
+        self.rematched_roles = 0
+        # Full results table of the last match
+        self.last_results = None
+        # "greedy" lets every role take its top candidates independently,
+        # "assignment" shares candidates across roles (at most max_interviews_per_candidate each)
+        self.selection = selection
+        self.max_interviews_per_candidate = max_interviews_per_candidate
+        # Skills and degrees are interned once into integer IDs; aliases (e.g. DEFAULT_SKILL_ALIASES)
+        # map alternative spellings such as "ML" onto one ID
+        self.set_aliases(skill_aliases, degree_aliases)
+        self.engine = engine
+        # When set, skills only match whole words ("R" no longer matches inside "framework")
+        self.skill_word_boundary = skill_word_boundary
+        # Processes that large scoring runs are sharded across (1 scores in this process)
+        self.score_workers = score_workers
+        # Minimum percentage of a role's required skills found in a resume
+        self.eligibility_threshold = eligibility_threshold
+        # "declared" skips the resume of any pair whose declared Skills already fall short of the
+        # threshold; resumes can list skills a candidate did not declare, so this can drop matches
+        self.skill_pruning = skill_pruning
+        # Stage timings and counters accumulate here until the caller resets or replaces it
+        self.profile = profile if profile is not None else PipelineProfile()
+    
+    @property
+    def candidates_data(self) -> pd.DataFrame:
+        return self._candidates_data
+    
+    @candidates_data.setter
+    def candidates_data(self, value: pd.DataFrame):
+        # Indexes are derived from the candidates table, so a new upload invalidates them
+        self._candidates_data = value
+        self._country_index = None
+    
+    def set_aliases(self, skill_aliases: Dict[str, str] = None, degree_aliases: Dict[str, str] = None):
+        """Replace the skill and degree alias tables, starting fresh vocabularies"""
+        self.skill_vocabulary = Vocabulary(skill_aliases)
+        self.degree_vocabulary = Vocabulary(degree_aliases)
+        # Grows with the degree vocabulary, so each spelling is tokenized once across matches
+        self._degree_index = DegreeIndex(self.degree_vocabulary)
+    
+    def build_shared_index(self, skill_aliases: Dict[str, str] = None,
+                           degree_aliases: Dict[str, str] = None) -> SharedIndex:
+        """Encode the loaded tables into new vocabularies and indexes that other engines can match against
+    
+        Every term of both tables is interned here, so the index is complete before it is shared.
+        """
+        builder = JobMatchingSystem(skill_aliases=skill_aliases, degree_aliases=degree_aliases, profile=self.profile)
+        builder.companies_data = self.companies_data
+        builder.candidates_data = self.candidates_data
+        with self.profile.stage("shared_index"):
+            builder._encode_companies(self.companies_data)
+            builder._encode_candidates(self.candidates_data)
+            builder._degree_index.update()
+            return SharedIndex(self.companies_data, self.candidates_data, builder.skill_vocabulary,
+                               builder.degree_vocabulary, builder._degree_index, builder.get_country_index())
+    
+    def use_shared_index(self, index: SharedIndex):
+        """Match against a shared index's tables, vocabularies and indexes instead of this engine's own
+    
+        The index is only read (other engines may be matching against it); set_aliases or loading
+        another table detaches the engine from it again.
+        """
+        self.companies_data = index.companies
+        self.candidates_data = index.candidates
+        self.skill_vocabulary = index.skill_vocabulary
+        self.degree_vocabulary = index.degree_vocabulary
+        self._degree_index = index.degree_index
+        self._country_index = index.country_index
+        self._resume_scans = index.resume_scans
+    
+    def get_country_index(self) -> Dict[str, np.ndarray]:
+        """Return the canonical country -> candidate row positions index, building it if needed"""
+        if self._country_index is None:
+            self._country_index = self.build_country_index(self.candidates_data)
+        return self._country_index
+    
+    def build_country_index(self, candidates: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Partition candidate row positions by canonical country"""
+        if candidates is None:
+            return {}
+        
+        partitions = {}
+        for row, country in enumerate(self._column_values(candidates, 'Country', '')):
+            country_key = self._country_key(country)
+            if country_key is not None:
+                partitions.setdefault(country_key, []).append(row)
+        return {key: np.array(rows, dtype=np.int64) for key, rows in partitions.items()}
+        
+    def report_error(self, message: str):
+        """Surface a recoverable error (the Streamlit app shows it in the page)"""
+        logger.error(message)
+    
+    def load_excel_file(self, uploaded_file, columns: List[str] = None,
+                        dtypes: Dict[str, str] = None) -> pd.DataFrame:
+        """Load Excel file and return DataFrame (only `columns` if given, with `dtypes` pinned)"""
+        try:
+            return self.read_workbook(uploaded_file.name, uploaded_file.getvalue(), columns, dtypes)
+        except UnsupportedWorkbookError as e:
+            self.report_error(str(e))
+            return None
+        except Exception as e:
+            self.report_error(f"Error loading file: {str(e)}")
+            return None
+    
+    def read_workbook(self, name: str, data: bytes, columns: List[str] = None,
+                      dtypes: Dict[str, str] = None) -> pd.DataFrame:
+        """Parse workbook bytes (.xlsx or .xls, told apart by file name), raising on errors"""
+        if name.endswith('.xlsx'):
+            engine = 'openpyxl'
+        elif name.endswith('.xls'):
+            engine = 'xlrd'
+        else:
+            raise UnsupportedWorkbookError("Please upload an Excel file (.xlsx or .xls)")
+        
+        def parse():
+            if engine == 'openpyxl':
+                # Stream rows in read-only mode, keeping only the projected cells
+                return read_excel_columns(BytesIO(data), columns, dtypes)
+            df = pd.read_excel(BytesIO(data), engine=engine,
+                               usecols=None if columns is None else lambda column: column in columns)
+            return df.astype({column: dtype for column, dtype in (dtypes or {}).items() if column in df.columns})
+        
+        with self.profile.stage("load"):
+            self.profile.count("bytes_loaded", len(data))
+            if self.workbook_cache is None:
+                df = parse()
+            else:
+                # Identical uploads (reruns, other sessions) reuse the parsed frame
+                hits = self.workbook_cache.hits
+                df = self.workbook_cache.get_or_load(data, parse, variant=repr((engine, columns, dtypes)))
+                self.profile.count("workbook_cache_hits" if self.workbook_cache.hits > hits
+                                   else "workbook_cache_misses")
+            self.profile.count("rows_loaded", len(df))
+            return df
+    
+    def get_drive_file_id(self, drive_link: str) -> str:
+        """Return the file ID of a Google Drive link, or None"""
+        if not isinstance(drive_link, str):
+            return None
+        file_id_match = DRIVE_FILE_ID_PATTERN.search(drive_link)
+        return file_id_match.group(1) if file_id_match else None
+    
+    def get_resume(self, drive_link: str) -> ResumeEntry:
+        """Resolve a resume link through the resume cache, extracting it at most once"""
+        file_id = self.get_drive_file_id(drive_link)
+        if file_id is None:
+            # Links without a file ID have nothing to fetch or cache
+            return ResumeEntry(None, self.extract_resume_from_drive(drive_link))
+        if file_id in self.resume_errors and file_id not in self.resume_cache:
+            # Already failed in this run's prefetch, don't download it again
+            return ResumeEntry(file_id, "")
+        try:
+            resume = self.resume_cache.get_or_load(file_id, lambda: self.fetch_resume_text(file_id))
+        except (ResumeFetchError, ResumeExtractionError) as e:
+            # Failed downloads are not cached, so the next run retries them
+            self.resume_errors[file_id] = str(e)
+            return ResumeEntry(file_id, "")
+        self.resume_errors.pop(file_id, None)
+        return resume
+    
+    def prefetch_resumes(self, resume_links) -> Dict[str, str]:
+        """Download all uncached resumes concurrently and return {file_id: error} for failures"""
+        if self.resume_fetcher is None:
+            return {}
+        
+        file_ids = set()
+        for resume_link in resume_links:
+            file_id = self.get_drive_file_id(resume_link)
+            if file_id and file_id not in self.resume_cache:
+                file_ids.add(file_id)
+        
+        errors = {}
+        self.profile.count("resumes_fetched", len(file_ids))
+        
+        def downloaded_files():
+            for result in self.resume_fetcher.iter_fetch(sorted(file_ids)):
+                if result.ok:
+                    yield result.file_id, result.data
+                else:
+                    errors[result.file_id] = result.error
+        
+        # Downloads feed the extraction pool as they complete
+        for file_id, text, error in self.resume_extractor.iter_extract(downloaded_files()):
+            if error is None:
+                self.resume_cache.put(file_id, text)
+                self.resume_errors.pop(file_id, None)
+            else:
+                errors[file_id] = error
+        self.resume_errors.update(errors)
+        self.profile.count("resume_errors", len(errors))
+        return errors
+    
+    def decode_resume(self, data: bytes) -> str:
+        """Turn downloaded resume bytes (PDF, DOCX or text) into text"""
+        return self.resume_extractor.extract(data)
+    
+    def fetch_resume_text(self, file_id: str) -> str:
+        """Fetch a resume by Drive file ID, raising ResumeFetchError or ResumeExtractionError on failure"""
+        if self.resume_fetcher is None:
+            # For now, return placeholder content
+            # In production, configure a resume_fetcher with a GoogleDriveBackend
+            return f"Resume content from Drive ID: {file_id}"
+        result = self.resume_fetcher.fetch(file_id)
+        if not result.ok:
+            raise ResumeFetchError(result.error)
+        return self.decode_resume(result.data)
+    
+    def extract_resume_from_drive(self, drive_link: str) -> str:
+        """Extract resume content from Google Drive link"""
+        try:
+            # Extract file ID from Google Drive link
+            file_id_match = DRIVE_FILE_ID_PATTERN.search(drive_link)
+            if file_id_match:
+                return self.fetch_resume_text(file_id_match.group(1))
+            else:
+                return "Invalid Drive link format"
+        except Exception as e:
+            return f"Error extracting resume: {str(e)}"
+    
+    def build_skill_scanner(self, skills: List[str]) -> SkillScanner:
+        """Compile a single-pass scanner for a list of skills"""
+        return SkillScanner(skills, word_boundary=self.skill_word_boundary)
+    
+    def analyze_resume_eligibility(self, resume_content: str, required_skills: List[str],
+                                   scanner: SkillScanner = None) -> Dict:
+        """Analyze resume for skill matches and eligibility
+        
+        scanner may be shared across calls; it must cover every required skill.
+        """
+        if not resume_content or resume_content == "Invalid Drive link format":
+            return {"eligible": False, "skill_matches": [], "match_percentage": 0}
+        
+        # Convert skills to lowercase for comparison
+        required_skills_lower = [skill.lower().strip() for skill in required_skills]
+        
+        # Scan the resume once for all skills
+        if scanner is None:
+            scanner = self.build_skill_scanner(required_skills_lower)
+        found_skills = scanner.find(resume_content)
+        skill_matches = [skill for skill in required_skills_lower if skill in found_skills]
+        
+        # Calculate match percentage
+        match_percentage = (len(skill_matches) / len(required_skills_lower)) * 100 if required_skills_lower else 0
+        
+        # Consider eligible if at least eligibility_threshold % of the skills match
+        eligible = match_percentage >= self.eligibility_threshold
+        
+        return {
+            "eligible": eligible,
+            "skill_matches": skill_matches,
+            "match_percentage": round(match_percentage, 2)
+        }
+    
+    def declared_skill_percentage(self, required_skills: List[str], declared_skills: List[str]) -> float:
+        """Percentage of the required skills found among a candidate's declared skills (vocabulary-normalized)"""
+        if not required_skills:
+            return 0
+        declared = {self.skill_vocabulary.normalize(skill) for skill in declared_skills}
+        matches = sum(self.skill_vocabulary.normalize(skill) in declared for skill in required_skills)
+        return (matches / len(required_skills)) * 100
+    
+    def check_country_compatibility(self, company_country: str, candidate_country: str) -> bool:
+        """Check if company and candidate are from the same country"""
+        if pd.isna(company_country) or pd.isna(candidate_country):
+            return False
+        return company_country.strip().lower() == candidate_country.strip().lower()
+    
+    def process_skills(self, skills_str: str) -> List[str]:
+        """Process skills string into list of individual skills"""
+        if pd.isna(skills_str):
+            return []
+        
+        # Split by common delimiters
+        skills = re.split(r'[,;|]', str(skills_str))
+        # Clean up each skill
+        skills = [skill.strip() for skill in skills if skill.strip()]
+        return skills
+    
+    def process_degrees(self, degrees_str: str) -> List[str]:
+        """Process degrees string into list of individual degrees"""
+        if pd.isna(degrees_str):
+            return []
+        
+        # Split by common delimiters
+        degrees = re.split(r'[,;|]', str(degrees_str))
+        # Clean up each degree
+        degrees = [degree.strip() for degree in degrees if degree.strip()]
+        return degrees
+    
+    def match_candidates_to_jobs(self, engine: str = None, selection: str = None) -> pd.DataFrame:
+        """Match candidates to job requirements and return results"""
+        if self.companies_data is None or self.candidates_data is None:
+            return pd.DataFrame()
+        
+        for _ in self.iter_match_results(engine, selection):
+            pass
+        return self.last_results.copy()
+    
+    def iter_match_results(self, engine: str = None, selection: str = None) -> Iterator[pd.DataFrame]:
+        """Yield result rows as roles finish matching, as frames indexed by the roles' row positions
+        
+        Once exhausted, last_results holds the full table match_candidates_to_jobs returns. Roles
+        reused from the previous match come first; assignment selection needs every role's pairs,
+        so it yields all of its rows at once.
+        """
+        if self.companies_data is None or self.candidates_data is None:
+            return
+        
+        engine = engine or self.engine
+        selection = selection or self.selection
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown matching engine: {engine}")
+        if selection not in self.SELECTIONS:
+            raise ValueError(f"Unknown candidate selection: {selection}")
+        if engine == "legacy" and selection != "greedy":
+            raise ValueError("The legacy engine only supports greedy selection")
+        # Only without alias tables do vocabulary IDs separate exactly the spellings legacy compares
+        if engine == "legacy" and (self.skill_vocabulary.resolves_spellings or
+                                   self.degree_vocabulary.resolves_spellings):
+            raise ValueError("The legacy engine does not resolve skill or degree aliases or spelling variants")
+        if self.skill_pruning not in self.SKILL_PRUNING:
+            raise ValueError(f"Unknown skill pruning policy: {self.skill_pruning}")
+        
+        # Download every resume that can affect the result before matching starts
+        with self.profile.stage("match"):
+            cache_stats = self.resume_cache.stats()
+            prepared = self._prefetch_matchable_resumes()
+        
+        pieces = self._iter_match_legacy() if engine == "legacy" else self._iter_match_vectorized(selection, prepared)
+        yield from self._in_stage("match", pieces)
+        with self.profile.stage("match"):
+            self._count_resume_cache(cache_stats)
+    
+    def _in_stage(self, name: str, steps: Iterator) -> Iterator:
+        """Yield from a generator, timing each step as a stage but not the caller's work between steps"""
+        while True:
+            with self.profile.stage(name):
+                item = next(steps, _DONE)
+            if item is _DONE:
+                return
+            yield item
+    
+    def _count_resume_cache(self, before: Dict[str, int]):
+        """Count resume cache hits and misses since the before stats (approximate if the cache is shared)"""
+        after = self.resume_cache.stats()
+        self.profile.count("resume_cache_hits", after["hits"] + after["disk_hits"] - before["hits"] - before["disk_hits"])
+        self.profile.count("resume_cache_misses", after["misses"] - before["misses"])
+    
+    def iter_pair_scores(self, batch_size: int = PAIR_EXPORT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+        """Yield every eligible (role, candidate) pair with its match percentage, in frames of about batch_size rows
+        
+        Roles come in sheet order and each role's candidates best first, ranked as greedy selection
+        ranks them. Frames are built straight from the score arrays, never as per-pair dicts.
+        """
+        if self.companies_data is None or self.candidates_data is None:
+            return
+        
+        with self.profile.stage("pairs"):
+            prepared = self._prefetch_matchable_resumes()
+            companies, candidates, role_matches = self._score_pairs(keep_all=True, prepared=prepared)
+        role_columns = {
+            'Company Name': np.asarray(companies["company_name"], dtype=object),
+            'Role': np.asarray(companies["role"], dtype=object),
+            'Country': np.asarray(companies["country"], dtype=object)
+        }
+        names = np.asarray(candidates["name"], dtype=object)
+        
+        for role_rows, candidate_rows, scores, ranks in self._iter_pair_batches(role_matches, batch_size):
+            frame = {column: values[role_rows] for column, values in role_columns.items()}
+            frame['Candidate Name'] = names[candidate_rows]
+            frame['Match %'] = scores
+            frame['Rank'] = ranks
+            yield pd.DataFrame(frame, columns=PAIR_COLUMNS)
+    
+    def _iter_pair_batches(self, role_matches: List[Optional[Tuple[np.ndarray, np.ndarray, int]]],
+                           batch_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Yield (role rows, candidate rows, match percentages, ranks) arrays of about batch_size ranked pairs
+        
+        Roles without a match (None) are skipped; at least one, possibly empty, batch is yielded.
+        """
+        batch, batch_rows, yielded = [], 0, False
+        for row, match in enumerate(role_matches):
+            if match is None:
+                continue
+            rows, scores = self._rank_candidates(match[0], match[1], None)
+            batch.append((row, rows, scores))
+            batch_rows += len(rows)
+            if batch_rows >= batch_size:
+                yield self._concatenate_pairs(batch)
+                batch, batch_rows, yielded = [], 0, True
+        if batch or not yielded:
+            yield self._concatenate_pairs(batch)
+    
+    def _concatenate_pairs(self, batch: List[Tuple[int, np.ndarray, np.ndarray]]
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Flatten ranked (role row, candidate rows, scores) into pair arrays"""
+        empty = np.empty(0, dtype=np.int64)
+        return (
+            np.concatenate([np.full(len(rows), row, dtype=np.int64) for row, rows, _ in batch] + [empty]),
+            np.concatenate([rows for _, rows, _ in batch] + [empty]),
+            np.concatenate([scores for _, _, scores in batch] + [np.empty(0)]),
+            np.concatenate([np.arange(1, len(rows) + 1, dtype=np.int64) for _, rows, _ in batch] + [empty])
+        )
+    
+    def save_matches(self, store: "MatchStore", results: pd.DataFrame = None,
+                     batch_size: int = PAIR_EXPORT_BATCH_SIZE) -> int:
+        """Persist both tables and every eligible pair's score to a MatchStore, returning the pairs written
+        
+        Only roles affected by changes since the store was last saved are scored and
+        rewritten. results (e.g. from match_candidates_to_jobs) is stored alongside when given.
+        """
+        if self.companies_data is None or self.candidates_data is None:
+            return 0
+        
+        with self.profile.stage("save"):
+            prepared = self._prefetch_matchable_resumes()
+            company_hashes = self.row_hashes(self.companies_data)
+            candidate_hashes = self.row_hashes(self.candidates_data)
+            generation = store.generation()
+            roles = self._roles_to_rematch(store.load_state(), company_hashes, candidate_hashes,
+                                           stable_positions=True)
+            companies, candidates, role_matches = self._score_pairs(keep_all=True, roles=roles, prepared=prepared)
+            # Taken after scoring, so resumes that failed just now are retried by the next save
+            state = self._snapshot(company_hashes, candidate_hashes)
+        
+            written = 0
+            with store.transaction():
+                if roles is not None and store.generation() != generation:
+                    # Another writer (e.g. a session with other settings) saved since the state was
+                    # read, so only a full rewrite is correct
+                    roles = None
+                    companies, candidates, role_matches = self._score_pairs(keep_all=True, prepared=prepared)
+                store.write_companies({
+                    "company_name": companies["company_name"],
+                    "role": companies["role"],
+                    "required_skills": [", ".join(skills) for skills in companies["required_skills"]],
+                    "eligible_degrees": [", ".join(degrees) for degrees in companies["eligible_degrees"]],
+                    "country": companies["country"],
+                    "country_key": companies["country_key"],
+                    "requirement_count": companies["requirement_count"]
+                }, company_hashes)
+                store.write_candidates({
+                    "name": candidates["name"],
+                    "country": self._column_values(self.candidates_data, 'Country', ''),
+                    "country_key": state["candidate_countries"],
+                    "degree": self._column_values(self.candidates_data, 'Degree', ''),
+                    "skills": self._column_values(self.candidates_data, 'Skills', ''),
+                    "resume_link": self._column_values(self.candidates_data, 'Resume Link', '')
+                }, candidate_hashes)
+                store.clear_pairs(roles, len(company_hashes))
+                for role_rows, candidate_rows, scores, ranks in self._iter_pair_batches(role_matches, batch_size):
+                    written += store.write_pairs(role_rows, candidate_rows, scores, ranks)
+                if results is not None:
+                    store.write_results(results)
+                store.save_state(state)
+            self.rematched_roles = sum(match is not None for match in role_matches)
+        return written
+    
+    def _prefetch_matchable_resumes(self) -> Optional[Tuple[Dict, Dict, Dict, List[Tuple[np.ndarray, List[int]]]]]:
+        """Download the resumes of every candidate in a country with at least one role
+        
+        With declared pruning, returns the scoring preparation (see _prepare_scoring) that
+        picked the resumes, for the scoring step to reuse; otherwise None.
+        """
+        if self.resume_fetcher is None:
+            return None
+        with self.profile.stage("resumes"):
+            resume_links = self._column_values(self.candidates_data, 'Resume Link', '')
+            prepared = None
+            if self.skill_pruning == "declared":
+                # Resumes of candidates pruned on their declared skills are never needed
+                prepared = self._prepare_scoring(scan_resumes=False)
+                rows = prepared[1]["resume_rows"]
+            else:
+                rows = self.candidate_rows_in_company_countries()
+            self.prefetch_resumes(resume_links[row] for row in rows)
+        return prepared
+    
+    def candidate_rows_in_company_countries(self) -> np.ndarray:
+        """Return the sorted row positions of candidates whose country has at least one role"""
+        country_index = self.get_country_index()
+        company_countries = {self._country_key(c) for c in self._column_values(self.companies_data, 'Country', '')}
+        partitions = [country_index[key] for key in company_countries if key in country_index]
+        return np.unique(np.concatenate([np.empty(0, dtype=np.int64)] + partitions))
+    
+    def _build_result_row(self, company_name, role, required_skills: List[str],
+                          eligible_degrees: List[str], top_names: List[str],
+                          requirement_count, candidates_count: int,
+                          company_country, top_match_percentage) -> Dict:
+        """Build one per-company row of the results table"""
+        return {
+            "Company Name": company_name,
+            "Role": role,
+            "Required Skills": ", ".join(required_skills),
+            "Eligible Degrees": ", ".join(eligible_degrees),
+            "Eligible Students (Partial List)": ", ".join(top_names),
+            "Requirement Count": requirement_count,
+            "Candidates Count": candidates_count,
+            "Country": company_country,
+            "Top Candidate Match %": top_match_percentage
+        }
+    
+    def _iter_match_legacy(self) -> Iterator[pd.DataFrame]:
+        """Match candidates pair by pair (reference implementation), yielding each role's row when done"""
+        country_index = self.get_country_index()
+        results = []
+        evaluated = pruned_degree = pruned_declared = pruned_resume = eligible_pairs = 0
+        
+        for position, (_, company_row) in enumerate(self.companies_data.iterrows()):
+            company_name = company_row.get('Company Name', 'Unknown')
+            role = company_row.get('Role', 'Unknown')
+            required_skills = self.process_skills(company_row.get('Required Skills', ''))
+            eligible_degrees = self.process_degrees(company_row.get('Eligible Degrees', ''))
+            company_country = company_row.get('Country', '')
+            requirement_count = company_row.get('Requirement Count', 1)
+            scanner = self.build_skill_scanner(required_skills)
+            
+            eligible_candidates = TopKCandidates(selection_limit(requirement_count))
+            
+            # Only candidates from the company's country can pass the country check
+            partition = country_index.get(self._country_key(company_country), np.empty(0, dtype=np.int64))
+            
+            for order, (_, candidate_row) in enumerate(self.candidates_data.iloc[partition].iterrows()):
+                candidate_name = candidate_row.get('Name', 'Unknown')
+                candidate_country = candidate_row.get('Country', '')
+                candidate_degree = candidate_row.get('Degree', '')
+                candidate_skills = self.process_skills(candidate_row.get('Skills', ''))
+                resume_link = candidate_row.get('Resume Link', '')
+                
+                # Check country compatibility
+                country_match = self.check_country_compatibility(company_country, candidate_country)
+                
+                # Check degree eligibility
+                degree_eligible = False
+                if candidate_degree and eligible_degrees:
+                    candidate_degree_lower = candidate_degree.lower()
+                    degree_eligible = any(degree.lower() in candidate_degree_lower for degree in eligible_degrees)
+                
+                # With declared pruning, only pairs whose declared skills reach the threshold get a resume analysis
+                declared_eligible = True
+                if self.skill_pruning == "declared":
+                    declared_eligible = country_match and degree_eligible and \
+                        self.declared_skill_percentage(required_skills, candidate_skills) >= self.eligibility_threshold
+                
+                # Analyze resume if available
+                resume_analysis = {"eligible": False, "skill_matches": [], "match_percentage": 0}
+                has_resume = False
+                if resume_link and declared_eligible:
+                    resume_content = self.get_resume(resume_link).text
+                    has_resume = bool(resume_content) and resume_content != "Invalid Drive link format"
+                    resume_analysis = self.analyze_resume_eligibility(resume_content, required_skills, scanner)
+                
+                # Determine overall eligibility
+                overall_eligible = (
+                    country_match and 
+                    degree_eligible and 
+                    declared_eligible and 
+                    resume_analysis["eligible"]
+                )
+                
+                if overall_eligible:
+                    eligible_candidates.add(resume_analysis["match_percentage"], order, candidate_name)
+                
+                evaluated += 1
+                if not (country_match and degree_eligible):
+                    pruned_degree += 1
+                elif not declared_eligible:
+                    pruned_declared += 1
+                elif not has_resume:
+                    pruned_resume += 1
+                eligible_pairs += overall_eligible
+            
+            # Top candidates by skill match percentage, up to the requirement count
+            top_candidates = eligible_candidates.best()
+            
+            results.append(self._build_result_row(
+                company_name, role, required_skills, eligible_degrees,
+                [name for _, _, name in top_candidates],
+                requirement_count,
+                eligible_candidates.count,
+                company_country,
+                top_candidates[0][0] if top_candidates else 0
+            ))
+            yield pd.DataFrame(results[-1:], index=[position])
+        
+        self._count_pairs(len(self.companies_data), evaluated, pruned_degree, pruned_declared, pruned_resume,
+                          eligible_pairs)
+        self.last_results = pd.DataFrame(results)
+    
+    def _count_pairs(self, roles: int, evaluated: int, pruned_degree: int, pruned_declared: int,
+                     pruned_resume: int, eligible: int):
+        """Record how many of the scored roles' pairs each filter removed, in the order they apply"""
+        self.profile.count("roles_scored", roles)
+        self.profile.count("pairs_total", roles * len(self.candidates_data))
+        self.profile.count("pairs_pruned_country", roles * len(self.candidates_data) - evaluated)
+        self.profile.count("pairs_evaluated", evaluated)
+        self.profile.count("pairs_pruned_degree", pruned_degree)
+        self.profile.count("pairs_pruned_declared", pruned_declared)
+        self.profile.count("pairs_pruned_resume", pruned_resume)
+        self.profile.count("pairs_pruned_skills", evaluated - pruned_degree - pruned_declared - pruned_resume - eligible)
+        self.profile.count("pairs_eligible", eligible)
+    
+    def _column_values(self, df: pd.DataFrame, column: str, default) -> list:
+        """Return a column as a list, or a list of defaults if it is missing"""
+        if column in df.columns:
+            return df[column].tolist()
+        return [default] * len(df)
+    
+    def _country_key(self, country) -> str:
+        """Normalize a country value for comparison (None never matches)"""
+        if pd.isna(country) or not isinstance(country, str):
+            return None
+        return country.strip().lower()
+    
+    def _encode_companies(self, companies: pd.DataFrame) -> Dict:
+        """Parse the companies table once into columnar role data with vocabulary IDs"""
+        encoded = {
+            "company_name": self._column_values(companies, 'Company Name', 'Unknown'),
+            "role": self._column_values(companies, 'Role', 'Unknown'),
+            "country": self._column_values(companies, 'Country', ''),
+            "requirement_count": self._column_values(companies, 'Requirement Count', 1),
+            "required_skills": [],
+            "eligible_degrees": [],
+            "skill_ids": [],
+            "degree_ids": []
+        }
+        
+        for skills_str, degrees_str in zip(
+                self._column_values(companies, 'Required Skills', ''),
+                self._column_values(companies, 'Eligible Degrees', '')):
+            required_skills = self.process_skills(skills_str)
+            eligible_degrees = self.process_degrees(degrees_str)
+            encoded["required_skills"].append(required_skills)
+            encoded["eligible_degrees"].append(eligible_degrees)
+            # Duplicated skills keep their duplicate IDs and count twice, as in the per-pair check
+            encoded["skill_ids"].append(self.skill_vocabulary.encode_terms(required_skills))
+            encoded["degree_ids"].append(self.degree_vocabulary.encode_terms(eligible_degrees))
+        
+        encoded["skill_matrix"] = self._id_matrix(encoded["skill_ids"], len(self.skill_vocabulary))
+        encoded["degree_matrix"] = self._id_matrix(encoded["degree_ids"], len(self.degree_vocabulary))
+        encoded["skills"] = np.unique(np.concatenate([np.empty(0, dtype=np.int32)] + encoded["skill_ids"]))
+        encoded["skill_count"] = np.array([len(ids) for ids in encoded["skill_ids"]], dtype=np.int64)
+        encoded["country_key"] = [self._country_key(c) for c in encoded["country"]]
+        return encoded
+    
+    def _id_matrix(self, id_arrays: List[np.ndarray], width: int) -> sparse.csr_matrix:
+        """Stack per-row ID arrays into a sparse (row x ID) count matrix"""
+        lengths = [len(ids) for ids in id_arrays]
+        rows = np.repeat(np.arange(len(id_arrays)), lengths)
+        cols = np.concatenate([np.empty(0, dtype=np.int32)] + id_arrays)
+        return sparse.csr_matrix(
+            (np.ones(len(cols), dtype=np.int32), (rows, cols)),
+            shape=(len(id_arrays), width)
+        )
+    
+    def _encode_candidates(self, candidates: pd.DataFrame, declared_skills: bool = False) -> Dict:
+        """Parse the candidates table once (resumes are scanned separately, see _scan_candidate_resumes)"""
+        encoded = {
+            "name": self._column_values(candidates, 'Name', 'Unknown')
+        }
+        
+        # Degrees: vocabulary IDs, with -1 for missing degrees
+        encoded["degree_code"] = np.array([
+            self.degree_vocabulary.intern(degree) if isinstance(degree, str) and degree else -1
+            for degree in self._column_values(candidates, 'Degree', '')
+        ], dtype=np.int64)
+        
+        # Declared skills: a (candidate x skill ID) 0/1 matrix of the skills some role requires
+        if declared_skills:
+            declared_rows, declared_cols = [], []
+            for row, skills_str in enumerate(self._column_values(candidates, 'Skills', '')):
+                skill_ids = {self.skill_vocabulary.lookup(skill) for skill in self.process_skills(skills_str)}
+                skill_ids.discard(None)
+                declared_rows.extend([row] * len(skill_ids))
+                declared_cols.extend(skill_ids)
+            encoded["declared_skills"] = sparse.csr_matrix(
+                (np.ones(len(declared_rows), dtype=np.int32), (declared_rows, declared_cols)),
+                shape=(len(candidates), len(self.skill_vocabulary))
+            )
+        return encoded
+    
+    def _scan_candidate_resumes(self, candidates: pd.DataFrame, skill_ids: np.ndarray,
+                                resume_rows: np.ndarray = None) -> Dict:
+        """Scan the resumes of resume_rows (default all) for the given skill IDs"""
+        encoded = {}
+        # Resolve each distinct link once and scan it for every role's skills in one pass
+        patterns = self._vocabulary_patterns(skill_ids)
+        scanners = {}
+        resume_links = self._column_values(candidates, 'Resume Link', '')
+        if resume_rows is None:
+            resume_rows = range(len(candidates))
+        
+        resume_hits = {}
+        hit_rows, hit_cols = [], []
+        has_resume = np.zeros(len(candidates), dtype=bool)
+        for row in resume_rows:
+            resume_link = resume_links[row]
+            if not resume_link:
+                continue
+            if resume_link not in resume_hits:
+                resume_hits[resume_link] = self._scan_resume_skills(resume_link, patterns, scanners)
+            hits = resume_hits[resume_link]
+            has_resume[row] = hits is not None
+            if hits:
+                hit_rows.extend([row] * len(hits))
+                hit_cols.extend(hits)
+        
+        self.profile.count("resumes_scanned", len(resume_hits))
+        encoded["has_resume"] = has_resume
+        encoded["skill_hits"] = sparse.csr_matrix(
+            (np.ones(len(hit_rows), dtype=np.int32), (hit_rows, hit_cols)),
+            shape=(len(candidates), len(self.skill_vocabulary))
+        )
+        return encoded
+    
+    def _vocabulary_patterns(self, skill_ids: np.ndarray) -> Dict[Tuple[str, bool], int]:
+        """Map every spelling of the given skill IDs, as (pattern, whole word only), to its skill ID"""
+        patterns = {}
+        for skill_id in skill_ids:
+            for form in self.skill_vocabulary.surface_forms(skill_id):
+                patterns.setdefault(form, (self.skill_word_boundary, int(skill_id)))
+            # Alias spellings never seen in the sheets always match whole words only
+            for form in self.skill_vocabulary.alias_forms(skill_id):
+                patterns.setdefault(form, (True, int(skill_id)))
+        return {(form, whole_word): skill_id for form, (whole_word, skill_id) in patterns.items()}
+    
+    def _scan_resume_skills(self, resume_link: str, patterns: Dict[Tuple[str, bool], int],
+                            scanners: Dict[frozenset, Tuple[SkillScanner, Dict]]) -> Optional[List[int]]:
+        """Return the sorted skill IDs found in a resume, or None if it has no usable text
+        
+        Scan results are remembered per link, with a digest of the text they were found in, so
+        a re-match only scans resumes for patterns (e.g. newly required skills) they were not
+        scanned for yet.
+        """
+        resume = self.get_resume(resume_link)
+        if not resume.text or resume.text == "Invalid Drive link format":
+            return None
+        
+        digest = hashlib.sha1(resume.text.encode('utf-8')).digest()
+        text_digest, scanned, found = self._resume_scans.get(resume_link) or (None, frozenset(), frozenset())
+        if text_digest != digest:
+            scanned, found = frozenset(), frozenset()
+        missing = frozenset(patterns) - scanned
+        if missing:
+            # Resumes missing the same patterns share one compiled scanner
+            if missing not in scanners:
+                scanners[missing] = self._build_pattern_scanner(missing)
+            scanner, scanner_patterns = scanners[missing]
+            found = found | {scanner_patterns[pattern] for pattern in scanner.find(resume.normalized, normalized=True)}
+            # Resumes scanned once share the pattern set object
+            scanned = scanned | missing if scanned else missing
+            self._resume_scans.put(resume_link, (digest, scanned, found))
+        return sorted({patterns[pattern] for pattern in found if pattern in patterns})
+    
+    def _build_pattern_scanner(self, patterns) -> Tuple[SkillScanner, Dict[str, Tuple[str, bool]]]:
+        """Compile a scanner over (pattern, whole word only) pairs, with a scanned string -> pair map"""
+        scanner_patterns = {form: (form, whole_word) for form, whole_word in patterns}
+        scanner = SkillScanner(
+            [form for form, whole_word in patterns if not whole_word],
+            whole_word_skills=[form for form, whole_word in patterns if whole_word]
+        )
+        return scanner, scanner_patterns
+    
+    def _degree_eligibility(self, companies: Dict, candidates: Dict) -> np.ndarray:
+        """Return a (candidate degree ID x role) eligibility table, plus a last row for missing degrees"""
+        vocabulary = self.degree_vocabulary
+        role_degree_ids = np.unique(np.concatenate([np.empty(0, dtype=np.int32)] + companies["degree_ids"]))
+        candidate_degree_ids = set(np.unique(candidates["degree_code"][candidates["degree_code"] >= 0]).tolist())
+        
+        # A candidate degree satisfies an eligible degree if any of its spellings contains one of the
+        # eligible degree's (alias spellings as whole words only, so "B.E" does not match "B.Ed"); the
+        # token index finds those degrees without testing every pair (candidate degrees may have been
+        # interned after the roles were encoded)
+        self._degree_index.update()
+        contains = np.zeros((len(vocabulary) + 1, companies["degree_matrix"].shape[1]), dtype=np.int32)
+        for degree_id in role_degree_ids:
+            containing = set().union(
+                *(self._degree_index.containing(spelling) for spelling in vocabulary.surface_forms(degree_id)),
+                *(self._degree_index.containing(spelling, whole_word=True)
+                  for spelling in vocabulary.alias_forms(degree_id))
+            )
+            contains[sorted(containing & candidate_degree_ids), degree_id] = 1
+        
+        return (companies["degree_matrix"] @ contains.T).T > 0
+    
+    def _iter_match_vectorized(self, selection: str, prepared: Tuple = None) -> Iterator[pd.DataFrame]:
+        """Match candidates using batched array operations over same-country pairs, yielding rows per country
+        
+        prepared is an earlier _prepare_scoring(scan_resumes=False) of the same tables, reused if given.
+        """
+        company_hashes = self.row_hashes(self.companies_data)
+        candidate_hashes = self.row_hashes(self.candidates_data)
+        
+        # A greedy role's result only depends on its own row and its country's candidates,
+        # so only roles touched by a change since the last match are scored again
+        roles = self._roles_to_rematch(self._match_state, company_hashes, candidate_hashes) \
+            if selection == "greedy" else None
+        if roles is not None and not self._match_state["results"].empty:
+            reused = self._patch_results(company_hashes, {}).drop(index=roles)
+            if not reused.empty:
+                yield reused
+        
+        # Greedy selection only needs each role's top candidates, assignment needs every eligible pair
+        keep_all = selection == "assignment"
+        companies, candidates, arrays, groups = self._prepare_scoring(roles, prepared=prepared)
+        role_matches = [None] * len(company_hashes)
+        new_rows = {}
+        for matches in self._in_stage("score", self._iter_scored_groups(arrays, groups, keep_all)):
+            for row, match in matches.items():
+                role_matches[row] = match
+            if keep_all:
+                continue
+            with self.profile.stage("results"):
+                rows = self._build_result_rows(companies, candidates, role_matches,
+                                               {row: match[:2] for row, match in matches.items()})
+            new_rows.update(rows)
+            yield pd.DataFrame(list(rows.values()), index=list(rows.keys()))
+        
+        if keep_all:
+            with self.profile.stage("select"):
+                selected = self._assign_candidates(companies, role_matches)
+            with self.profile.stage("results"):
+                new_rows = self._build_result_rows(companies, candidates, role_matches, dict(enumerate(selected)))
+            yield pd.DataFrame(list(new_rows.values()), index=list(new_rows.keys()))
+        
+        self.rematched_roles = len(new_rows)
+        with self.profile.stage("results"):
+            if roles is None:
+                results = pd.DataFrame([new_rows[row] for row in range(len(company_hashes))])
+            else:
+                results = self._patch_results(company_hashes, new_rows)
+        self.profile.count("roles_reused", len(company_hashes) - self.rematched_roles)
+        
+        if selection == "greedy":
+            self._match_state = self._snapshot(company_hashes, candidate_hashes)
+            self._match_state["results"] = results
+        else:
+            self._match_state = None
+        self.last_results = results
+    
+    def _build_result_rows(self, companies: Dict, candidates: Dict, role_matches: List,
+                           selected: Dict[int, Tuple[np.ndarray, np.ndarray]]) -> Dict[int, Dict]:
+        """Build the result rows of the given roles from their selected (candidate rows, match percentages)"""
+        new_rows = {}
+        for row, (top_rows, top_scores) in selected.items():
+            new_rows[row] = self._build_result_row(
+                companies["company_name"][row],
+                companies["role"][row],
+                companies["required_skills"][row],
+                companies["eligible_degrees"][row],
+                [candidates["name"][i] for i in top_rows],
+                companies["requirement_count"][row],
+                role_matches[row][2],
+                companies["country"][row],
+                float(top_scores[0]) if len(top_rows) else 0
+            )
+        return new_rows
+    
+    def row_hashes(self, df: pd.DataFrame) -> np.ndarray:
+        """Return one content hash per row (independent of the row's position)"""
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    
+    def _match_settings(self) -> str:
+        """Everything besides the two tables that can change a greedy result, as a comparable key"""
+        return repr((
+            tuple(self.companies_data.columns),
+            tuple(self.candidates_data.columns),
+            self.skill_word_boundary,
+            self.eligibility_threshold,
+            self.skill_pruning,
+            tuple(sorted(self.skill_vocabulary.aliases.items())),
+            tuple(sorted(self.degree_vocabulary.aliases.items()))
+        ))
+    
+    def _snapshot(self, company_hashes: np.ndarray, candidate_hashes: np.ndarray) -> Dict:
+        """Capture what _roles_to_rematch compares against for the current tables"""
+        return {
+            "settings": self._match_settings(),
+            "company_hashes": company_hashes,
+            "candidate_hashes": candidate_hashes,
+            "candidate_countries": [self._country_key(c) for c in
+                                    self._column_values(self.candidates_data, 'Country', '')],
+            "resume_errors": set(self.resume_errors)
+        }
+    
+    def _touched_hashes(self, old_hashes: np.ndarray, new_hashes: np.ndarray) -> set:
+        """Row hashes added, removed or changed, compared as multisets"""
+        old_counts = Counter(old_hashes.tolist())
+        new_counts = Counter(new_hashes.tolist())
+        return {h for h in old_counts.keys() | new_counts.keys() if old_counts[h] != new_counts[h]}
+    
+    def _unchanged_rows(self, hashes: np.ndarray, touched: set, positions: bool) -> list:
+        """Hashes of the rows not in touched, with their row positions if positions is set"""
+        if positions:
+            return [(row, h) for row, h in enumerate(hashes.tolist()) if h not in touched]
+        return [h for h in hashes.tolist() if h not in touched]
+    
+    def _roles_to_rematch(self, state: Optional[Dict], company_hashes: np.ndarray, candidate_hashes: np.ndarray,
+                          stable_positions: bool = False) -> Optional[List[int]]:
+        """Return the role rows affected by changes since state was captured, or None to match all
+        
+        With stable_positions, unchanged rows must also keep their row positions
+        (for results stored by position, such as a MatchStore).
+        """
+        if state is None or state["settings"] != self._match_settings():
+            return None
+        
+        # Candidate rows added, removed or changed, compared as a multiset of row hashes
+        touched = self._touched_hashes(state["candidate_hashes"], candidate_hashes)
+        
+        # Ties are broken by sheet order, so reordered unchanged rows need a full match
+        if self._unchanged_rows(state["candidate_hashes"], touched, stable_positions) != \
+                self._unchanged_rows(candidate_hashes, touched, stable_positions):
+            return None
+        if stable_positions:
+            touched_roles = self._touched_hashes(state["company_hashes"], company_hashes)
+            if self._unchanged_rows(state["company_hashes"], touched_roles, True) != \
+                    self._unchanged_rows(company_hashes, touched_roles, True):
+                return None
+        
+        new_countries = [self._country_key(c) for c in self._column_values(self.candidates_data, 'Country', '')]
+        touched_countries = {country for h, country in zip(state["candidate_hashes"].tolist(),
+                                                           state["candidate_countries"]) if h in touched}
+        touched_countries |= {country for h, country in zip(candidate_hashes.tolist(), new_countries)
+                              if h in touched}
+        
+        # Resumes that failed to download last time and are available now
+        recovered = state["resume_errors"] - set(self.resume_errors)
+        if recovered:
+            for resume_link, country in zip(self._column_values(self.candidates_data, 'Resume Link', ''),
+                                            new_countries):
+                if self.get_drive_file_id(resume_link) in recovered:
+                    touched_countries.add(country)
+        
+        previous_roles = set(state["company_hashes"].tolist())
+        return [
+            row for row, (company_hash, country) in enumerate(zip(
+                company_hashes.tolist(), self._column_values(self.companies_data, 'Country', '')))
+            if company_hash not in previous_roles or self._country_key(country) in touched_countries
+        ]
+    
+    def _patch_results(self, company_hashes: np.ndarray, new_rows: Dict[int, Dict]) -> pd.DataFrame:
+        """Reuse the previous result rows of unchanged roles and fill in the re-matched ones"""
+        state = self._match_state
+        if state["results"].empty:
+            # Nothing to reuse, so every role was re-matched
+            return pd.DataFrame([new_rows[row] for row in range(len(company_hashes))])
+        previous_rows = {h: position for position, h in enumerate(state["company_hashes"].tolist())}
+        
+        # Unchanged roles copy their previous row, re-matched ones are overwritten below
+        source_rows = [previous_rows.get(h, 0) for h in company_hashes.tolist()]
+        results = state["results"].iloc[source_rows].reset_index(drop=True)
+        if new_rows:
+            patch = pd.DataFrame(list(new_rows.values()), index=list(new_rows.keys()))
+            for column in patch.columns:
+                results[column] = results[column].astype(object)
+                results.loc[patch.index, column] = patch[column].to_numpy(dtype=object)
+                results[column] = results[column].infer_objects()
+        return results
+    
+    def _score_pairs(self, keep_all: bool = False, roles: Sequence[int] = None, prepared: Tuple = None
+                     ) -> Tuple[Dict, Dict, List[Tuple[np.ndarray, np.ndarray, int]]]:
+        """Encode both tables and return, per role, (candidate rows, match percentages, eligible count)
+        
+        Unless keep_all is set, only each role's top Requirement Count candidates are kept.
+        When roles is given, only those role rows are scored and the others are None.
+        prepared is passed on to _prepare_scoring.
+        """
+        companies, candidates, arrays, groups = self._prepare_scoring(roles, prepared=prepared)
+        role_matches = [None] * len(self.companies_data)
+        for matches in self._in_stage("score", self._iter_scored_groups(arrays, groups, keep_all)):
+            for row, match in matches.items():
+                role_matches[row] = match
+        return companies, candidates, role_matches
+    
+    def _prepare_scoring(self, roles: Sequence[int] = None, scan_resumes: bool = True, prepared: Tuple = None
+                         ) -> Tuple[Dict, Dict, Dict, List[Tuple[np.ndarray, List[int]]]]:
+        """Encode both tables for scoring the given role rows (all if None)
+        
+        Returns the encoded companies and candidates, the arrays partitions are scored with,
+        and the (candidate partition, role rows) groups of same-country roles. The candidate
+        rows whose resumes matter are in candidates["resume_rows"]; unless scan_resumes is
+        off, those resumes are scanned too. prepared, the result of an earlier call for every
+        role of the same tables with scan_resumes off, is reused instead of encoding again
+        (and its groups and resume rows too when roles is None); it is left unchanged.
+        """
+        if prepared is None:
+            companies, candidates, arrays = self._encode_for_scoring()
+        else:
+            companies, candidates, arrays, groups = prepared
+            candidates, arrays = dict(candidates), dict(arrays)
+        
+        if prepared is None or roles is not None:
+            country_index = self.get_country_index()
+            if roles is None:
+                roles = range(len(self.companies_data))
+            
+            # Group roles by country so each group scores a single candidate partition
+            role_groups = {}
+            for row in roles:
+                role_groups.setdefault(companies["country_key"][row], []).append(row)
+            partitions = {key: country_index.get(key, np.empty(0, dtype=np.int64)) for key in role_groups}
+            groups = [(partitions[key], role_rows) for key, role_rows in role_groups.items()]
+            
+            # Only candidates in a country with roles to score need their resumes analyzed, and with
+            # declared pruning only those passing the degree and declared skills checks of such a role
+            resume_rows = np.unique(np.concatenate([np.empty(0, dtype=np.int64)] + list(partitions.values())))
+            if self.skill_pruning == "declared":
+                with self.profile.stage("declared"):
+                    resume_rows = self._declared_survivors(arrays, groups)
+            candidates["resume_rows"] = resume_rows
+        
+        if scan_resumes:
+            with self.profile.stage("scan_resumes"):
+                candidates.update(self._scan_candidate_resumes(self.candidates_data, companies["skills"],
+                                                               candidates["resume_rows"]))
+            arrays["has_resume"] = candidates["has_resume"]
+            arrays["hits_t"] = candidates["skill_hits"].T.tocsc()
+        return companies, candidates, arrays, groups
+    
+    def _encode_for_scoring(self) -> Tuple[Dict, Dict, Dict]:
+        """Encode both tables and the role-independent arrays partitions are scored with"""
+        with self.profile.stage("encode_companies"):
+            companies = self._encode_companies(self.companies_data)
+        
+        declared_pruning = self.skill_pruning == "declared"
+        with self.profile.stage("encode_candidates"):
+            candidates = self._encode_candidates(self.candidates_data, declared_skills=declared_pruning)
+        
+        candidate_degree = candidates["degree_code"].copy()
+        candidate_degree[candidate_degree < 0] = len(self.degree_vocabulary)
+        # Everything a partition is scored with; read-only, so worker processes can share it
+        arrays = {
+            "skill_matrix": companies["skill_matrix"],
+            "skill_count": companies["skill_count"],
+            "limits": np.array([selection_limit(count) for count in companies["requirement_count"]], dtype=np.int64),
+            "threshold": np.array([self.eligibility_threshold], dtype=float),
+            "candidate_degree": candidate_degree
+        }
+        with self.profile.stage("degrees"):
+            arrays["degree_ok"] = self._degree_eligibility(companies, candidates)
+        if declared_pruning:
+            arrays["declared_t"] = candidates["declared_skills"].T.tocsc()
+            arrays["min_hits"] = self._min_hits(companies["skill_count"])
+        return companies, candidates, arrays
+    
+    def _min_hits(self, skill_count: np.ndarray) -> np.ndarray:
+        """Per role, the fewest matched skills reaching the eligibility threshold (skill count + 1 if none do)"""
+        threshold = self.eligibility_threshold
+        return np.array([
+            next((k for k in range(n + 1) if ((k / n) * 100 if n else 0) >= threshold), n + 1)
+            for n in skill_count.tolist()
+        ], dtype=np.int64)
+    
+    def _declared_survivors(self, arrays: Dict, groups: List[Tuple[np.ndarray, List[int]]]) -> np.ndarray:
+        """Return the sorted candidate rows passing the degree and declared skills checks of a role in their group"""
+        survivors = [np.empty(0, dtype=np.int64)]
+        for partition, role_rows in groups:
+            partition_declared = arrays["declared_t"][:, partition]
+            partition_degree = arrays["candidate_degree"][partition]
+            passed = np.zeros(len(partition), dtype=bool)
+            block_size = max(1, PAIR_BLOCK_SIZE // max(len(partition), 1))
+            for start in range(0, len(role_rows), block_size):
+                block = role_rows[start:start + block_size]
+                degree_block = arrays["degree_ok"][:, block][partition_degree]
+                passed |= self._declared_passing(arrays, block, partition_declared, degree_block).any(axis=1)
+            survivors.append(partition[passed])
+        return np.unique(np.concatenate(survivors))
+    
+    @staticmethod
+    def _declared_passing(arrays: Dict, block: List[int], partition_declared: sparse.csc_matrix,
+                          degree_block: np.ndarray) -> np.ndarray:
+        """Narrow a (candidate x role) degree check to the pairs whose declared skills reach the threshold"""
+        declared_counts = (arrays["skill_matrix"][block] @ partition_declared).toarray().T
+        return degree_block & (declared_counts >= arrays["min_hits"][block])
+    
+    def _iter_scored_groups(self, arrays: Dict, groups: List[Tuple[np.ndarray, List[int]]], keep_all: bool
+                            ) -> Iterator[Dict[int, Tuple[np.ndarray, np.ndarray, int]]]:
+        """Score each (candidate partition, role rows) group, yielding {role row: match} per group
+        
+        The pruning counters are recorded once every group has been scored.
+        """
+        evaluated = sum(len(partition) * len(role_rows) for partition, role_rows in groups)
+        degree_passed = declared_passed = resume_passed = eligible_pairs = 0
+        if self.score_workers > 1 and evaluated >= PARALLEL_MIN_PAIRS:
+            from parallel_scoring import score_partitions_parallel
+            
+            scored = score_partitions_parallel(arrays, groups, keep_all, self.score_workers)
+            self.profile.count("score_workers", self.score_workers)
+        else:
+            scored = (self._score_partition(arrays, partition, role_rows, keep_all)
+                      for partition, role_rows in groups)
+        for matches, group_degree_passed, group_declared_passed, group_resume_passed in scored:
+            eligible_pairs += sum(match[2] for match in matches.values())
+            degree_passed += group_degree_passed
+            declared_passed += group_declared_passed
+            resume_passed += group_resume_passed
+            yield matches
+        self._count_pairs(sum(len(role_rows) for _, role_rows in groups), evaluated, evaluated - degree_passed,
+                          degree_passed - declared_passed, declared_passed - resume_passed, eligible_pairs)
+    
+    @staticmethod
+    def _score_partition(arrays: Dict, partition: np.ndarray, role_rows: List[int], keep_all: bool
+                         ) -> Tuple[Dict[int, Tuple[np.ndarray, np.ndarray, int]], int, int, int]:
+        """Score same-country roles against a partition (or a slice of one) of candidate rows
+        
+        Returns {role row: (candidate rows, match percentages, eligible count)}, plus the number of
+        pairs passing the degree check, also passing the declared skills check (when arrays hold
+        declared skills) and also passing the resume check. Unless keep_all is set, only each
+        role's top candidates are kept; otherwise rows stay in partition order.
+        """
+        partition_hits = arrays["hits_t"][:, partition]
+        partition_degree = arrays["candidate_degree"][partition]
+        partition_resume = arrays["has_resume"][partition, None]
+        partition_declared = arrays["declared_t"][:, partition] if "declared_t" in arrays else None
+        threshold = float(arrays["threshold"][0])
+        block_size = max(1, PAIR_BLOCK_SIZE // max(len(partition), 1))
+        
+        matches, degree_passed, declared_passed, resume_passed = {}, 0, 0, 0
+        for start in range(0, len(role_rows), block_size):
+            block = role_rows[start:start + block_size]
+            
+            # Number of required skills found in each candidate's resume
+            match_counts = (arrays["skill_matrix"][block] @ partition_hits).toarray()
+            passing = arrays["degree_ok"][:, block][partition_degree]
+            degree_passed += int(passing.sum())
+            if partition_declared is not None:
+                passing = JobMatchingSystem._declared_passing(arrays, block, partition_declared, passing)
+            declared_passed += int(passing.sum())
+            eligible = passing & partition_resume
+            resume_passed += int(eligible.sum())
+            eligible = eligible.T
+            
+            for offset, row in enumerate(block):
+                rows, scores = JobMatchingSystem._eligible_pairs(
+                    int(arrays["skill_count"][row]), partition, match_counts[offset], eligible[offset], threshold
+                )
+                eligible_count = len(rows)
+                if not keep_all:
+                    rows, scores = JobMatchingSystem._rank_candidates(rows, scores, int(arrays["limits"][row]))
+                matches[row] = (rows, scores, eligible_count)
+        return matches, degree_passed, declared_passed, resume_passed
+    
+    @staticmethod
+    def _eligible_pairs(skill_count: int, partition: np.ndarray, counts: np.ndarray,
+                        eligible: np.ndarray, threshold: float = ELIGIBILITY_THRESHOLD) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the eligible candidate rows of one role and their rounded match percentages"""
+        # Match percentage depends only on the hit count, so tabulate it per role
+        percentages = [(k / skill_count) * 100 if skill_count else 0 for k in range(skill_count + 1)]
+        rounded = np.array([round(p, 2) for p in percentages], dtype=float)
+        skill_eligible = np.array(percentages, dtype=float) >= threshold
+        
+        local_idx = np.flatnonzero(eligible & skill_eligible[counts])
+        return partition[local_idx], rounded[counts[local_idx]]
+    
+    @staticmethod
+    def _rank_candidates(rows: np.ndarray, scores: np.ndarray,
+                         limit: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the best `limit` candidates (all if None), highest percentage first and ties in sheet order"""
+        if limit is not None and limit < len(rows):
+            if limit == 0:
+                return rows[:0], scores[:0]
+            # Partial selection: keep everything scoring at least the limit-th best
+            # score (ties included) and only sort those
+            threshold = -np.partition(-scores, limit - 1)[limit - 1]
+            keep = scores >= threshold
+            rows, scores = rows[keep], scores[keep]
+        order = np.lexsort((rows, -scores))[:limit]
+        return rows[order], scores[order]
+    
+    def _assign_candidates(self, companies: Dict, role_matches: List[Tuple[np.ndarray, np.ndarray, int]]
+                           ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Pick candidates for all roles at once, maximizing the total match percentage"""
+        role_ids = np.concatenate([np.full(len(rows), row, dtype=np.int64)
+                                   for row, (rows, _, _) in enumerate(role_matches)] + [np.empty(0, dtype=np.int64)])
+        candidate_rows = np.concatenate([rows for rows, _, _ in role_matches] + [np.empty(0, dtype=np.int64)])
+        scores = np.concatenate([scores for _, scores, _ in role_matches] + [np.empty(0)])
+        
+        role_capacity = pd.to_numeric(pd.Series(companies["requirement_count"], dtype=object),
+                                      errors='coerce').fillna(0).to_numpy()
+        candidate_capacity = np.full(len(self.candidates_data), self.max_interviews_per_candidate)
+        from assignment import solve_assignment
+        
+        chosen = solve_assignment(role_ids, candidate_rows, scores, role_capacity, candidate_capacity)
+        
+        # Edges are grouped by role, so split the solution back into per-role segments
+        selected = []
+        boundaries = np.cumsum([len(rows) for rows, _, _ in role_matches])
+        for start, stop in zip(np.concatenate([[0], boundaries[:-1]]), boundaries):
+            mask = chosen[start:stop]
+            selected.append(self._rank_candidates(candidate_rows[start:stop][mask], scores[start:stop][mask], None))
+        return selected
+
+def create_resume_fetcher_from_env() -> ResumeFetcher:
+    """Configure resume downloads from RESUME_DIR (local files) or RESUME_BACKEND=drive"""
+    resume_dir = os.environ.get("RESUME_DIR")
+    if resume_dir:
+        backend = LocalDirectoryBackend(resume_dir)
+    elif os.environ.get("RESUME_BACKEND", "").lower() == "drive":
+        backend = GoogleDriveBackend()
+    else:
+        return None
+    
+    return ResumeFetcher(
+        backend,
+        max_workers=int(os.environ.get("RESUME_FETCH_WORKERS", 16)),
+        rate_limit=float(os.environ["RESUME_FETCH_RATE"]) if os.environ.get("RESUME_FETCH_RATE") else None
+    )
+
+def engine_options_from_env() -> Dict:
+    """JobMatchingSystem caches and resume pipeline configured from the environment
+
+    RESUME_CACHE_DIR keeps resumes across sessions, WORKBOOK_CACHE_DIR / WORKBOOK_CACHE_MB
+    place and size the parsed-workbook cache, MATCH_SCORE_WORKERS sets the processes large
+    scoring runs are sharded across, and MATCH_ELIGIBILITY_THRESHOLD / MATCH_SKILL_PRUNING set
+    the skill match threshold and pruning policy (see also create_resume_fetcher_from_env).
+    """
+    return {
+        "workbook_cache": WorkbookCache(
+            cache_dir=os.environ.get("WORKBOOK_CACHE_DIR",
+                                     os.path.join(tempfile.gettempdir(), "job_matching_workbooks")),
+            max_bytes=int(os.environ.get("WORKBOOK_CACHE_MB", 512)) * 1024 * 1024
+        ),
+        "resume_cache": ResumeCache(cache_dir=os.environ.get("RESUME_CACHE_DIR")),
+        "resume_fetcher": create_resume_fetcher_from_env(),
+        "resume_extractor": ResumeTextExtractor(
+            max_workers=int(os.environ.get("RESUME_EXTRACT_WORKERS", os.cpu_count() or 1))
+        ),
+        "score_workers": int(os.environ.get("MATCH_SCORE_WORKERS", os.cpu_count() or 1)),
+        "eligibility_threshold": float(os.environ.get("MATCH_ELIGIBILITY_THRESHOLD", ELIGIBILITY_THRESHOLD)),
+        "skill_pruning": os.environ.get("MATCH_SKILL_PRUNING", "none")
+    }
+
+def _export_format(path: str, fmt: Optional[str]) -> str:
+    """Return fmt, or the export format matching a file extension"""
+    from results_export import EXPORT_FORMATS
+    
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise SystemExit(f"Unknown export format for {path}, pass --format ({', '.join(EXPORT_FORMATS)})")
+    return fmt
+
+def _read_file(engine: JobMatchingSystem, path: str, columns: List[str], dtypes: Dict[str, str]) -> pd.DataFrame:
+    with open(path, 'rb') as f:
+        return engine.read_workbook(path, f.read(), columns, dtypes)
+
+def run_match_command(args):
+    """Match two workbooks and write the results (and optionally all pair scores)"""
+    from results_export import write_frames
+    
+    profile = PipelineProfile(cprofile=args.cprofile, trace_memory=args.tracemalloc)
+    engine = JobMatchingSystem(selection=args.selection, max_interviews_per_candidate=args.max_interviews,
+                               skill_word_boundary=args.whole_word, profile=profile, **engine_options_from_env())
+    if args.workers is not None:
+        engine.score_workers = args.workers
+    if args.threshold is not None:
+        engine.eligibility_threshold = args.threshold
+    if args.skill_pruning is not None:
+        engine.skill_pruning = args.skill_pruning
+    if args.aliases:
+        from vocabulary import DEFAULT_DEGREE_ALIASES, DEFAULT_SKILL_ALIASES
+        engine.set_aliases(DEFAULT_SKILL_ALIASES, DEFAULT_DEGREE_ALIASES)
+    
+    with profile.capture():
+        engine.companies_data = _read_file(engine, args.companies, COMPANY_COLUMNS, COMPANY_DTYPES)
+        engine.candidates_data = _read_file(engine, args.candidates, CANDIDATE_COLUMNS, CANDIDATE_DTYPES)
+        
+        start = time.perf_counter()
+        results = engine.match_candidates_to_jobs()
+        with profile.stage("export"):
+            write_frames([results], args.output, _export_format(args.output, args.format), sheet_name="Results")
+        print(f"Matched {len(results)} roles in {time.perf_counter() - start:.2f}s -> {args.output}")
+        if engine.resume_errors:
+            print(f"{len(engine.resume_errors)} resumes could not be downloaded")
+        
+        if args.pairs:
+            with profile.stage("export"):
+                written = write_frames(engine.iter_pair_scores(), args.pairs,
+                                       _export_format(args.pairs, args.format), sheet_name="Pair Scores")
+            print(f"Wrote {written} pair scores -> {args.pairs}")
+        if args.db:
+            from match_store import MatchStore
+            
+            store = MatchStore(args.db)
+            try:
+                print(f"Saved {engine.save_matches(store, results)} pair scores -> {args.db}")
+            finally:
+                store.close()
+    
+    if args.profile:
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            f.write(profile.to_json())
+        print(f"Wrote stage timings and counters -> {args.profile}")
+
+def run_serve_command(args):
+    """Serve the JSON match endpoint until interrupted"""
+    from match_server import MatchingService, create_server
+    
+    service = MatchingService(max_engines=args.max_engines, **engine_options_from_env())
+    server = create_server(service, args.host, args.port, args.batch_workers)
+    print(f"Serving POST /match, POST /batch and GET /health on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def _import_seconds(module: str, repeat: int) -> Optional[float]:
+    """Median wall time of importing a module in a fresh interpreter, or None if it cannot be imported"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        if result.returncode != 0:
+            return None
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+def run_benchmark_command(args):
+    """Compare startup costs of the headless engine and the Streamlit app, then a cold and warm job"""
+    import base64
+    
+    from match_server import MatchingService
+    
+    print(f"{'startup (median of ' + str(args.repeat) + ')':<36}{'seconds':>10}")
+    for label, module in (("python", "sys"), ("import matching_engine", "matching_engine"),
+                          ("import match_server", "match_server"),
+                          ("import job_matching_system (UI)", "job_matching_system")):
+        seconds = _import_seconds(module, args.repeat)
+        print(f"{label:<36}{'n/a' if seconds is None else f'{seconds:.3f}':>10}")
+    
+    def table(path):
+        with open(path, 'rb') as f:
+            return {"name": os.path.basename(path), "data": base64.b64encode(f.read()).decode('ascii')}
+    
+    job = {"companies": table(args.companies), "candidates": table(args.candidates)}
+    service = MatchingService()
+    print(f"{'job':<36}{'seconds':>10}")
+    for label in ("cold (first job)", "warm (same job again)"):
+        start = time.perf_counter()
+        service.run(job)
+        print(f"{label:<36}{time.perf_counter() - start:>10.3f}")
+
+def main():
+    """Run the matching engine without the Streamlit UI"""
+    parser = argparse.ArgumentParser(description="Headless job matching engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    match = commands.add_parser("match", help="Match two workbooks and write the results")
+    match.add_argument("companies", help="Companies workbook")
+    match.add_argument("candidates", help="Candidates workbook")
+    match.add_argument("-o", "--output", default="job_matching_results.csv", help="Results file")
+    match.add_argument("--format", help="csv, parquet, arrow or xlsx (default: from the file extension)")
+    match.add_argument("--pairs", help="Also write every eligible pair's score to this file")
+    match.add_argument("--db", help="Also save the match to this SQLite match store")
+    match.add_argument("--selection", choices=JobMatchingSystem.SELECTIONS, default="greedy")
+    match.add_argument("--max-interviews", type=int, default=3, help="Per candidate, for assignment selection")
+    match.add_argument("--whole-word", action="store_true", help="Match whole-word skills only")
+    match.add_argument("--aliases", action="store_true", help="Resolve skill and degree aliases")
+    match.add_argument("--threshold", type=float,
+                       help=f"Minimum skill match %% for eligibility (default: {ELIGIBILITY_THRESHOLD})")
+    match.add_argument("--skill-pruning", choices=JobMatchingSystem.SKILL_PRUNING,
+                       help="\"declared\" skips resumes of pairs whose declared skills miss the threshold "
+                            "(faster, may drop matches; default: none)")
+    match.add_argument("--workers", type=int,
+                       help="Processes to shard large scoring runs across (default: MATCH_SCORE_WORKERS or all cores)")
+    match.add_argument("--profile", help="Write per-stage timings and counters to this JSON file")
+    match.add_argument("--cprofile", action="store_true", help="Add the slowest functions (cProfile) to --profile")
+    match.add_argument("--tracemalloc", action="store_true", help="Add peak memory and top allocations to --profile")
+    match.set_defaults(run=run_match_command)
+    
+    serve = commands.add_parser("serve", help="Serve the local HTTP JSON endpoint")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--batch-workers", type=int, default=4, help="Jobs of a batch matched concurrently")
+    serve.add_argument("--max-engines", type=int, default=8, help="Warm engines (candidate tables) kept")
+    serve.set_defaults(run=run_serve_command)
+    
+    benchmark = commands.add_parser("benchmark", help="Measure startup time and cold/warm job latency")
+    benchmark.add_argument("companies", nargs="?", default="sample_companies_20250803_132233.xlsx")
+    benchmark.add_argument("candidates", nargs="?", default="sample_candidates_20250803_132233.xlsx")
+    benchmark.add_argument("--repeat", type=int, default=5, help="Interpreter starts per measurement")
+    benchmark.set_defaults(run=run_benchmark_command)
+    
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from matching_engine import JobMatchingSystem
+
+# Approximate number of same-country pairs scored per task
+SHARD_PAIRS = 5_000_000
+
+# Parts a sparse matrix is saved as
+SPARSE_PARTS = ("data", "indices", "indptr")
+
+# Arrays a worker has memory-mapped, by directory (each pool works on one directory)
+_mapped: Dict[str, Dict] = {}
+
+
+def save_arrays(directory: str, arrays: Dict) -> Dict[str, Tuple]:
+    """Write arrays (numpy or scipy CSR/CSC) as .npy files and return the layout workers map them with"""
+    layout = {}
+    for name, array in arrays.items():
+        if sparse.issparse(array):
+            for part in SPARSE_PARTS:
+                np.save(os.path.join(directory, f"{name}.{part}.npy"), getattr(array, part))
+            layout[name] = (array.format, array.shape)
+        else:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+            layout[name] = (None, array.shape)
+    return layout
+
+
+def map_arrays(directory: str, layout: Dict[str, Tuple]) -> Dict:
+    """Memory-map arrays written by save_arrays (read-only; pages are shared with every other process)"""
+    if directory not in _mapped:
+        arrays = {}
+        for name, (sparse_format, shape) in layout.items():
+            if sparse_format is None:
+                arrays[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+                continue
+            parts = [np.load(os.path.join(directory, f"{name}.{part}.npy"), mmap_mode='r') for part in SPARSE_PARTS]
+            matrix_type = sparse.csc_matrix if sparse_format == "csc" else sparse.csr_matrix
+            arrays[name] = matrix_type(tuple(parts), shape=shape, copy=False)
+        _mapped.clear()
+        _mapped[directory] = arrays
+    return _mapped[directory]
+
+
+def _score_shard(directory: str, layout: Dict[str, Tuple], partition: np.ndarray, role_rows: List[int],
+                 keep_all: bool) -> Tuple[Dict[int, Tuple[np.ndarray, np.ndarray, int]], int, int, int]:
+    """Worker entry point: score roles against one slice of a country's candidates"""
+    return JobMatchingSystem._score_partition(map_arrays(directory, layout), partition, role_rows, keep_all)
+
+
+def shard_partition(partition: np.ndarray, role_count: int, shard_pairs: int = SHARD_PAIRS) -> List[np.ndarray]:
+    """Split a partition into consecutive slices of about shard_pairs pairs each"""
+    shards = max(1, math.ceil(len(partition) * role_count / shard_pairs))
+    return [part for part in np.array_split(partition, shards) if len(part)] or [partition]
+
+
+def merge_shards(role_rows: List[int], shard_results: List[Dict[int, Tuple[np.ndarray, np.ndarray, int]]],
+                 limits: np.ndarray, keep_all: bool) -> Dict[int, Tuple[np.ndarray, np.ndarray, int]]:
+    """Combine per-slice results of the same roles (slices in partition order) into per-role results
+
+    A role's top candidates overall are among the top candidates of the slices, so re-ranking
+    the slices' picks gives exactly the single-process result.
+    """
+    matches = {}
+    for row in role_rows:
+        parts = [result[row] for result in shard_results]
+        rows = np.concatenate([part[0] for part in parts])
+        scores = np.concatenate([part[1] for part in parts])
+        if not keep_all:
+            rows, scores = JobMatchingSystem._rank_candidates(rows, scores, int(limits[row]))
+        matches[row] = (rows, scores, sum(part[2] for part in parts))
+    return matches
+
+
+def score_partitions_parallel(arrays: Dict, groups: List[Tuple[np.ndarray, List[int]]], keep_all: bool,
+                              max_workers: int) -> Iterator[Tuple[Dict[int, Tuple[np.ndarray, np.ndarray, int]],
+                                                                  int, int, int]]:
+    """Score (partition, role rows) groups across a process pool, yielding what _score_partition returns per group
+
+    Candidate partitions are split into slices scored by separate tasks. Workers memory-map the
+    shared arrays from a temporary directory, so tasks only carry their slice of row positions.
+    """
+    with tempfile.TemporaryDirectory(prefix="match_scoring_") as directory:
+        layout = save_arrays(directory, arrays)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = [
+                [executor.submit(_score_shard, directory, layout, shard, role_rows, keep_all)
+                 for shard in shard_partition(partition, len(role_rows))]
+                for partition, role_rows in groups
+            ]
+            for (partition, role_rows), futures in zip(groups, pending):
+                results = [future.result() for future in futures]
+                # Pair counts (degree, declared skills and resume checks passed) add up across slices
+                yield (merge_shards(role_rows, [result[0] for result in results], arrays["limits"], keep_all),
+                       *(sum(counts) for counts in zip(*(result[1:] for result in results))))
@@ -0,0 +1,157 @@
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Functions and allocation sites kept from an opt-in capture
+CAPTURE_TOP_N = 30
+
+
+class PipelineProfile:
+    """Wall and CPU seconds per pipeline stage, counters per stage, and an opt-in cProfile/tracemalloc capture
+
+    Stages nest: a stage opened inside "match" is recorded as "match/<name>", and a stage
+    entered again adds to its totals. Counters belong to the innermost open stage.
+    CPU seconds are for the whole process (worker threads included, worker processes not).
+    """
+
+    def __init__(self, cprofile: bool = False, trace_memory: bool = False):
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all stages, counters and captures"""
+        with self._lock:
+            self.stages: Dict[str, Dict] = {}
+            self.functions: List[Dict] = []
+            self.memory: Optional[Dict] = None
+
+    def _stack(self) -> List[str]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _entry(self, path: str) -> Dict:
+        return self.stages.setdefault(path, {"calls": 0, "wall": 0.0, "cpu": 0.0, "counters": Counter()})
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a stage"""
+        stack = self._stack()
+        path = f"{stack[-1]}/{name}" if stack else name
+        with self._lock:
+            self._entry(path)
+        stack.append(path)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stack.pop()
+            with self._lock:
+                entry = self._entry(path)
+                entry["calls"] += 1
+                entry["wall"] += time.perf_counter() - wall
+                entry["cpu"] += time.process_time() - cpu
+
+    def count(self, name: str, value: int = 1):
+        """Add to a counter of the innermost open stage (or of the whole run outside any stage)"""
+        stack = self._stack()
+        with self._lock:
+            self._entry(stack[-1] if stack else "")["counters"][name] += int(value)
+
+    def counters(self) -> Dict[str, int]:
+        """Every counter summed over all stages"""
+        totals = Counter()
+        with self._lock:
+            for entry in self.stages.values():
+                totals.update(entry["counters"])
+        return dict(totals)
+
+    def add(self, other: "PipelineProfile"):
+        """Add another profile's stages and counters to this one (e.g. an upload's load stage to a match run)"""
+        with self._lock:
+            for path, entry in other.stages.items():
+                mine = self._entry(path)
+                mine["calls"] += entry["calls"]
+                mine["wall"] += entry["wall"]
+                mine["cpu"] += entry["cpu"]
+                mine["counters"].update(entry["counters"])
+            self.functions = self.functions or other.functions
+            self.memory = self.memory or other.memory
+
+    @contextmanager
+    def capture(self) -> Iterator[None]:
+        """Run the enclosed block under cProfile and/or tracemalloc, as enabled on this profile
+
+        cProfile only sees the calling thread; tracemalloc sees every thread of this process.
+        """
+        profiler = cProfile.Profile() if self.cprofile else None
+        # Leave tracemalloc alone if someone else already started it
+        trace = self.trace_memory and not tracemalloc.is_tracing()
+        if trace:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.functions = self._top_functions(profiler)
+            if trace:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.memory = {
+                    "current_bytes": current,
+                    "peak_bytes": peak,
+                    "top_allocations": [
+                        {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                         "bytes": stat.size, "blocks": stat.count}
+                        for stat in snapshot.statistics("lineno")[:CAPTURE_TOP_N]
+                    ]
+                }
+
+    def _top_functions(self, profiler: cProfile.Profile) -> List[Dict]:
+        """The functions with the most cumulative time, as JSON-ready rows"""
+        stats = pstats.Stats(profiler)
+        rows = []
+        for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+            rows.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                         "total_seconds": round(total, 6), "cumulative_seconds": round(cumulative, 6)})
+        rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+        return rows[:CAPTURE_TOP_N]
+
+    def stage_rows(self) -> List[Dict]:
+        """One row per stage in the order stages were first entered (nested stages after their parent)"""
+        with self._lock:
+            return [
+                {"stage": path, "calls": entry["calls"], "wall_seconds": round(entry["wall"], 6),
+                 "cpu_seconds": round(entry["cpu"], 6)}
+                for path, entry in self.stages.items() if path
+            ]
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            stages = {
+                path: {"calls": entry["calls"], "wall": round(entry["wall"], 6), "cpu": round(entry["cpu"], 6),
+                       "counters": dict(entry["counters"])}
+                for path, entry in self.stages.items() if path
+            }
+        profile = {"stages": stages, "counters": self.counters()}
+        if self.functions:
+            profile["cprofile"] = self.functions
+        if self.memory is not None:
+            profile["tracemalloc"] = self.memory
+        return profile
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
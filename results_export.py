@@ -0,0 +1,173 @@
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Iterable, List
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Without pyarrow only CSV and Excel can be written
+    pa = pq = None
+
+try:
+    import xlsxwriter
+except ImportError:  # openpyxl's write-only mode streams Excel without xlsxwriter
+    xlsxwriter = None
+
+EXPORT_FORMATS = ("csv", "parquet", "arrow", "xlsx")
+MIME_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+# Rows per worksheet; longer tables continue on "<sheet> (2)", "<sheet> (3)", ...
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def available_formats() -> List[str]:
+    """Return the export formats the installed packages can write"""
+    return [fmt for fmt in EXPORT_FORMATS if pa is not None or fmt not in ("parquet", "arrow")]
+
+
+def _excel_value(value):
+    """Convert a frame value to something both Excel writers accept (missing values become blank cells)"""
+    if value is None or (np.ndim(value) == 0 and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+@contextmanager
+def _binary_sink(target):
+    """Open a path for binary writing, or pass a binary file object through"""
+    if hasattr(target, 'write'):
+        yield target
+    else:
+        with open(target, 'wb') as f:
+            yield f
+
+
+def _write_csv(frames: Iterable[pd.DataFrame], target) -> int:
+    written = 0
+    header = True
+    with _binary_sink(target) as sink:
+        for frame in frames:
+            frame.to_csv(sink, index=False, header=header and not frame.columns.empty)
+            header = header and frame.columns.empty
+            written += len(frame)
+    return written
+
+
+def _write_arrow_batches(frames: Iterable[pd.DataFrame], open_writer) -> int:
+    """Convert frames to Arrow one at a time, all cast to the first frame's schema"""
+    written = 0
+    writer = schema = None
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = open_writer(schema)
+            writer.write_table(table)
+            written += len(frame)
+        if writer is None:
+            # No frames at all still produces a valid (empty) file
+            writer = open_writer(pa.schema([]))
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def _write_parquet(frames: Iterable[pd.DataFrame], target) -> int:
+    with _binary_sink(target) as sink:
+        return _write_arrow_batches(frames, lambda schema: pq.ParquetWriter(sink, schema))
+
+
+def _write_arrow(frames: Iterable[pd.DataFrame], target) -> int:
+    with _binary_sink(target) as sink:
+        return _write_arrow_batches(frames, lambda schema: pa.ipc.new_file(sink, schema))
+
+
+def _write_excel(frames: Iterable[pd.DataFrame], target, sheet_name: str) -> int:
+    """Stream rows into a workbook without keeping the sheets in memory"""
+    if xlsxwriter is not None:
+        # constant_memory flushes every row to a temporary file as soon as the next one starts
+        workbook = xlsxwriter.Workbook(target, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'nan_inf_to_errors': True,
+            'remove_timezone': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+        })
+        add_sheet = workbook.add_worksheet
+
+        def append(sheet, sheet_row, values):
+            sheet.write_row(sheet_row, 0, values)
+    else:
+        workbook = openpyxl.Workbook(write_only=True)
+        add_sheet = workbook.create_sheet
+
+        def append(sheet, sheet_row, values):
+            sheet.append(values)
+
+    written = 0
+    sheet = add_sheet(sheet_name)
+    header, sheet_rows, sheets = None, 0, 1
+    for frame in frames:
+        if header is None and not frame.columns.empty:
+            header = [_excel_value(name) for name in frame.columns]
+        for row in frame.itertuples(index=False, name=None):
+            if sheet_rows == EXCEL_MAX_ROWS:
+                sheets += 1
+                sheet = add_sheet(f"{sheet_name} ({sheets})")
+                sheet_rows = 0
+            if sheet_rows == 0:
+                # Every sheet of a long table repeats the header
+                append(sheet, 0, header)
+                sheet_rows = 1
+            append(sheet, sheet_rows, [_excel_value(value) for value in row])
+            sheet_rows += 1
+            written += 1
+
+    if xlsxwriter is not None:
+        workbook.close()
+    else:
+        workbook.save(target)
+    return written
+
+
+def write_frames(frames: Iterable[pd.DataFrame], target, fmt: str, sheet_name: str = "Sheet1") -> int:
+    """Stream frames with the same columns into one CSV/Parquet/Arrow/Excel file, returning the rows written
+
+    target is a path or a binary file object. Frames are written as they arrive,
+    so a generator of chunks is never held in memory at once. Like to_excel of
+    no records, an Excel file only gets a header once there is a row to write.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt not in available_formats():
+        raise ValueError(f"Writing {fmt} needs pyarrow, which is not installed")
+
+    if fmt == "csv":
+        return _write_csv(frames, target)
+    if fmt == "parquet":
+        return _write_parquet(frames, target)
+    if fmt == "arrow":
+        return _write_arrow(frames, target)
+    return _write_excel(frames, target, sheet_name)
+
+
+def export_bytes(frames: Iterable[pd.DataFrame], fmt: str, sheet_name: str = "Sheet1") -> bytes:
+    """Write frames to an in-memory file (e.g. for a download button) and return its bytes"""
+    buffer = BytesIO()
+    write_frames(frames, buffer, fmt, sheet_name)
+    return buffer.getvalue()
+
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+
+def normalize_resume_text(text: str) -> str:
+    """Normalize resume text for skill matching"""
+    return text.lower()
+
+
+class ResumeEntry:
+    """Resolved resume text with its normalized form"""
+
+    __slots__ = ("file_id", "text", "normalized")
+
+    def __init__(self, file_id: str, text: str):
+        self.file_id = file_id
+        self.text = text
+        self.normalized = normalize_resume_text(text)
+
+
+class ResumeCache:
+    """Size-bounded LRU cache of resumes keyed by Drive file ID, with an optional on-disk store"""
+
+    def __init__(self, max_entries: int = 4096, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, ResumeEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, file_id: str) -> bool:
+        # Membership checks do not touch the hit/miss counters
+        if file_id in self._entries:
+            return True
+        return bool(self.cache_dir) and os.path.exists(self._disk_path(file_id))
+
+    def _disk_path(self, file_id: str) -> str:
+        digest = hashlib.sha1(file_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _read_disk(self, file_id: str) -> Optional[ResumeEntry]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(file_id), encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored.get("file_id") != file_id:
+            return None
+        return ResumeEntry(file_id, stored["text"])
+
+    def _write_disk(self, entry: ResumeEntry):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(entry.file_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"file_id": entry.file_id, "text": entry.text}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk store is best effort, the in-memory entry is still valid
+            pass
+
+    def _remember(self, entry: ResumeEntry):
+        with self._lock:
+            self._entries[entry.file_id] = entry
+            self._entries.move_to_end(entry.file_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, file_id: str) -> Optional[ResumeEntry]:
+        """Return a cached resume, checking memory first and then the disk store"""
+        with self._lock:
+            entry = self._entries.get(file_id)
+            if entry is not None:
+                self._entries.move_to_end(file_id)
+                self.hits += 1
+                return entry
+
+        entry = self._read_disk(file_id)
+        if entry is not None:
+            self.disk_hits += 1
+            self._remember(entry)
+        return entry
+
+    def put(self, file_id: str, text: str) -> ResumeEntry:
+        """Store resume text and return its entry"""
+        entry = ResumeEntry(file_id, text)
+        self._remember(entry)
+        self._write_disk(entry)
+        return entry
+
+    def get_or_load(self, file_id: str, loader: Callable[[], str]) -> ResumeEntry:
+        """Return a cached resume, calling loader() to resolve it on a miss"""
+        entry = self.get(file_id)
+        if entry is None:
+            self.misses += 1
+            entry = self.put(file_id, loader())
+        return entry
+
+    def clear(self, include_disk: bool = False):
+        """Drop all in-memory entries (and the disk store if requested)"""
+        with self._lock:
+            self._entries.clear()
+        if include_disk and self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current size"""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries)
+        }
+
+
+class ResumeScans:
+    """Skill scan results per resume link, bounded like ResumeCache (least recently stored go first)
+
+    Each result is kept with a digest of the text it was found in, never the text itself.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._scans: "OrderedDict[str, Tuple[bytes, frozenset, frozenset]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._scans)
+
+    def get(self, resume_link: str) -> Optional[Tuple[bytes, frozenset, frozenset]]:
+        """Return (text digest, scanned patterns, found patterns) for a link, or None"""
+        with self._lock:
+            return self._scans.get(resume_link)
+
+    def put(self, resume_link: str, scan: Tuple[bytes, frozenset, frozenset]):
+        with self._lock:
+            self._scans[resume_link] = scan
+            self._scans.move_to_end(resume_link)
+            while len(self._scans) > self.max_entries:
+                self._scans.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._scans.clear()
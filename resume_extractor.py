@@ -0,0 +1,134 @@
+import io
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, Optional, Tuple
+from xml.etree import ElementTree
+
+# Files above this size are rejected instead of parsed
+MAX_RESUME_BYTES = 10 * 1024 * 1024
+
+# Only the first pages of a PDF are read
+MAX_RESUME_PAGES = 20
+
+# Extracted text is truncated to this many characters (caps DOCX and plain text too)
+MAX_RESUME_CHARS = 200_000
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class ResumeExtractionError(Exception):
+    """Raised when a resume file cannot be turned into text"""
+
+
+def detect_resume_format(data: bytes) -> str:
+    """Return 'pdf', 'docx', 'doc' or 'text' based on the file signature"""
+    if data.startswith(b'%PDF'):
+        return 'pdf'
+    if data.startswith(b'PK\x03\x04'):
+        return 'docx'
+    if data.startswith(b'\xd0\xcf\x11\xe0'):
+        return 'doc'
+    return 'text'
+
+
+def extract_pdf_text(data: bytes, max_pages: int = MAX_RESUME_PAGES) -> str:
+    """Extract the text of the first max_pages pages of a PDF"""
+    # Imported on first use, it is slow to import and most runs never see a PDF
+    try:
+        import pypdf
+    except ImportError:  # PDF resumes are reported as extraction errors without pypdf
+        raise ResumeExtractionError("pypdf is required to read PDF resumes")
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        pages = []
+        for page in reader.pages[:max_pages]:
+            pages.append(page.extract_text() or '')
+    except Exception as e:
+        raise ResumeExtractionError(f"Unreadable PDF: {e}") from e
+    return '\n'.join(pages)
+
+
+def extract_docx_text(data: bytes, max_chars: int = MAX_RESUME_CHARS) -> str:
+    """Extract paragraph text from a DOCX file, streaming its document XML"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            with archive.open('word/document.xml') as document:
+                paragraphs, current, length = [], [], 0
+                for event, element in ElementTree.iterparse(document, events=('end',)):
+                    if element.tag == WORD_NAMESPACE + 't' and element.text:
+                        current.append(element.text)
+                        length += len(element.text)
+                    elif element.tag == WORD_NAMESPACE + 'p':
+                        paragraphs.append(''.join(current))
+                        current = []
+                        element.clear()
+                    if length >= max_chars:
+                        break
+                paragraphs.append(''.join(current))
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        raise ResumeExtractionError(f"Unreadable DOCX: {e}") from e
+    return '\n'.join(paragraphs)
+
+
+def extract_resume_text(data: bytes, max_bytes: int = MAX_RESUME_BYTES,
+                        max_pages: int = MAX_RESUME_PAGES, max_chars: int = MAX_RESUME_CHARS) -> str:
+    """Turn downloaded resume bytes into plain text"""
+    if len(data) > max_bytes:
+        raise ResumeExtractionError(f"Resume is {len(data)} bytes, over the {max_bytes} byte limit")
+
+    resume_format = detect_resume_format(data)
+    if resume_format == 'pdf':
+        text = extract_pdf_text(data, max_pages)
+    elif resume_format == 'docx':
+        text = extract_docx_text(data, max_chars)
+    elif resume_format == 'doc':
+        raise ResumeExtractionError("Legacy .doc resumes are not supported")
+    else:
+        text = data.decode('utf-8', errors='replace')
+    return text[:max_chars]
+
+
+def _extract_job(file_id: str, data: bytes, max_bytes: int, max_pages: int,
+                 max_chars: int) -> Tuple[str, Optional[str], Optional[str]]:
+    """Worker entry point: return (file_id, text, error)"""
+    try:
+        return file_id, extract_resume_text(data, max_bytes, max_pages, max_chars), None
+    except ResumeExtractionError as e:
+        return file_id, None, str(e)
+
+
+class ResumeTextExtractor:
+    """Extract resume text in a process pool, streaming results as they complete"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_bytes: int = MAX_RESUME_BYTES,
+                 max_pages: int = MAX_RESUME_PAGES, max_chars: int = MAX_RESUME_CHARS):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+
+    def extract(self, data: bytes) -> str:
+        """Extract one resume in the current process"""
+        return extract_resume_text(data, self.max_bytes, self.max_pages, self.max_chars)
+
+    def iter_extract(self, files: Iterable[Tuple[str, bytes]]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """Yield (file_id, text, error) for each (file_id, data) pair as extraction finishes
+
+        files may be a generator (e.g. downloads still in progress); at most two
+        files per worker are in flight, so memory stays bounded.
+        """
+        max_in_flight = self.max_workers * 2
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            for file_id, data in files:
+                pending.add(executor.submit(_extract_job, file_id, data, self.max_bytes,
+                                            self.max_pages, self.max_chars))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
@@ -0,0 +1,231 @@
+import argparse
+import glob
+import os
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+
+class ResumeFetchError(Exception):
+    """Raised when a resume cannot be downloaded"""
+
+
+class FetchResult:
+    """Outcome of fetching one resume"""
+
+    __slots__ = ("file_id", "data", "error", "attempts", "elapsed")
+
+    def __init__(self, file_id: str, data: Optional[bytes] = None, error: Optional[str] = None,
+                 attempts: int = 0, elapsed: float = 0.0):
+        self.file_id = file_id
+        self.data = data
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ResumeBackend:
+    """Source of resume files, addressed by Drive file ID"""
+
+    def host_for(self, file_id: str) -> str:
+        """Return the host a request for file_id goes to (used for rate limiting)"""
+        return "default"
+
+    def fetch(self, file_id: str, timeout: float) -> bytes:
+        """Return the raw bytes of a resume, raising ResumeFetchError on failure"""
+        raise NotImplementedError
+
+
+class GoogleDriveBackend(ResumeBackend):
+    """Download publicly shared resumes from Google Drive"""
+
+    DOWNLOAD_URL = "https://drive.google.com/uc?export=download&id={file_id}"
+
+    def __init__(self, session: "requests.Session" = None):
+        # requests is imported here, not at module level, so the matching engine starts faster
+        import requests
+        
+        self.session = session or requests.Session()
+
+    def host_for(self, file_id: str) -> str:
+        return "drive.google.com"
+
+    def fetch(self, file_id: str, timeout: float) -> bytes:
+        import requests
+        
+        try:
+            response = self.session.get(self.DOWNLOAD_URL.format(file_id=file_id), timeout=timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise ResumeFetchError(str(e)) from e
+        return response.content
+
+
+class LocalDirectoryBackend(ResumeBackend):
+    """Read resumes from a local directory of files named after their Drive file ID"""
+
+    # Probed in the order a sorted glob would return them
+    EXTENSIONS = ("", ".docx", ".pdf", ".txt")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def host_for(self, file_id: str) -> str:
+        return "local"
+
+    def fetch(self, file_id: str, timeout: float) -> bytes:
+        # Accept both "<file_id>" and "<file_id>.<extension>"; common extensions are probed
+        # directly, since globbing lists the whole directory for every resume
+        base_path = os.path.join(self.directory, file_id)
+        paths = [path for path in (base_path + extension for extension in self.EXTENSIONS) if os.path.isfile(path)]
+        if not paths:
+            paths = sorted(glob.glob(os.path.join(glob.escape(self.directory), glob.escape(file_id) + '.*')))
+        if not paths:
+            raise ResumeFetchError(f"No resume file for {file_id} in {self.directory}")
+        with open(paths[0], 'rb') as f:
+            return f.read()
+
+
+class FakeHTTPBackend(ResumeBackend):
+    """Offline stand-in for a remote backend with configurable latency and failures"""
+
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.0, hosts: int = 1,
+                 seed: Optional[int] = None, documents: Dict[str, bytes] = None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.hosts = hosts
+        self.documents = documents or {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def host_for(self, file_id: str) -> str:
+        return f"fake-{zlib.crc32(file_id.encode('utf-8')) % self.hosts}"
+
+    def fetch(self, file_id: str, timeout: float) -> bytes:
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+        if self.latency > timeout:
+            time.sleep(timeout)
+            raise ResumeFetchError(f"Timed out after {timeout}s")
+        time.sleep(self.latency)
+        if failed:
+            raise ResumeFetchError(f"Simulated failure for {file_id}")
+        return self.documents.get(file_id, f"Resume content from Drive ID: {file_id}".encode('utf-8'))
+
+
+class HostRateLimiter:
+    """Limit the number of requests started per second for each host"""
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str):
+        """Block until a request to host may start"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ResumeFetcher:
+    """Fetch many resumes concurrently with retries, timeouts and per-host rate limiting"""
+
+    def __init__(self, backend: ResumeBackend, max_workers: int = 8, retries: int = 2,
+                 timeout: float = 15.0, rate_limit: Optional[float] = None, backoff: float = 0.5):
+        self.backend = backend
+        self.max_workers = max_workers
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.rate_limiter = HostRateLimiter(rate_limit)
+
+    def fetch(self, file_id: str) -> FetchResult:
+        """Fetch one resume, retrying failed attempts with exponential backoff"""
+        start = time.perf_counter()
+        host = self.backend.host_for(file_id)
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            self.rate_limiter.acquire(host)
+            try:
+                data = self.backend.fetch(file_id, self.timeout)
+                return FetchResult(file_id, data=data, attempts=attempt + 1,
+                                   elapsed=time.perf_counter() - start)
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+        return FetchResult(file_id, error=error, attempts=self.retries + 1,
+                           elapsed=time.perf_counter() - start)
+
+    def iter_fetch(self, file_ids: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch each distinct file ID, yielding results as they complete
+
+        file_ids may be a generator; at most two downloads per worker are in flight or
+        waiting to be yielded, so memory stays bounded however many files there are.
+        """
+        max_in_flight = self.max_workers * 2
+        seen = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            for file_id in file_ids:
+                if file_id in seen:
+                    continue
+                seen.add(file_id)
+                pending.add(executor.submit(self.fetch, file_id))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def fetch_all(self, file_ids: Iterable[str]) -> Dict[str, FetchResult]:
+        """Fetch each distinct file ID and return the results keyed by file ID"""
+        return {result.file_id: result for result in self.iter_fetch(file_ids)}
+
+
+def main():
+    """Benchmark the fetch pipeline offline against the fake backend"""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent resume fetching")
+    parser.add_argument("--files", type=int, default=1000, help="Number of resumes to fetch")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per request")
+    parser.add_argument("--failure-rate", type=float, default=0.02, help="Simulated failure probability")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent requests")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second per host")
+    parser.add_argument("--hosts", type=int, default=1, help="Number of simulated hosts")
+    args = parser.parse_args()
+
+    backend = FakeHTTPBackend(latency=args.latency, failure_rate=args.failure_rate,
+                              hosts=args.hosts, seed=0)
+    fetcher = ResumeFetcher(backend, max_workers=args.workers, rate_limit=args.rate_limit, backoff=0.01)
+
+    start = time.perf_counter()
+    results = fetcher.fetch_all(f"resume_{i}" for i in range(args.files))
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for result in results.values() if not result.ok)
+    print(f"Fetched {len(results) - failed}/{len(results)} resumes in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.0f} resumes/s, {failed} failed)")
+    print(f"Sequential estimate: {args.files * args.latency:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
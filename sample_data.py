@@ -1,9 +1,223 @@
+import argparse
+import os
+import re
+from typing import Iterator, Tuple
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-def create_sample_companies_data():
-    """Create sample companies data"""
+# Core skills of each field of study; generated candidates and roles draw most skills from their field
+FIELD_SKILLS = {
+    'Computer Science': ['Python', 'Java', 'JavaScript', 'SQL', 'Git', 'C++', 'Data Structures', 'Algorithms'],
+    'Software Engineering': ['Java', 'Python', 'Git', 'Spring Boot', 'JavaScript', 'SQL', 'Docker', 'Agile'],
+    'Information Technology': ['Linux', 'Networking', 'SQL', 'Python', 'Cloud Computing', 'Git', 'Windows Server'],
+    'Data Science': ['Python', 'R', 'SQL', 'Machine Learning', 'Statistics', 'Pandas', 'Tableau'],
+    'Artificial Intelligence': ['Python', 'TensorFlow', 'PyTorch', 'Deep Learning', 'Machine Learning',
+                                'Statistics', 'NLP', 'Computer Vision'],
+    'Cybersecurity': ['Cybersecurity', 'Network Security', 'Linux', 'Python', 'Cryptography', 'Penetration Testing'],
+    'Cloud Computing': ['AWS', 'Azure', 'Docker', 'Kubernetes', 'Linux', 'Python', 'Terraform'],
+    'Web Development': ['JavaScript', 'React', 'HTML', 'CSS', 'Node.js', 'Git', 'TypeScript'],
+    'Mobile Development': ['React Native', 'Kotlin', 'Swift', 'JavaScript', 'Mobile Development', 'Git', 'Flutter'],
+    'Electrical Engineering': ['MATLAB', 'Embedded Systems', 'C', 'Circuit Design', 'PLC', 'IoT', 'Power Systems'],
+    'Electronics and Communication': ['VLSI', 'Embedded Systems', 'C', 'MATLAB', 'Signal Processing', 'IoT',
+                                      'Verilog'],
+    'Mechanical Engineering': ['AutoCAD', 'SolidWorks', 'MATLAB', 'ANSYS', 'Thermodynamics', 'CAD'],
+    'Finance': ['Excel', 'Financial Modeling', 'SQL', 'Python', 'Statistics', 'Accounting'],
+    'Business Administration': ['Excel', 'Business Analysis', 'Project Management', 'Communication', 'SQL',
+                                'Power BI']
+}
+
+# Share of registrations per field (IEEE registrations lean heavily to computing and electronics)
+FIELD_WEIGHTS = {
+    'Computer Science': 0.22, 'Software Engineering': 0.08, 'Information Technology': 0.09, 'Data Science': 0.07,
+    'Artificial Intelligence': 0.06, 'Cybersecurity': 0.04, 'Cloud Computing': 0.03, 'Web Development': 0.04,
+    'Mobile Development': 0.02, 'Electrical Engineering': 0.11, 'Electronics and Communication': 0.12,
+    'Mechanical Engineering': 0.06, 'Finance': 0.03, 'Business Administration': 0.03
+}
+
+# Registrations per country, mostly Region 10 (Asia Pacific)
+COUNTRY_WEIGHTS = {
+    'India': 0.42, 'Sri Lanka': 0.07, 'Bangladesh': 0.06, 'Malaysia': 0.06, 'Singapore': 0.05, 'Australia': 0.05,
+    'Indonesia': 0.04, 'Philippines': 0.04, 'Japan': 0.04, 'Pakistan': 0.03, 'New Zealand': 0.02, 'USA': 0.04,
+    'UK': 0.02, 'Canada': 0.01, 'Germany': 0.01
+}
+
+DEGREE_LEVELS = {'Bachelor of': 0.68, 'Master of': 0.28, 'PhD in': 0.04}
+
+FIELD_ROLES = {
+    'Computer Science': ['Software Engineer', 'Backend Developer', 'Graduate Engineering Trainee'],
+    'Software Engineering': ['Software Engineering Trainee', 'Java Developer', 'QA Engineer'],
+    'Information Technology': ['IT Support Engineer', 'Systems Administrator', 'Network Engineer'],
+    'Data Science': ['Data Scientist', 'Data Analyst', 'Junior Analyst'],
+    'Artificial Intelligence': ['Machine Learning Engineer', 'AI Research Intern', 'Computer Vision Engineer'],
+    'Cybersecurity': ['Security Analyst', 'SOC Analyst', 'Penetration Tester'],
+    'Cloud Computing': ['Cloud Architect', 'DevOps Engineer', 'Site Reliability Engineer'],
+    'Web Development': ['Frontend Developer', 'Full Stack Developer', 'Web Developer'],
+    'Mobile Development': ['Mobile App Developer', 'Android Developer', 'iOS Developer'],
+    'Electrical Engineering': ['Electrical Design Engineer', 'Power Systems Engineer', 'Automation Engineer'],
+    'Electronics and Communication': ['Embedded Engineer', 'VLSI Design Engineer', 'RF Engineer'],
+    'Mechanical Engineering': ['Design Engineer', 'Production Engineer', 'CAE Analyst'],
+    'Finance': ['Financial Analyst', 'Risk Analyst', 'Quantitative Analyst'],
+    'Business Administration': ['Business Analyst', 'Product Analyst', 'Management Trainee']
+}
+
+COMPANY_PREFIXES = ['Tech', 'Data', 'Cloud', 'Cyber', 'Fin', 'Nova', 'Quantum', 'Blue', 'Apex', 'Bright', 'Vertex',
+                    'Green', 'Smart', 'Next', 'Prime', 'Infini']
+COMPANY_SUFFIXES = ['Corp', 'Systems', 'Solutions', 'Labs', 'Works', 'Technologies', 'Global', 'Networks', 'Analytics',
+                    'Dynamics']
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rahul', 'Ananya', 'Arjun', 'Divya', 'Karthik', 'Meera', 'Nimal', 'Tharushi',
+               'Farhan', 'Nusrat', 'Wei', 'Mei', 'Hiroshi', 'Yuki', 'Siti', 'Ahmad', 'Maria', 'Jose', 'John', 'Sarah',
+               'Michael', 'Emily', 'David', 'Aisha', 'Omar', 'Lakshmi', 'Vikram', 'Sneha']
+LAST_NAMES = ['Sharma', 'Patel', 'Kumar', 'Singh', 'Reddy', 'Nair', 'Perera', 'Fernando', 'Rahman', 'Hossain', 'Tan',
+              'Lim', 'Sato', 'Tanaka', 'Abdullah', 'Santos', 'Reyes', 'Smith', 'Johnson', 'Chen', 'Wilson', 'Khan',
+              'Iyer', 'Das', 'Gupta', 'Silva', 'Wong', 'Ali', 'Menon', 'Bose']
+
+# Share of skill choices drawn from the field's core skills (the rest follow overall popularity)
+CORE_SKILL_SHARE = 0.8
+
+# Generated roles are grouped into companies of this many consecutive rows
+ROLES_PER_COMPANY = 3
+
+# Chance a declared skill is also written in the generated resume
+RESUME_SKILL_RATE = 0.85
+
+RESUME_PROJECTS = ['Built a {0} dashboard for a student branch event',
+                   'Developed a capstone project using {0} and {1}',
+                   'Completed an internship applying {0} to production workloads',
+                   'Led a {0} workshop for IEEE student members',
+                   'Published a paper on {0} at a regional conference']
+
+# Rows generated per vectorized batch
+GENERATION_BATCH = 100_000
+
+
+def _weights(table: dict) -> Tuple[list, np.ndarray]:
+    keys = list(table)
+    weights = np.array([table[key] for key in keys], dtype=float)
+    return keys, weights / weights.sum()
+
+def _skill_distributions(fields: list) -> Tuple[list, np.ndarray]:
+    """Return the skill list and a (field x skill) probability table mixing core skills with overall popularity"""
+    skills = sorted({skill for field in fields for skill in FIELD_SKILLS[field]})
+    index = {skill: i for i, skill in enumerate(skills)}
+    core = np.zeros((len(fields), len(skills)))
+    for row, field in enumerate(fields):
+        core[row, [index[skill] for skill in FIELD_SKILLS[field]]] = 1.0
+    core /= core.sum(axis=1, keepdims=True)
+    # Popularity: skills shared by many fields (Python, SQL, Git) are the most common overall
+    popularity = core.sum(axis=0)
+    popularity /= popularity.sum()
+    return skills, CORE_SKILL_SHARE * core + (1 - CORE_SKILL_SHARE) * popularity
+
+def _sample_skill_order(rng: np.random.Generator, probabilities: np.ndarray) -> np.ndarray:
+    """Order skills per row as a weighted draw without replacement (Gumbel top-k), most likely first"""
+    with np.errstate(divide='ignore'):
+        keys = np.log(probabilities) + rng.gumbel(size=probabilities.shape)
+    return np.argsort(-keys, axis=1)
+
+def _join_skills(order: np.ndarray, counts: np.ndarray, skills: list) -> list:
+    return [', '.join(skills[i] for i in row[:count]) for row, count in zip(order.tolist(), counts.tolist())]
+
+def _company_name(company: int) -> str:
+    prefix = COMPANY_PREFIXES[company % len(COMPANY_PREFIXES)]
+    suffix = COMPANY_SUFFIXES[(company // len(COMPANY_PREFIXES)) % len(COMPANY_SUFFIXES)]
+    series = company // (len(COMPANY_PREFIXES) * len(COMPANY_SUFFIXES))
+    return f"{prefix}{suffix}" + (f" {series + 1}" if series else "")
+
+def _generate_companies(n_roles: int, seed: int) -> pd.DataFrame:
+    """Generate n_roles roles with field-specific skills, degrees and a country mix"""
+    rng = np.random.default_rng([seed, 1])
+    fields, field_p = _weights(FIELD_WEIGHTS)
+    countries, country_p = _weights(COUNTRY_WEIGHTS)
+    skills, skill_p = _skill_distributions(fields)
+    
+    frames = []
+    for start in range(0, n_roles, GENERATION_BATCH):
+        size = min(GENERATION_BATCH, n_roles - start)
+        field = rng.choice(len(fields), size, p=field_p)
+        order = _sample_skill_order(rng, skill_p[field])
+        skill_counts = rng.integers(3, 7, size)
+        # Roles accept their own field and up to two others
+        degree_order = _sample_skill_order(rng, np.tile(field_p, (size, 1)))
+        frames.append(pd.DataFrame({
+            'Company Name': [_company_name(row // ROLES_PER_COMPANY) for row in range(start, start + size)],
+            'Role': [FIELD_ROLES[fields[f]][r] for f, r in zip(field.tolist(), rng.integers(0, 3, size).tolist())],
+            'Required Skills': _join_skills(order, skill_counts, skills),
+            'Eligible Degrees': [
+                ', '.join(dict.fromkeys([fields[f]] + [fields[d] for d in row[:extra]]))
+                for f, row, extra in zip(field.tolist(), degree_order.tolist(), rng.integers(0, 3, size).tolist())
+            ],
+            'Country': np.array(countries, dtype=object)[rng.choice(len(countries), size, p=country_p)],
+            'Requirement Count': np.minimum(rng.geometric(0.4, size), 10)
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=['Company Name', 'Role', 'Required Skills', 'Eligible Degrees', 'Country', 'Requirement Count'])
+
+def _generate_candidates(n_candidates: int, seed: int) -> pd.DataFrame:
+    """Generate n_candidates registrations with field-specific skills and a country and degree mix"""
+    rng = np.random.default_rng([seed, 2])
+    fields, field_p = _weights(FIELD_WEIGHTS)
+    countries, country_p = _weights(COUNTRY_WEIGHTS)
+    levels, level_p = _weights(DEGREE_LEVELS)
+    skills, skill_p = _skill_distributions(fields)
+    
+    frames = []
+    for start in range(0, n_candidates, GENERATION_BATCH):
+        size = min(GENERATION_BATCH, n_candidates - start)
+        field = rng.choice(len(fields), size, p=field_p)
+        level = rng.choice(len(levels), size, p=level_p)
+        order = _sample_skill_order(rng, skill_p[field])
+        first = rng.integers(0, len(FIRST_NAMES), size)
+        last = rng.integers(0, len(LAST_NAMES), size)
+        frames.append(pd.DataFrame({
+            'Name': [f"{FIRST_NAMES[a]} {LAST_NAMES[b]}" for a, b in zip(first.tolist(), last.tolist())],
+            'Country': np.array(countries, dtype=object)[rng.choice(len(countries), size, p=country_p)],
+            'Degree': [f"{levels[l]} {fields[f]}" for l, f in zip(level.tolist(), field.tolist())],
+            'Skills': _join_skills(order, rng.integers(3, 9, size), skills),
+            'Resume Link': [f'https://drive.google.com/file/d/sample_resume_{i + 1}/view'
+                            for i in range(start, start + size)]
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=['Name', 'Country', 'Degree', 'Skills', 'Resume Link'])
+
+def create_sample_resumes(candidates_df: pd.DataFrame, seed: int = 0) -> Iterator[Tuple[str, str]]:
+    """Yield (file_id, text) resumes for sample candidates, mentioning most declared skills and a few extra ones"""
+    rng = np.random.default_rng([seed, 3])
+    field_names = sorted(FIELD_SKILLS, key=len, reverse=True)
+    for name, degree, skills, link in zip(candidates_df['Name'], candidates_df['Degree'],
+                                          candidates_df['Skills'], candidates_df['Resume Link']):
+        match = re.search(r'/d/([^/]+)', str(link))
+        if not match:
+            continue
+        declared = [skill.strip() for skill in str(skills).split(',') if skill.strip()]
+        field = next((field for field in field_names if field in str(degree)), None)
+        undeclared = [skill for skill in FIELD_SKILLS.get(field, []) if skill not in declared]
+        mentioned = [skill for skill in declared if rng.random() < RESUME_SKILL_RATE]
+        if undeclared:
+            extra = rng.choice(len(undeclared), min(len(undeclared), rng.integers(0, 4)), replace=False)
+            mentioned += [undeclared[i] for i in extra]
+        project = RESUME_PROJECTS[rng.integers(0, len(RESUME_PROJECTS))]
+        lines = [name, degree, '', 'Technical Skills: ' + ', '.join(mentioned), '', 'Experience']
+        if mentioned:
+            lines.append(project.format(*rng.choice(mentioned, 2, replace=len(mentioned) < 2)))
+        yield match.group(1), '\n'.join(lines) + '\n'
+
+def write_sample_resumes(candidates_df: pd.DataFrame, directory: str, seed: int = 0) -> int:
+    """Write sample resumes as <file_id>.txt files (readable by LocalDirectoryBackend), returning the count"""
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for file_id, text in create_sample_resumes(candidates_df, seed):
+        with open(os.path.join(directory, f'{file_id}.txt'), 'w', encoding='utf-8') as f:
+            f.write(text)
+        count += 1
+    return count
+
+def create_sample_companies_data(n_roles: int = None, seed: int = 0):
+    """Create sample companies data (the 8 example roles, or n_roles generated ones)"""
+    if n_roles is not None:
+        return _generate_companies(n_roles, seed)
     companies_data = {
         'Company Name': [
             'TechCorp Inc',
@@ -60,8 +274,10 @@ def create_sample_companies_data():
     
     return pd.DataFrame(companies_data)
 
-def create_sample_candidates_data():
-    """Create sample candidates data"""
+def create_sample_candidates_data(n_candidates: int = None, seed: int = 0):
+    """Create sample candidates data (the 15 example candidates, or n_candidates generated ones)"""
+    if n_candidates is not None:
+        return _generate_candidates(n_candidates, seed)
     candidates_data = {
         'Name': [
             'John Smith',
@@ -152,11 +368,12 @@ def create_sample_candidates_data():
     
     return pd.DataFrame(candidates_data)
 
-def generate_sample_files():
-    """Generate sample Excel files"""
+def generate_sample_files(n_roles: int = None, n_candidates: int = None, seed: int = 0,
+                          resume_dir: str = None):
+    """Generate sample Excel files (and optionally a directory of sample resumes)"""
     # Create sample data
-    companies_df = create_sample_companies_data()
-    candidates_df = create_sample_candidates_data()
+    companies_df = create_sample_companies_data(n_roles, seed)
+    candidates_df = create_sample_candidates_data(n_candidates, seed)
     
     # Generate timestamp for unique filenames
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -171,8 +388,19 @@ def generate_sample_files():
     print(f"✅ Sample files generated:")
     print(f"   - {companies_filename}")
     print(f"   - {candidates_filename}")
+    if resume_dir:
+        print(f"   - {write_sample_resumes(candidates_df, resume_dir, seed)} resumes in {resume_dir}")
     
     return companies_filename, candidates_filename
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate sample companies and candidates workbooks")
+    parser.add_argument("--roles", type=int, help="Generate this many roles instead of the 8 examples")
+    parser.add_argument("--candidates", type=int, help="Generate this many candidates instead of the 15 examples")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for generated data")
+    parser.add_argument("--resume-dir", help="Also write a text resume per candidate to this directory")
+    args = parser.parse_args()
+    generate_sample_files(args.roles, args.candidates, args.seed, args.resume_dir)
+
 if __name__ == "__main__":
-    generate_sample_files() 
\ No newline at end of file
+    main()
@@ -6,6 +6,8 @@ class JobMatchingSystem {
         this.candidatesData = null;
         this.results = [];
         this.charts = {};
+        // Optional matching engine endpoint (python matching_engine.py serve), e.g. ?api=http://127.0.0.1:8765
+        this.apiUrl = new URLSearchParams(window.location.search).get('api') || window.MATCHING_API_URL || null;
         
         this.initializeEventListeners();
     }
@@ -206,10 +208,14 @@ class JobMatchingSystem {
         this.showLoading(true);
         
         try {
-            // Simulate processing time
-            await new Promise(resolve => setTimeout(resolve, 2000));
-            
-            this.results = this.matchCandidatesToJobs();
+            if (this.apiUrl) {
+                this.results = await this.matchViaApi();
+            } else {
+                // Simulate processing time
+                await new Promise(resolve => setTimeout(resolve, 2000));
+                
+                this.results = this.matchCandidatesToJobs();
+            }
             this.displayResults();
             this.showLoading(false);
             
@@ -222,6 +228,30 @@ class JobMatchingSystem {
         }
     }
 
+    async matchViaApi() {
+        const response = await fetch(`${this.apiUrl.replace(/\/$/, '')}/match`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ companies: this.companiesData, candidates: this.candidatesData })
+        });
+        const payload = await response.json();
+        if (!response.ok) {
+            throw new Error(payload.error || `Matching service returned ${response.status}`);
+        }
+        
+        return payload.results.map(row => ({
+            companyName: row['Company Name'],
+            role: row['Role'],
+            requiredSkills: row['Required Skills'],
+            eligibleDegrees: row['Eligible Degrees'],
+            eligibleStudents: row['Eligible Students (Partial List)'],
+            requirementCount: row['Requirement Count'],
+            candidatesCount: row['Candidates Count'],
+            country: row['Country'],
+            topCandidateMatch: row['Top Candidate Match %']
+        }));
+    }
+
     matchCandidatesToJobs() {
         const results = [];
         
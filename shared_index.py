@@ -0,0 +1,141 @@
+import threading
+import weakref
+from typing import Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from degree_index import DegreeIndex
+from resume_cache import ResumeScans
+from vocabulary import Vocabulary
+
+
+class SharedIndex:
+    """Parsed companies and candidates tables with the vocabularies and indexes derived from them
+
+    Built by JobMatchingSystem.build_shared_index, which interns every term of both tables up
+    front: matching the same tables again only looks terms up, so engines attached with
+    use_shared_index never change it. The exception is resume scans, which grow one link at a time.
+    """
+
+    def __init__(self, companies: pd.DataFrame, candidates: pd.DataFrame, skill_vocabulary: Vocabulary,
+                 degree_vocabulary: Vocabulary, degree_index: DegreeIndex, country_index: Dict[str, np.ndarray]):
+        self.companies = companies
+        self.candidates = candidates
+        self.skill_vocabulary = skill_vocabulary
+        self.degree_vocabulary = degree_vocabulary
+        self.degree_index = degree_index
+        self.country_index = country_index
+        # Per-link resume scan results, shared by every engine attached to this index
+        self.resume_scans = ResumeScans()
+
+
+class SharedHandle:
+    """One holder's reference to a shared resource; the resource is evicted once every handle is released
+
+    A handle releases itself when garbage collected, e.g. when a Streamlit session ends.
+    """
+
+    def __init__(self, registry: "SharedRegistry", key: Hashable, value, reused: bool):
+        self.key = key
+        self.value = value
+        # True if the resource was already built (by this or another holder) when acquired
+        self.reused = reused
+        self._finalizer = weakref.finalize(self, registry._release, key)
+
+    @property
+    def released(self) -> bool:
+        return not self._finalizer.alive
+
+    def release(self):
+        """Drop this reference (releasing twice does nothing)"""
+        self._finalizer()
+
+
+class _Entry:
+    __slots__ = ("value", "built", "refs", "lock")
+
+    def __init__(self):
+        self.value = None
+        self.built = False
+        self.refs = 0
+        self.lock = threading.Lock()
+
+
+class SharedRegistry:
+    """Process-wide resources built once per key and reference counted by the handles holding them
+
+    Concurrent acquires of a key wait for a single build. A failed build, one that raises or
+    returns None, is not kept: the next acquire of the key builds again (and reports the failure again).
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.reuses = 0
+        self.evictions = 0
+
+    def acquire(self, key: Hashable, build: Callable[[], object]) -> Optional[SharedHandle]:
+        """Return a handle to the resource for key, calling build() if no holder has it yet
+
+        Returns None, holding nothing, if build() returns None.
+        """
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry())
+            # Counted before building, so the entry outlives a concurrent release
+            entry.refs += 1
+        try:
+            with entry.lock:
+                reused = entry.built
+                if not reused:
+                    entry.value = build()
+                    entry.built = entry.value is not None
+        except BaseException:
+            self._release(key)
+            raise
+        if not entry.built:
+            self._release(key)
+            return None
+        with self._lock:
+            if reused:
+                self.reuses += 1
+            else:
+                self.builds += 1
+        return SharedHandle(self, key, entry.value, reused)
+
+    def replace(self, handle: Optional[SharedHandle], key: Hashable,
+                build: Callable[[], object]) -> Optional[SharedHandle]:
+        """Acquire key and release handle, unless handle already holds key (None if the build fails)"""
+        if handle is not None and handle.key == key and not handle.released:
+            return handle
+        new_handle = self.acquire(key, build)
+        if handle is not None:
+            handle.release()
+        return new_handle
+
+    def _release(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0:
+                del self._entries[key]
+                if entry.built:
+                    self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of live resources and references, with build/reuse/eviction counters"""
+        with self._lock:
+            return {
+                "resources": len(self._entries),
+                "references": sum(entry.refs for entry in self._entries.values()),
+                "builds": self.builds,
+                "reuses": self.reuses,
+                "evictions": self.evictions
+            }
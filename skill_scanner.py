@@ -0,0 +1,127 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+try:
+    import ahocorasick
+except ImportError:  # Optional C implementation, the pure Python automaton is used otherwise
+    ahocorasick = None
+
+
+def is_word_char(char: str) -> bool:
+    """Return True for characters that can be part of a word"""
+    return char.isalnum() or char == '_'
+
+
+class SkillScanner:
+    """Find many skills in a text in a single pass (Aho-Corasick automaton)"""
+
+    def __init__(self, skills: Iterable[str], word_boundary: bool = False,
+                 whole_word_skills: Iterable[str] = ()):
+        self.word_boundary = word_boundary
+
+        # Patterns are matched case-insensitively, duplicates share one ID
+        self.patterns: List[str] = []
+        self.pattern_ids: Dict[str, int] = {}
+        for skill in skills:
+            pattern = str(skill).lower().strip()
+            if pattern and pattern not in self.pattern_ids:
+                self.pattern_ids[pattern] = len(self.patterns)
+                self.patterns.append(pattern)
+
+        # Extra patterns that always match whole words only (e.g. short aliases such as "ml")
+        self.whole_word_ids = set()
+        for skill in whole_word_skills:
+            pattern = str(skill).lower().strip()
+            if pattern and pattern not in self.pattern_ids:
+                self.pattern_ids[pattern] = len(self.patterns)
+                self.whole_word_ids.add(len(self.patterns))
+                self.patterns.append(pattern)
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for pattern_id, pattern in enumerate(self.patterns):
+                self._automaton.add_word(pattern, pattern_id)
+            if self.patterns:
+                self._automaton.make_automaton()
+        else:
+            self._build_automaton()
+
+    def _build_automaton(self):
+        """Build the goto, failure and output tables for the pure Python scanner"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        # Breadth-first pass sets each state's failure link and inherits its outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _iter_matches(self, text: str):
+        """Yield (end_index, pattern_id) for every occurrence of every pattern"""
+        if not self.patterns:
+            return
+        if ahocorasick is not None:
+            yield from self._automaton.iter(text)
+            return
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield index, pattern_id
+
+    def _on_boundary(self, text: str, end: int, pattern: str) -> bool:
+        """Check that a match is not part of a longer word (e.g. "r" in "framework")"""
+        start = end - len(pattern) + 1
+        if is_word_char(pattern[0]) and start > 0 and is_word_char(text[start - 1]):
+            return False
+        if is_word_char(pattern[-1]) and end + 1 < len(text) and is_word_char(text[end + 1]):
+            return False
+        return True
+
+    def scan(self, text: str, normalized: bool = False) -> Set[int]:
+        """Return the IDs of all patterns found in text (already lowercased if normalized)"""
+        if not text:
+            return set()
+
+        if not normalized:
+            text = text.lower()
+        found = set()
+        for end, pattern_id in self._iter_matches(text):
+            if pattern_id in found:
+                continue
+            if ((self.word_boundary or pattern_id in self.whole_word_ids)
+                    and not self._on_boundary(text, end, self.patterns[pattern_id])):
+                continue
+            found.add(pattern_id)
+            if len(found) == len(self.patterns):
+                break
+        return found
+
+    def find(self, text: str, normalized: bool = False) -> Set[str]:
+        """Return the patterns found in text"""
+        return {self.patterns[pattern_id] for pattern_id in self.scan(text, normalized)}
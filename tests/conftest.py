@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# The modules and sample workbooks live at the repository root, next to this folder
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from matching_engine import JobMatchingSystem  # noqa: E402
+from resume_extractor import ResumeTextExtractor  # noqa: E402
+from resume_fetcher import FakeHTTPBackend, ResumeFetcher  # noqa: E402
+
+
+def drive_link(file_id: str) -> str:
+    return f"https://drive.google.com/file/d/{file_id}/view"
+
+
+def _edit_candidate_skills(companies, candidates):
+    candidates = candidates.copy()
+    candidates.loc[3, "Skills"] = "Python, SQL, Machine Learning"
+    return companies, candidates
+
+
+def _add_candidate(companies, candidates):
+    return companies, pd.concat([candidates, candidates.iloc[[5]].assign(Name="New Candidate")], ignore_index=True)
+
+
+def _edit_role(companies, candidates):
+    companies = companies.copy()
+    companies.loc[2, "Required Skills"] = "Java, Spring, SQL"
+    return companies, candidates
+
+
+def _move_candidate(companies, candidates):
+    candidates = candidates.copy()
+    candidates.loc[8, "Country"] = "Pakistan"
+    return companies, candidates
+
+
+def _drop_last_candidate(companies, candidates):
+    return companies, candidates.iloc[:-1]
+
+
+# Sheet edits applied one after another by the incremental matching and saving tests
+SAMPLE_EDITS = [_edit_candidate_skills, _add_candidate, _edit_role, _move_candidate, _drop_last_candidate]
+
+
+@pytest.fixture
+def sample():
+    """Generated companies, candidates and their resumes ({file_id: text})"""
+    from sample_data import create_sample_candidates_data, create_sample_companies_data, create_sample_resumes
+
+    companies = create_sample_companies_data(20, seed=7)
+    candidates = create_sample_candidates_data(200, seed=7)
+    return companies, candidates, dict(create_sample_resumes(candidates, seed=7))
+
+
+@pytest.fixture
+def make_engine():
+    """Build an engine over companies/candidates rows whose resumes are served from {file_id: text}"""
+    def make(companies, candidates, resumes=None, **options):
+        documents = {file_id: text.encode('utf-8') for file_id, text in (resumes or {}).items()}
+        engine = JobMatchingSystem(
+            resume_fetcher=ResumeFetcher(FakeHTTPBackend(latency=0, documents=documents), max_workers=2),
+            resume_extractor=ResumeTextExtractor(max_workers=1),
+            score_workers=1,
+            **options
+        )
+        engine.companies_data = pd.DataFrame(companies)
+        engine.candidates_data = pd.DataFrame(candidates)
+        return engine
+    return make
@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import REPO
+from matching_engine import DRIVE_FILE_ID_PATTERN
+
+# Bundled (companies, candidates) sheets, and the baseline results expected for them in tests/data.
+# The expected results were produced by the original pair-by-pair JobMatchingSystem (before the
+# legacy and vectorized engines), its resume lookup answering with resume_text below.
+SHEETS = {
+    "sample": ("sample_companies_20250803_132233.xlsx", "sample_candidates_20250803_132233.xlsx"),
+    "converted": ("converted_companies.xlsx", "converted_candidates.xlsx")
+}
+
+
+def load_sheets(name):
+    companies_file, candidates_file = SHEETS[name]
+    companies = pd.read_excel(os.path.join(REPO, companies_file))
+    candidates = pd.read_excel(os.path.join(REPO, candidates_file))
+    # The original loop only read "/d/<id>" links
+    candidates["Resume Link"] = candidates["Resume Link"].str.replace(r"open\?id=([\w-]+)", r"file/d/\1/view",
+                                                                      regex=True)
+    return companies, candidates
+
+
+def resume_text(row: int, candidate) -> str:
+    """A resume naming the candidate's declared skills, all but the last one on odd rows"""
+    skills = [skill.strip() for skill in str(candidate["Skills"]).split(",") if skill.strip()]
+    if row % 2:
+        skills = skills[:-1]
+    return f"{candidate['Name']}\n{candidate['Degree']}\nTechnical skills: {', '.join(skills)}\n"
+
+
+def resumes(candidates):
+    texts = {}
+    for row, candidate in enumerate(candidates.to_dict("records")):
+        match = DRIVE_FILE_ID_PATTERN.search(str(candidate["Resume Link"]))
+        if match:
+            texts[match.group(1)] = resume_text(row, candidate)
+    return texts
+
+
+def expected_results(name):
+    return pd.read_csv(os.path.join(REPO, "tests", "data", f"baseline_{name}.csv"), keep_default_na=False)
+
+
+@pytest.mark.parametrize("engine_name", ["legacy", "vectorized"])
+@pytest.mark.parametrize("name", sorted(SHEETS))
+def test_engines_match_original_loop(make_engine, name, engine_name):
+    companies, candidates = load_sheets(name)
+    engine = make_engine(companies, candidates, resumes(candidates))
+
+    results = engine.match_candidates_to_jobs(engine=engine_name)
+
+    expected = expected_results(name)
+    assert expected["Candidates Count"].sum() > 0
+    pd.testing.assert_frame_equal(results.reset_index(drop=True), expected, check_dtype=False)
@@ -0,0 +1,37 @@
+import os
+
+import pandas as pd
+import pytest
+
+import data_converter
+from conftest import REPO
+
+SOURCES = {
+    'companies': os.path.join(REPO, "Detailed Company Requirements - IEEE Career Fair (Responses).xlsx"),
+    'students': os.path.join(REPO, "IEEE R10 Career Fair - Student Registration (Responses).xlsx")
+}
+
+
+@pytest.mark.parametrize("kind", sorted(SOURCES))
+@pytest.mark.parametrize("chunksize", [37, data_converter.DEFAULT_CHUNK_SIZE])
+def test_chunked_conversion_matches_baseline(kind, chunksize, tmp_path):
+    convert, convert_chunked, _ = data_converter.CONVERTERS[kind]
+    baseline_errors, chunked_errors = [], []
+
+    baseline = convert(SOURCES[kind], str(tmp_path / "baseline.xlsx"), errors=baseline_errors)
+    written = convert_chunked(SOURCES[kind], str(tmp_path / "chunked.xlsx"), chunksize=chunksize,
+                              errors=chunked_errors)
+
+    assert written == len(baseline) > 0
+    assert chunked_errors == baseline_errors
+    pd.testing.assert_frame_equal(pd.read_excel(tmp_path / "chunked.xlsx"), pd.read_excel(tmp_path / "baseline.xlsx"))
+
+
+def test_batch_with_duplicate_fair_converts_nothing(tmp_path):
+    jobs = [("fair", "companies", SOURCES['companies']), ("fair", "students", SOURCES['students']),
+            ("fair", "companies", SOURCES['companies'])]
+
+    with pytest.raises(ValueError, match="Two companies inputs for fair 'fair'"):
+        data_converter.convert_batch(jobs, str(tmp_path / "out"), workers=1)
+
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+
+from conftest import REPO, drive_link
+from dedup import deduplicate_candidates
+
+# A skills block several students pasted from the same template
+SHARED_SKILLS = ("Programming Languages: Java, C, C#, JavaScript, PHP, SQL, PL/SQL, Python\n"
+                 "Databases & Tools: MySQL, SQLite, Oracle Database, MongoDB, Firebase, phpMyAdmin, SSMS\n"
+                 "Development Environments: IntelliJ IDEA, NetBeans, Visual Studio, VS Code, Android Studio\n"
+                 "Concepts: OOP, SDLC, Design Patterns, Microservices\n"
+                 "Other Tools: Postman, GitHub, Kaggle, Power BI, Figma, Canva")
+
+
+def registration(name, file_id, skills=SHARED_SKILLS, degree="UG in Software Engineering"):
+    return {"Name": name, "Country": "India", "Degree": degree, "Skills": skills, "Resume Link": drive_link(file_id)}
+
+
+def clusters(report):
+    return sorted(sorted(rows) for rows in report.groupby("Cluster")["Row"].apply(list))
+
+
+def test_shared_skills_block_is_not_a_duplicate():
+    candidates = pd.DataFrame([
+        registration("Amjad Azward", "1hxUl0UMxY"),
+        registration("Ilma Habbab", "1tq4hnUmXJ"),
+        registration("Thilak", "1nmJQx0ib9", degree="Pre University in Artificial Intelligence and Data Science"),
+        registration("Sameeksha", "1pDl9vb_N7", degree="Pre University  in Artificial Intelligence and Data Science")
+    ])
+
+    collapsed, report = deduplicate_candidates(candidates)
+
+    assert report.empty
+    assert collapsed.equals(candidates)
+
+
+def test_resubmissions_are_collapsed():
+    candidates = pd.DataFrame([
+        registration("Ilma Habbab", "12_l5b18H5"),
+        registration("Amjad Azward", "1hxUl0UMxY"),
+        registration("Ilma Habbab ", "1tq4hnUmXJ"),
+        # A corrected name is still the same registrant when it links the same resume
+        registration("Annmariya", "1TYWUirfj2"),
+        registration("Ann Maria CJ", "1TYWUirfj2")
+    ])
+
+    collapsed, report = deduplicate_candidates(candidates)
+
+    assert clusters(report) == [[0, 2], [3, 4]]
+    assert collapsed["Name"].tolist() == ["Amjad Azward", "Ilma Habbab ", "Ann Maria CJ"]
+
+
+def test_registration_sheet_clusters_only_resubmissions():
+    candidates = pd.read_excel(os.path.join(REPO, "converted_candidates.xlsx"))
+
+    _, report = deduplicate_candidates(candidates)
+
+    # Rows 248/258 and 515/516 are different students sharing a pasted skills block
+    assert clusters(report) == [[330, 333], [348, 349], [500, 508], [514, 516]]
@@ -0,0 +1,96 @@
+import pytest
+
+from conftest import SAMPLE_EDITS, drive_link
+
+
+def role(name, skills, degrees="B.Sc", country="India", count=2):
+    return {"Company Name": name, "Role": "Engineer", "Required Skills": skills, "Eligible Degrees": degrees,
+            "Country": country, "Requirement Count": count}
+
+
+def candidate(name, degree="B.Sc", country="India", skills="", resume=None):
+    return {"Name": name, "Country": country, "Degree": degree, "Skills": skills,
+            "Resume Link": drive_link(resume or name)}
+
+
+def match(engine, engine_name, selection="greedy"):
+    return engine.match_candidates_to_jobs(engine=engine_name, selection=selection)
+
+
+def test_spelling_variants_match_like_legacy(make_engine):
+    # Without alias tables, "Machine  Learning" and "machine learning" are different requirements,
+    # exactly as the pair-by-pair loop compares them
+    companies = [role("R", "Machine  Learning"), role("S", "machine learning"),
+                 role("D", "Python", degrees="B.Sc  Physics"), role("E", "Python", degrees="b.sc physics")]
+    candidates = [candidate("A", degree="B.Sc Physics"), candidate("B", degree="B.Sc  Physics")]
+    resumes = {"A": "python and machine learning", "B": "python and machine  learning"}
+
+    legacy = match(make_engine(companies, candidates, resumes), "legacy")
+    vectorized = match(make_engine(companies, candidates, resumes), "vectorized")
+
+    assert list(legacy["Eligible Students (Partial List)"]) == ["B", "A", "B", "A"]
+    assert vectorized.equals(legacy)
+
+
+def test_degree_aliases_match_whole_words_only(make_engine):
+    from vocabulary import DEFAULT_DEGREE_ALIASES
+
+    companies = [role("Eng", "Python", degrees="Bachelor of Engineering"), role("Educ", "Python", degrees="B.Ed")]
+    candidates = [candidate("Ed", degree="B.Ed in Mathematics"), candidate("En", degree="B.E. in Civil")]
+    resumes = {"Ed": "python", "En": "python"}
+
+    engine = make_engine(companies, candidates, resumes, degree_aliases=DEFAULT_DEGREE_ALIASES)
+    results = match(engine, "vectorized")
+
+    # "b.e" (Bachelor of Engineering) is not a word of "b.ed"
+    assert list(results["Eligible Students (Partial List)"]) == ["En", "Ed"]
+
+
+@pytest.mark.parametrize("pruning", ["none", "declared"])
+@pytest.mark.parametrize("word_boundary", [False, True])
+def test_generated_data_matches_legacy(make_engine, pruning, word_boundary):
+    from sample_data import create_sample_candidates_data, create_sample_companies_data, create_sample_resumes
+
+    companies = create_sample_companies_data(30, seed=4)
+    candidates = create_sample_candidates_data(400, seed=4)
+    # Case and spacing variants of the same requirement must still be kept apart
+    companies.loc[::3, "Required Skills"] = companies["Required Skills"][::3].str.upper()
+    companies.loc[1::4, "Required Skills"] = companies["Required Skills"][1::4].str.replace(" ", "  ")
+    resumes = dict(create_sample_resumes(candidates, seed=4))
+
+    def run(engine_name):
+        engine = make_engine(companies, candidates, resumes, skill_pruning=pruning,
+                             skill_word_boundary=word_boundary)
+        return match(engine, engine_name)
+
+    legacy = run("legacy")
+    assert legacy["Candidates Count"].sum() > 0
+    assert run("vectorized").equals(legacy)
+
+
+def test_incremental_rematch_matches_fresh_run(make_engine, sample):
+    companies, candidates, resumes = sample
+    engine = make_engine(companies, candidates, resumes)
+    match(engine, "vectorized")
+
+    for edit in SAMPLE_EDITS:
+        companies, candidates = edit(companies, candidates)
+        engine.companies_data, engine.candidates_data = companies, candidates
+        rematched = match(engine, "vectorized")
+
+        assert engine.rematched_roles < len(companies)
+        assert rematched.equals(match(make_engine(companies, candidates, resumes), "vectorized"))
+
+
+def test_resume_scan_memo_is_bounded_by_resume_cache(make_engine, sample):
+    from resume_cache import ResumeCache
+
+    companies, candidates, resumes = sample
+    engine = make_engine(companies, candidates, resumes, resume_cache=ResumeCache(max_entries=10))
+    first = match(engine, "vectorized")
+    engine.companies_data = companies.assign(**{"Required Skills": companies["Required Skills"] + ", Docker"})
+    rematched = match(engine, "vectorized")
+
+    assert len(engine._resume_scans) <= 10
+    assert first.equals(match(make_engine(companies, candidates, resumes), "vectorized"))
+    assert rematched.equals(match(make_engine(engine.companies_data, candidates, resumes), "vectorized"))
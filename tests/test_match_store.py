@@ -0,0 +1,63 @@
+from conftest import SAMPLE_EDITS
+from match_store import MatchStore
+
+
+def stored(store):
+    """Everything a save leaves in the store, in a comparable order"""
+    return {
+        "pairs": store._query("SELECT * FROM pair_scores ORDER BY role_id, rank"),
+        "companies": store._query("SELECT * FROM companies ORDER BY role_id"),
+        "candidates": store._query("SELECT * FROM candidates ORDER BY candidate_id")
+    }
+
+
+def assert_same_store(store, expected):
+    actual, expected = stored(store), stored(expected)
+    for table in expected:
+        assert actual[table].equals(expected[table]), table
+
+
+def test_save_racing_another_writer_rewrites_everything(make_engine, sample, tmp_path):
+    companies, candidates, resumes = sample
+    store = MatchStore(str(tmp_path / "shared.db"))
+    first = make_engine(companies, candidates, resumes)
+    other = make_engine(companies, candidates, resumes, eligibility_threshold=20)
+    first.save_matches(store)
+
+    # The other writer saves between this save reading the stored state and writing its changes
+    edited = candidates.copy()
+    edited.loc[3, "Skills"] = "Python, SQL"
+    first.candidates_data = edited
+    load_state = store.load_state
+
+    def racing_load_state():
+        state = load_state()
+        store.load_state = load_state
+        other.save_matches(store)
+        return state
+
+    store.load_state = racing_load_state
+    first.save_matches(store)
+
+    fresh = MatchStore(str(tmp_path / "fresh.db"))
+    make_engine(companies, edited, resumes).save_matches(fresh)
+    assert stored(fresh)["pairs"].shape[0] > 0
+    assert_same_store(store, fresh)
+
+
+def test_incremental_save_matches_fresh_save(make_engine, sample, tmp_path):
+    companies, candidates, resumes = sample
+    store = MatchStore(str(tmp_path / "incremental.db"))
+    engine = make_engine(companies, candidates, resumes)
+    engine.save_matches(store)
+
+    for step, edit in enumerate(SAMPLE_EDITS):
+        companies, candidates = edit(companies, candidates)
+        engine.companies_data, engine.candidates_data = companies, candidates
+        engine.save_matches(store)
+        assert engine.rematched_roles < len(companies)
+
+        fresh = MatchStore(str(tmp_path / f"fresh_{step}.db"))
+        make_engine(companies, candidates, resumes).save_matches(fresh)
+        assert_same_store(store, fresh)
+        assert store.load_results().equals(fresh.load_results())
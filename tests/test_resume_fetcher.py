@@ -0,0 +1,27 @@
+from resume_fetcher import FakeHTTPBackend, ResumeFetcher
+
+
+def test_iter_fetch_keeps_a_bounded_window_in_flight():
+    fetcher = ResumeFetcher(FakeHTTPBackend(latency=0.001), max_workers=2)
+    drawn = 0
+
+    def file_ids():
+        nonlocal drawn
+        for i in range(100):
+            drawn += 1
+            yield f"resume_{i}"
+
+    # IDs are drawn lazily: only the downloads not yet yielded run ahead of the consumer
+    for yielded, result in enumerate(fetcher.iter_fetch(file_ids()), start=1):
+        assert result.ok
+        assert drawn - yielded < 2 * fetcher.max_workers
+    assert drawn == 100
+
+
+def test_iter_fetch_downloads_each_file_once():
+    fetcher = ResumeFetcher(FakeHTTPBackend(latency=0), max_workers=3)
+    file_ids = [f"resume_{i % 7}" for i in range(30)]
+
+    results = list(fetcher.iter_fetch(iter(file_ids)))
+
+    assert sorted(result.file_id for result in results) == sorted(set(file_ids))
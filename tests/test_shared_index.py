@@ -0,0 +1,54 @@
+import pytest
+
+from shared_index import SharedRegistry
+
+
+def test_built_resource_is_shared_until_released():
+    registry = SharedRegistry()
+    first = registry.acquire("key", lambda: ["table"])
+    second = registry.acquire("key", lambda: pytest.fail("built twice"))
+
+    assert second.value is first.value and second.reused
+    first.release()
+    second.release()
+    assert "key" not in registry
+    assert registry.stats()["evictions"] == 1
+
+
+def test_failed_build_is_not_cached():
+    registry = SharedRegistry()
+    builds = []
+
+    def failing_load():
+        builds.append("error shown")
+        return None
+
+    assert registry.acquire("key", failing_load) is None
+    assert registry.acquire("key", failing_load) is None
+    # Every holder that hits the failure builds (and reports) it again
+    assert builds == ["error shown", "error shown"]
+    assert "key" not in registry
+
+    handle = registry.acquire("key", lambda: ["table"])
+    assert handle.value == ["table"] and not handle.reused
+
+
+def test_raising_build_is_not_cached():
+    registry = SharedRegistry()
+
+    def broken():
+        raise ValueError("unreadable")
+
+    with pytest.raises(ValueError):
+        registry.acquire("key", broken)
+    assert "key" not in registry
+    assert registry.stats()["references"] == 0
+
+
+def test_failed_replacement_releases_previous_handle():
+    registry = SharedRegistry()
+    old = registry.acquire("old", lambda: ["table"])
+
+    assert registry.replace(old, "new", lambda: None) is None
+    assert old.released
+    assert registry.stats()["resources"] == 0
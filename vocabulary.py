@@ -0,0 +1,157 @@
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+# Same delimiters as JobMatchingSystem.process_skills / process_degrees
+TERM_DELIMITERS = re.compile(r'[,;|]')
+
+DEFAULT_SKILL_ALIASES = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "golang": "go",
+    "ms excel": "excel",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node.js",
+    "postgres": "postgresql",
+    "gcp": "google cloud platform",
+    "aws": "amazon web services",
+}
+
+DEFAULT_DEGREE_ALIASES = {
+    "b.tech": "bachelor of technology",
+    "b.e": "bachelor of engineering",
+    "b.sc": "bachelor of science",
+    "bca": "bachelor of computer applications",
+    "b.com": "bachelor of commerce",
+    "bba": "bachelor of business administration",
+    "m.tech": "master of technology",
+    "m.e": "master of engineering",
+    "m.sc": "master of science",
+    "mca": "master of computer applications",
+    "mba": "master of business administration",
+    "ph.d": "doctor of philosophy",
+    "phd": "doctor of philosophy",
+}
+
+
+def normalize_term(term) -> str:
+    """Case-fold a term and collapse its whitespace"""
+    return ' '.join(str(term).casefold().split())
+
+
+def surface_form(term) -> str:
+    """Lowercase and strip a term, the spelling the pair-by-pair matcher compares"""
+    return str(term).lower().strip()
+
+
+def alias_key(term: str) -> str:
+    """Key used for alias lookups, so "B.Tech", "btech" and "B. Tech." all match"""
+    return re.sub(r'[\s.]', '', normalize_term(term))
+
+
+class Vocabulary:
+    """Interned vocabulary of terms (skills or degrees) with an optional alias table
+
+    Without aliases a term is its surface form, so IDs separate exactly the spellings the
+    pair-by-pair matcher tells apart; with aliases, case and spacing variants are merged too.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        self.aliases = {alias_key(alias): normalize_term(canonical) for alias, canonical in (aliases or {}).items()}
+        self._alias_forms: Dict[str, Set[str]] = {}
+        for alias, canonical in (aliases or {}).items():
+            self._alias_forms.setdefault(normalize_term(canonical), set()).add(normalize_term(alias))
+
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._forms: List[Set[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term) -> bool:
+        return self.lookup(term) is not None
+
+    @property
+    def resolves_spellings(self) -> bool:
+        """Whether different spellings (aliases, case and spacing variants) share an ID"""
+        return bool(self.aliases)
+
+    def normalize(self, term) -> str:
+        """Return the canonical form of a term"""
+        if not self.resolves_spellings:
+            return surface_form(term)
+        normalized = normalize_term(term)
+        return self.aliases.get(alias_key(normalized), normalized)
+
+    def split(self, text) -> List[str]:
+        """Split a delimited cell into stripped terms"""
+        if pd.isna(text):
+            return []
+        return [term.strip() for term in TERM_DELIMITERS.split(str(text)) if term.strip()]
+
+    def intern(self, term) -> int:
+        """Return the ID of a term, adding it to the vocabulary if needed"""
+        canonical = self.normalize(term)
+        term_id = self._ids.get(canonical)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._ids[canonical] = term_id
+            self._terms.append(canonical)
+            self._forms.append(set())
+        self._forms[term_id].add(surface_form(term))
+        return term_id
+
+    def lookup(self, term) -> Optional[int]:
+        """Return the ID of a term without adding it"""
+        return self._ids.get(self.normalize(term))
+
+    def term(self, term_id: int) -> str:
+        """Return the canonical term for an ID"""
+        return self._terms[term_id]
+
+    def surface_forms(self, term_id: int) -> Set[str]:
+        """Return the lowercased spellings seen for an ID"""
+        return self._forms[term_id]
+
+    def alias_forms(self, term_id: int) -> Set[str]:
+        """Return unseen spellings that resolve to an ID through the alias table"""
+        canonical = self._terms[term_id]
+        if canonical not in self._alias_forms:
+            return set()
+        return ({canonical} | self._alias_forms[canonical]) - self._forms[term_id]
+
+    def encode_terms(self, terms: Iterable) -> np.ndarray:
+        """Encode already split terms into an ID array (duplicates kept)"""
+        return np.array([self.intern(term) for term in terms], dtype=np.int32)
+
+    def encode(self, text) -> np.ndarray:
+        """Split a delimited cell and encode it into an ID array"""
+        return self.encode_terms(self.split(text))
+
+    def export(self) -> pd.DataFrame:
+        """Return the vocabulary as a table for inspection"""
+        return pd.DataFrame({
+            "ID": range(len(self._terms)),
+            "Term": self._terms,
+            "Spellings": [", ".join(sorted(forms)) for forms in self._forms]
+        })
+
+    def to_json(self) -> str:
+        """Serialize the vocabulary (terms, spellings and aliases) as JSON"""
+        return json.dumps({
+            "terms": [
+                {"id": term_id, "term": term, "spellings": sorted(self._forms[term_id])}
+                for term_id, term in enumerate(self._terms)
+            ],
+            "aliases": self.aliases
+        }, indent=2)
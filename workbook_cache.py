@@ -0,0 +1,165 @@
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Bump when the cached representation changes, so old entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+
+def _pyarrow():
+    """Return the pyarrow module, or None if it is not installed"""
+    # Imported on first use, so importing the engine does not load pyarrow unless a cache is used
+    try:
+        import pyarrow
+    except ImportError:  # Without pyarrow every load parses the workbook again
+        return None
+    return pyarrow
+
+
+def workbook_key(data: bytes, variant: str = "") -> str:
+    """Return the cache key of an uploaded workbook (SHA-256 of its bytes plus the parse variant)"""
+    digest = hashlib.sha256(data).hexdigest()
+    # The variant (engine, projected columns, ...) may be any text, so it is hashed too
+    variant_digest = hashlib.sha1(variant.encode('utf-8')).hexdigest()[:12]
+    return f"{digest}-{variant_digest}-v{CACHE_FORMAT_VERSION}"
+
+
+class WorkbookCache:
+    """Parsed workbooks stored as Arrow IPC files keyed by content hash, with size-based LRU eviction"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return _pyarrow() is not None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.arrow")
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return a cached frame, memory-mapping its Arrow file, or None"""
+        pa = _pyarrow()
+        if pa is None:
+            return None
+        path = self._path(key)
+        try:
+            with pa.memory_map(path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas()
+        except (OSError, pa.ArrowException):
+            return None
+
+        # Bump the modification time, which is the LRU order used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return self._restore_missing(df)
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """Store a parsed frame, returning False if it cannot be represented in Arrow"""
+        pa = _pyarrow()
+        if pa is None:
+            return False
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, ValueError, TypeError):
+            # e.g. a column mixing numbers and text; such sheets are simply not cached
+            return False
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException):
+            # The cache is best effort, the parsed frame is still returned to the caller
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        self.evict()
+        return True
+
+    def get_or_load(self, data: bytes, loader: Callable[[], pd.DataFrame], variant: str = "") -> pd.DataFrame:
+        """Return the cached frame for these workbook bytes, calling loader() to parse them on a miss"""
+        key = workbook_key(data, variant)
+        df = self.get(key)
+        if df is None:
+            self.misses += 1
+            df = loader()
+            if df is not None:
+                self.put(key, df)
+        return df
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.arrow'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def clear(self):
+        """Delete every cached workbook"""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.arrow'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the on-disk size"""
+        size = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.arrow'):
+                try:
+                    size += os.path.getsize(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": size
+        }
+
+    def _restore_missing(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Arrow reads missing text cells back as None; restore the NaN that read_excel produces"""
+        for column in df.columns:
+            if df[column].dtype == object:
+                values = df[column].to_numpy()
+                missing = pd.isna(values)
+                if missing.any():
+                    values = values.copy()
+                    values[missing] = np.nan
+                    df[column] = values
+        return df